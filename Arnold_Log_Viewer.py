@@ -11,59 +11,72 @@ Version: 0.1.0
 
 # IMPORTS
 # =========================
+import hashlib
+import io
+import sqlite3
+
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from log_parser import ArnoldLogParser
+from log_charts import (
+    bar_chart_figure,
+    chart_config,
+    donut_chart_figure,
+    format_memory,
+    format_time,
+    has_data,
+    memory_timeline_figure,
+    phase_timeline_figure,
+)
+from log_metrics import (
+    BOTTLENECK_THRESHOLDS,
+    GPU_STARTUP_LABELS,
+    METRIC_LABELS,
+    RAY_TABLE_COLUMNS,
+    SHADER_TABLE_COLUMNS,
+    analyze_bottlenecks,
+    gpu_report,
+    predict_completion,
+    progress_intervals,
+    sampling_throughput,
+    texture_io_report,
+)
+from log_history import record_sections
+from log_index import LogIndex, select_lines
+from log_json import is_profile_json, load_profile_json, load_stats_json, merge_json_sections
+from log_parser import (
+    COMPRESSED_EXTENSIONS,
+    DECOMPRESSION_ERRORS,
+    ArnoldLogParser,
+    LineViews,
+    ParserProfile,
+    iter_parse_chunks,
+)
+from log_report import build_report
 
 
 # GLOBALS / CONSTANTS
 # =========================
+# Bottleneck rating -> delta shown on st.metric()
+STATUS_INDICATORS = {
+    "good": "🟢 Good",
+    "warn": "🟡 Moderate",
+    "bad": "🔴 Poor",
+    "unknown": None,
+}
+
+# Files listed in each per-texture ranking
+TEXTURE_TOP_N = 10
+
+# Rows in the profile JSON node and shader tables
+PROFILE_TOP_N = 20
+
+# Logs of up to this many characters keep their lines in memory, larger
+# ones re-read the upload for the line-level views and the raw log
+MAX_KEPT_LINE_CHARS = 64 * 1024 * 1024
 
 
 # FUNCTIONS
 # =========================
-def has_data(data_dict, default_value="Can't parse details from log."):
-    """Check if a dictionary has any non-default, non-zero values."""
-    if not data_dict:
-        return False
-    for value in data_dict.values():
-        if value != default_value and value != 0 and value != 0.0 and value != "" and value != "0":
-            return True
-    return False
-
-def format_time(seconds):
-    """Format time in a human-readable format.
-    Args:
-        seconds (float): Time in seconds
-    Returns:
-        str: Formatted time string
-    """
-    if seconds < 60:
-        return f"{seconds:.2f}s"
-    minutes = int(seconds // 60)
-    remaining_seconds = seconds % 60
-    if minutes < 60:
-        return f"{minutes}m {remaining_seconds:.2f}s"
-    hours = int(minutes // 60)
-    remaining_minutes = minutes % 60
-    return f"{hours}h {remaining_minutes}m {remaining_seconds:.2f}s"
-
-def format_memory(megabytes):
-    """Format memory in appropriate units (MB or GB).
-    Args:
-        megabytes (float): Memory size in megabytes
-    Returns:
-        str: Formatted memory string
-    """
-    if megabytes == 0:
-        return "0 MB"
-    elif megabytes < 1024:
-        return f"{megabytes:.2f} MB"
-    else:
-        gigabytes = megabytes / 1024
-        return f"{gigabytes:.2f} GB"
-
 def get_performance_color(metric_name, value):
     """Get color indicator (delta) for performance metrics.
 
@@ -97,6 +110,110 @@ def get_performance_color(metric_name, value):
 
     return None  # No color indicator
 
+def format_progress(progress):
+    """Format parse progress for the progress bar text.
+    Args:
+        progress (ParseProgress): Progress yielded by iter_parse_chunks()
+    Returns:
+        str: Bytes read, throughput and ETA
+    """
+    text = f"Parsing Arnold log file... {format_memory(progress.bytes_done / (1024 * 1024))}"
+    if progress.total_bytes:
+        text += f" of {format_memory(progress.total_bytes / (1024 * 1024))}"
+    text += f" ({progress.lines_per_second:,.0f} lines/s"
+    if progress.eta_seconds is not None:
+        text += f", {format_time(progress.eta_seconds)} left"
+    return text + ")"
+
+def cancel_parse(log_key):
+    """Button callback, marks the parse of a log as cancelled."""
+    st.session_state["cancelled_log_key"] = log_key
+
+def parse_with_progress(log_source, log_key, profile_enabled=False, decode_errors="replace"):
+    """Parse a log in chunks, showing progress and sections as they become final.
+    Args:
+        log_source: Binary file object of the log, optionally compressed
+        log_key (str): Content key of the log, recorded when the parse is cancelled
+        profile_enabled (bool): Profile the parser
+        decode_errors (str): How to handle undecodable bytes
+    Returns:
+        tuple: (ArnoldLogParser, dict of parsed sections, LineViews, LogIndex,
+            SHA-256 of the decompressed log), or None when cancelled
+    """
+    progress_bar = st.progress(0.0, text="Parsing Arnold log file...")
+    st.button("Cancel", key="cancel_parse", on_click=cancel_parse, args=(log_key,))
+    live_sections = st.empty()
+
+    def should_stop():
+        return st.session_state.get("cancelled_log_key") == log_key
+
+    # Line-level views, the line index and the digest are built from the same
+    # chunks, a compressed upload is only decompressed once for all of them
+    profile = ParserProfile() if profile_enabled else None
+    views = LineViews(top_n=10, profile=profile)
+    log_index = LogIndex()
+    digest = hashlib.sha256()
+
+    def on_lines(lines):
+        views.add_lines(lines)
+        log_index.add_lines(lines)
+
+    # Parsed in this process, worker processes started from the server's
+    # threads gained nothing measurable, use python -m log_parser --jobs
+    chunks = iter_parse_chunks(
+        log_source, keep_lines=True, profile=profile, errors=decode_errors,
+        should_stop=should_stop, max_kept_chars=MAX_KEPT_LINE_CHARS, on_lines=on_lines, digest=digest,
+    )
+
+    # Closing the generator ends the parse at once when a rerun interrupts it
+    try:
+        for progress in chunks:
+            progress_bar.progress(progress.fraction, text=format_progress(progress))
+            with live_sections.container():
+                st.caption(
+                    f"{len(progress.results['errors'])} error/s and "
+                    f"{len(progress.results['warnings'])} warning/s found so far."
+                )
+                for section in progress.complete:
+                    with st.expander(f"{section.replace('_', ' ').title()} (final)"):
+                        st.json(progress.results[section], expanded=True)
+    finally:
+        chunks.close()
+
+    progress_bar.empty()
+    live_sections.empty()
+    if not progress.finished:
+        return None
+
+    if progress.lines is not None:
+        parser = ArnoldLogParser.from_lines(progress.lines, profile=progress.profile)
+    else:
+        # Too large to hold, every pass over the lines streams the upload again
+        parser = ArnoldLogParser.from_source(log_source, profile=progress.profile, errors=decode_errors)
+    return parser, progress.results, views, log_index, digest.hexdigest()
+
+def display_paginated_dataframe(df, key, page_sizes=(50, 100, 500)):
+    """
+    Display a large table one page at a time, sorted before paging.
+
+    Parameters:
+    df (pd.DataFrame): The table to display
+    key (str): Unique widget key prefix
+    page_sizes (tuple): Page size options
+    """
+    col1, col2, col3, col4 = st.columns(4)
+    sort_by = col1.selectbox("Sort by", list(df.columns), key=f"{key}_sort")
+    descending = col2.toggle("Descending", value=False, key=f"{key}_descending")
+    page_size = col3.selectbox("Rows per page", page_sizes, key=f"{key}_page_size")
+    page_count = max(1, -(-len(df) // page_size))
+    page = col4.number_input(
+        f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=f"{key}_page"
+    )
+
+    sorted_df = df.sort_values(sort_by, ascending=not descending, kind="stable")
+    start = (page - 1) * page_size
+    st.dataframe(sorted_df.iloc[start:start + page_size], hide_index=True, use_container_width=True)
+
 def sidebar():
     """
     Create the sidebar for the app.
@@ -108,11 +225,12 @@ def sidebar():
 
         Best used with log diagnostics set to **Info** to capture as much as possible.
         
-        No information is uploaded or stored.
+        No information is uploaded, parsed render stats are kept in a local history database.
 
         - 🚨 [Errors / Warnings](#errors-warnings): Overview of errors and warnings.
         - 💻 [Render Info](#render-info): At a glance important stats.
         - 🎮 [Worker Info](#worker-info): Hardware stats.
+        - 🖥️ [GPU](#gpu): GPU devices, memory and startup costs (GPU renders only, experimental).
         - 🎨 [Arnold Config / Plugins](#arnold-config-plugins): Arnold plugins loaded.
         - 📊 [Scene Statistics](#scene-statistics): Detailed scene info.
         """
@@ -147,85 +265,8 @@ def display_bar_chart(
     _horizontal (bool): Whether to display horizontal bars
     convert_values (bool): Whether to convert dict to DataFrame
     """
-    if convert_values:
-        df = pd.DataFrame(values, index=[str(_index)])
-    else:
-        df = values if isinstance(values, pd.DataFrame) else pd.DataFrame(values)
-
-    # Ensure all values are numeric (convert to float if possible)
-    if isinstance(df, pd.DataFrame):
-        for col in df.columns:
-            try:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            except:
-                pass
-
-    # Create Plotly bar chart with better colors and interactivity
-    if _horizontal:
-        # Horizontal bar chart
-        fig = go.Figure()
-        for idx, row in df.iterrows():
-            fig.add_trace(go.Bar(
-                y=df.columns.tolist(),
-                x=row.tolist(),
-                orientation='h',
-                name=str(idx),
-                marker=dict(
-                    color=row.tolist(),
-                    colorscale='Viridis',
-                    showscale=True,
-                    colorbar=dict(title=_y_label or "Value")
-                ),
-                hovertemplate='<b>%{y}</b><br>' +
-                             f'{_y_label or "Value"}: %{{x:.2f}}<br>' +
-                             '<extra></extra>'
-            ))
-
-        fig.update_layout(
-            xaxis_title=_y_label or "Value",
-            yaxis_title=_x_label or "Category",
-            hovermode='closest',
-            showlegend=False,
-            height=max(400, len(df.columns) * 25),
-        )
-    else:
-        # Vertical bar chart
-        fig = go.Figure()
-        for idx, row in df.iterrows():
-            fig.add_trace(go.Bar(
-                x=df.columns.tolist(),
-                y=row.tolist(),
-                name=str(idx),
-                marker=dict(
-                    color=row.tolist(),
-                    colorscale='Viridis',
-                    showscale=True
-                ),
-                hovertemplate='<b>%{x}</b><br>' +
-                             f'{_y_label or "Value"}: %{{y:.2f}}<br>' +
-                             '<extra></extra>'
-            ))
-
-        fig.update_layout(
-            xaxis_title=_x_label or "Category",
-            yaxis_title=_y_label or "Value",
-            hovermode='closest',
-            showlegend=False,
-        )
-
-    # Add download button config
-    config = {
-        'toImageButtonOptions': {
-            'format': 'png',
-            'filename': f'arnold_log_{_x_label.lower().replace(" ", "_")}',
-            'height': 800,
-            'width': 1200,
-            'scale': 2
-        },
-        'displayModeBar': True,
-        'displaylogo': False
-    }
-
+    fig = bar_chart_figure(values, _index, _x_label, _y_label, _horizontal, convert_values)
+    config = chart_config(f'arnold_log_{_x_label.lower().replace(" ", "_")}')
     st.plotly_chart(fig, use_container_width=True, config=config)
 
 
@@ -237,58 +278,37 @@ def display_donut_chart(labels, values):
     labels (list): The labels for the chart.
     values (list): The values for the chart.
     """
-    # Create the donut chart with better colors
-    fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
-        hole=0.8,
-        marker=dict(
-            colors=['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A',
-                   '#19D3F3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52'],
-            line=dict(color='#FFFFFF', width=2)
-        ),
-        hovertemplate='<b>%{label}</b><br>' +
-                     'Value: %{value}<br>' +
-                     'Percentage: %{percent}<br>' +
-                     '<extra></extra>',
-        textposition='inside',
-        textinfo='percent+label'
-    )])
-
-    # Customize the layout
-    fig.update_layout(
-        width=300,
-        height=300,
-        margin=dict(t=5, b=5, l=5, r=5),
-        legend=dict(
-            x=1,
-            y=0.8,
-            traceorder="normal",
-            orientation="h",
-            font=dict(size=15),
-            bgcolor="rgba(255, 255, 255, 0)",
-            bordercolor="rgba(255, 255, 255, 0)",
-        ),
-    )
-
-    # Add download button config
-    config = {
-        'toImageButtonOptions': {
-            'format': 'png',
-            'filename': 'arnold_log_donut_chart',
-            'height': 800,
-            'width': 800,
-            'scale': 2
-        },
-        'displayModeBar': True,
-        'displaylogo': False
-    }
+    fig = donut_chart_figure(labels, values)
+    config = chart_config('arnold_log_donut_chart', width=800)
 
     # Display the chart
     with st.empty():
         st.plotly_chart(fig, use_container_width=False, config=config)
 
 
+def display_memory_timeline(samples, jumps):
+    """
+    Display resident memory over the log with the largest jumps annotated.
+
+    Parameters:
+    samples (list): Output of ArnoldLogParser.get_memory_samples()
+    jumps (list): Output of ArnoldLogParser.get_memory_jumps()
+    """
+    fig = memory_timeline_figure(samples, jumps)
+    st.plotly_chart(fig, use_container_width=True, config=chart_config('arnold_log_memory_timeline'))
+
+
+def display_phase_timeline(segments):
+    """
+    Display the wall-clock phases of the log as a Gantt chart.
+
+    Parameters:
+    segments (list): Output of ArnoldLogParser.get_phase_timeline()
+    """
+    fig = phase_timeline_figure(segments)
+    st.plotly_chart(fig, use_container_width=True, config=chart_config('arnold_log_phase_timeline'))
+
+
 # PAGE CONFIGURATION
 # =========================
 st.set_page_config(page_title="Arnold Render Log Viewer", layout="wide")
@@ -304,21 +324,36 @@ def main():
         "Toggle between text file upload or log copy/paste.", value=False
     )
     log_content = None
+    log_source = None
+    log_key = None
+    log_name = None
+    is_example = False
+    decode_errors = "replace"
 
     if file_paste_toggle:
         # Paste log content
         uploaded_text = st.text_area("Paste log content here", value=None, height=68)
         log_content = uploaded_text
+        log_name = "pasted_log"
 
     else:
         # File upload
-        uploaded_file = st.file_uploader("Upload render log file", type=["txt", "log"])
+        uploaded_file = st.file_uploader(
+            "Upload render log file",
+            type=["txt", "log"] + [extension.lstrip(".") for extension in COMPRESSED_EXTENSIONS],
+        )
         if uploaded_file is not None:
-            try:
-                log_content = uploaded_file.getvalue().decode("utf-8")
-            except UnicodeDecodeError:
-                st.error("Failed to decode file. Please ensure the file is a valid text file with UTF-8 encoding.")
-                log_content = None
+            # Compressed uploads are decompressed in a stream by the parser
+            log_source = uploaded_file
+            log_name = uploaded_file.name
+            # Hashed from the upload's buffer, without copying it
+            log_key = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+            decode_errors = "strict"
+
+    # Arnold render stats / profile JSON, alone or alongside the log
+    json_files = st.file_uploader(
+        "Arnold stats / profile JSON (optional)", type=["json"], accept_multiple_files=True
+    )
 
     # Load default log file
     default_log_content = None
@@ -330,39 +365,140 @@ def main():
     except Exception as e:
         st.warning(f"Could not load example log file: {e}")
 
-    if not log_content:
-        if default_log_content:
+    if not log_content and log_source is None:
+        if json_files:
+            # Sections come from the JSON files alone
+            log_content = ""
+            log_name = json_files[0].name
+        elif default_log_content:
             log_content = default_log_content
+            log_name = "example_log.log"
+            is_example = True
         else:
             st.info("Please upload a log file or paste log content to begin analysis.")
             st.stop()
 
-    # Session state variable to share log file
-    st.session_state["shared_log"] = log_content
+    if log_source is None:
+        log_source = io.BytesIO(log_content.encode("utf-8"))
+        log_key = hashlib.sha256(log_content.encode("utf-8")).hexdigest()
+    for json_file in json_files:
+        log_key += hashlib.sha256(json_file.getvalue()).hexdigest()
+
+    # Hidden parser profile panel, enabled with ?profile=1 in the URL
+    profile_enabled = st.query_params.get("profile") == "1"
+
+    # Parse with caching - only reparse if log content changed. A new upload
+    # reruns the script, which stops a parse still in progress.
+    if ("cached_log_key" not in st.session_state or
+        st.session_state["cached_log_key"] != log_key or
+        st.session_state.get("cached_profile") != profile_enabled):
+        # A cancelled log stays unparsed until it is parsed again on request
+        if st.session_state.get("cancelled_log_key") == log_key:
+            st.info("Parsing was cancelled.")
+            if st.button("Parse again"):
+                del st.session_state["cancelled_log_key"]
+                st.rerun()
+            st.stop()
+        try:
+            parsed = parse_with_progress(log_source, log_key, profile_enabled, decode_errors)
+        except UnicodeDecodeError:
+            st.error("Failed to decode file. Please ensure the file is a valid text file with UTF-8 encoding.")
+            st.stop()
+        except DECOMPRESSION_ERRORS as e:
+            st.error(f"Failed to decompress log file: {e}")
+            st.stop()
+        except Exception as e:
+            st.error(f"Failed to parse log file: {e}")
+            st.stop()
+        if parsed is None:
+            st.info("Parsing was cancelled.")
+            st.stop()
+        parser, sections, views, log_index, digest = parsed
 
-    # Initialize the log parser with caching - only reparse if log content changed
-    if ("cached_log_content" not in st.session_state or
-        st.session_state["cached_log_content"] != log_content):
-        # Log content has changed, need to reparse
-        with st.spinner("Parsing Arnold log file... This may take a moment for large logs."):
+        # Exact values from the JSON files replace the stats scraped from the log
+        profile_timing = None
+        for json_file in json_files:
             try:
-                parser = ArnoldLogParser(log_content)
-                st.session_state["parser"] = parser
-                st.session_state["cached_log_content"] = log_content
-                st.session_state["stats_cached"] = False  # Invalidate stats cache
-            except Exception as e:
-                st.error(f"Failed to initialize log parser: {e}")
-                st.stop()
+                if is_profile_json(json_file):
+                    profile_timing = load_profile_json(json_file, top_n=PROFILE_TOP_N)
+                else:
+                    merge_json_sections(sections, load_stats_json(json_file), ArnoldLogParser("").parse())
+            except (ValueError, UnicodeDecodeError) as e:
+                st.error(f"Failed to read {json_file.name}: {e}")
+
+        # Keep the render in the local history, the bundled example is not one of ours
+        if log_source.getbuffer().nbytes and not is_example:
+            try:
+                record_sections(sections, log_name, digest)
+            except (sqlite3.Error, OSError) as e:
+                st.warning(f"Could not record the render in the history: {e}")
+
+        st.session_state["parser"] = parser
+        st.session_state["parsed_sections"] = sections
+        st.session_state["profile_timing"] = profile_timing
+
+        # Line-level views are computed once per parse, not on every rerun
+        st.session_state["memory_timeline"] = (views.memory_samples, views.memory_jumps)
+        st.session_state["phase_timeline"] = views.phase_timeline
+        st.session_state["progress_timeline"] = views.progress_timeline
+        st.session_state["timelines"] = views.results()
+        st.session_state["log_index"] = log_index
+        plugin_nodes, plugin_libraries = ArnoldLogParser.summarize_plugins(
+            sections["plugin_table"], sections["plugin_info"]
+        )
+        st.session_state["plugin_inventory"] = (
+            pd.DataFrame(plugin_nodes, columns=[
+                "library", "node", "arnold_version", "timestamp", "memory_mb", "memory_delta_mb",
+            ]),
+            pd.DataFrame(plugin_libraries, columns=[
+                "library", "nodes", "arnold_versions", "first_loaded", "load_seconds", "memory_delta_mb",
+            ]),
+        )
+        st.session_state["cached_log_key"] = log_key
+        st.session_state["cached_profile"] = profile_enabled
     else:
-        # Use cached parser
+        # Use cached results
         parser = st.session_state["parser"]
+        sections = st.session_state["parsed_sections"]
+
+    # Static HTML copy of the report, opens without a server
+    col1, col2 = st.columns([1, 4])
+    if col1.button("Build HTML report"):
+        with st.spinner("Rendering HTML report..."):
+            st.session_state["html_report"] = (
+                log_key, build_report(
+                    parser, sections, log_name, st.session_state["profile_timing"], timelines=st.session_state["timelines"],
+                )
+            )
+    html_report = st.session_state.get("html_report")
+    if html_report and html_report[0] == log_key:
+        col2.download_button(
+            "Download HTML report", html_report[1], file_name=f"{log_name}.html", mime="text/html"
+        )
 
     ########################################
     # Errors and Warnings
     ########################################
     st.header("Errors / Warnings", divider=True)
-    errors = parser.get_errors()
-    warnings = parser.get_warnings()
+    log_index = st.session_state["log_index"]
+    issue_mask = log_index.query(severities=["error", "warning"])
+    issue_tags = [tag for tag, count in log_index.counts("tag", issue_mask).items() if count]
+
+    col1, col2 = st.columns(2)
+    tags = col1.multiselect("Subsystem", issue_tags, key="issue_tags")
+    start, end = None, None
+    first, last = log_index.time_range
+    if last > first:
+        start, end = col2.slider(
+            "Elapsed time (s)", min_value=first, max_value=last, value=(first, last), key="issue_window"
+        )
+
+    # One pass picks both, a log too large to keep is re-read for it
+    error_mask = log_index.query(["error"], tags, start, end)
+    issue_numbers = log_index.line_numbers(log_index.query(["error", "warning"], tags, start, end))
+    issue_lines = select_lines(parser.lines, issue_numbers)
+    errors = [line for number, line in zip(issue_numbers, issue_lines) if error_mask >> number & 1]
+    warnings = [line for number, line in zip(issue_numbers, issue_lines) if not error_mask >> number & 1]
 
     st.subheader("Errors")
     if len(errors) > 0:
@@ -384,7 +520,7 @@ def main():
     # Render Stats
     ########################################
     st.header("Render Info", divider=True)
-    render_stats = parser.get_render_info()
+    render_stats = sections["render_info"]
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -436,35 +572,89 @@ def main():
     # Arnold worker information tab
     ########################################
     st.header("Worker Info", divider=True)
-    worker_info = parser.get_worker_info()
+    worker_info = sections["worker_info"]
 
-    col1, col2, col3, col4, col5 = st.columns(5)
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
     with col1:
+        st.subheader("Host Name")
+        st.write(worker_info["host_name"])
+    with col2:
         st.subheader("CPU")
         st.write(worker_info["cpu"])
-    with col2:
+    with col3:
         st.subheader("Core Count")
         st.write(worker_info["core_count"])
-    with col3:
+    with col4:
         st.subheader("Worker RAM")
         st.write(worker_info["worker_ram"])
-    with col4:
+    with col5:
         st.subheader("Host Application")
         st.write(worker_info["host_application"])
-    with col5:
+    with col6:
         st.subheader("Arnold Version")
         st.write(worker_info["arnold_version"])
 
+    ########################################
+    # GPU
+    ########################################
+    gpu_stats = sections["gpu_stats"]
+    if sections["gpu_devices"] or has_data(gpu_stats, default_value=""):
+        st.header("GPU (experimental)", anchor="gpu", divider=True)
+        st.caption("The GPU lines are matched against a sample log, not yet checked against real Arnold GPU "
+                   "output: values may be missing or wrong.")
+        report = gpu_report(sections)
+
+        cols = st.columns(4)
+        cols[0].metric("Devices", len(report["devices"]) or gpu_stats["device_count"])
+        cols[1].metric("Driver", gpu_stats["driver"] or "N/A")
+        cols[2].metric(
+            "Startup Overhead", format_time(report["startup_seconds"]),
+            delta=f"{report['startup_share']:.0%} of frame" if report["startup_share"] is not None else None,
+            delta_color="inverse",
+        )
+        cols[3].metric("Peak GPU Memory", format_memory(gpu_stats["peak_gpu_memory_mb"]))
+
+        if gpu_stats["out_of_core_mb"]:
+            st.warning(
+                f"Textures did not fit in GPU memory, {format_memory(gpu_stats['out_of_core_mb'])} "
+                "were moved out-of-core to host memory, which slows down sampling."
+            )
+
+        if report["devices"]:
+            st.write("**Devices**")
+            st.dataframe(
+                pd.DataFrame(report["devices"], columns=[
+                    "device", "name", "compute", "memory_mb", "available_mb", "peak_mb", "peak_share",
+                ]),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        # Startup costs are paid once per frame, short frames pay them in full
+        if report["frame_seconds"]:
+            startup = {GPU_STARTUP_LABELS[row["phase"]]: row["seconds"] for row in report["startup"]}
+            startup["Rest of Frame"] = max(report["frame_seconds"] - report["startup_seconds"], 0.0)
+            display_bar_chart(startup, "GPU Startup", "Frame time (seconds)")
+        st.caption(
+            "Shader compilation, program cache compilation and cache pre-population run before the first "
+            "sample. When they take a large share of short frames, rendering those frames on CPU can be faster."
+        )
+
     ########################################
     # Arnold Config / Plugins
     ########################################
     st.header("Arnold Config / Plugins", divider=True)
-    plugin_info = parser.get_plugin_info()
-    colour_info = parser.get_colour_space()
+    colour_info = sections["colour_space"]
 
     # Plugin information
     st.subheader("Plugin Information")
-    st.json(plugin_info, expanded=False)
+    plugin_nodes, plugin_libraries = st.session_state["plugin_inventory"]
+    if not plugin_nodes.empty:
+        st.dataframe(plugin_libraries, hide_index=True, use_container_width=True)
+        with st.expander(f"View {len(plugin_nodes)} Plugin Node/s"):
+            display_paginated_dataframe(plugin_nodes, key="plugin_nodes")
+    else:
+        st.info("No plugin loading information found in log.")
 
     # Colour information
     col1, col2 = st.columns(2)
@@ -479,31 +669,17 @@ def main():
     # Scene Statistics
     ########################################
     st.header("Scene Statistics", divider=True)
-    # Parse log content - only show spinner if not cached
-    if "stats_cached" not in st.session_state or not st.session_state.get("stats_cached"):
-        with st.spinner("Extracting scene statistics..."):
-            scene_info = parser.get_scene_info()
-            sample_info = parser.get_sample_info()
-            progress_info = parser.get_progress_info()
-            scene_creation = parser.get_scene_creation()
-            render_time_stats = parser.get_render_time()
-            memory_stats = parser.get_memory_stats()
-            ray_stats = parser.get_ray_stats()
-            shader_stats = parser.get_shader_stats()
-            geometry_stats = parser.get_geometry_stats()
-            texture_stats = parser.get_texture_stats()
-            st.session_state["stats_cached"] = True
-    else:
-        scene_info = parser.get_scene_info()
-        sample_info = parser.get_sample_info()
-        progress_info = parser.get_progress_info()
-        scene_creation = parser.get_scene_creation()
-        render_time_stats = parser.get_render_time()
-        memory_stats = parser.get_memory_stats()
-        ray_stats = parser.get_ray_stats()
-        shader_stats = parser.get_shader_stats()
-        geometry_stats = parser.get_geometry_stats()
-        texture_stats = parser.get_texture_stats()
+    scene_info = sections["scene_info"]
+    sample_info = sections["sample_info"]
+    progress_info = sections["progress_info"]
+    scene_creation = sections["scene_creation"]
+    render_time_stats = sections["render_time"]
+    memory_stats = sections["memory_stats"]
+    ray_stats = sections["ray_stats"]
+    shader_stats = sections["shader_stats"]
+    geometry_stats = sections["geometry_stats"]
+    texture_stats = sections["texture_stats"]
+    throughput = sampling_throughput(sections)
 
     # Node Init / Scene Contents
     st.subheader("Node Init / Scene Contents")
@@ -543,6 +719,59 @@ def main():
     else:
         st.info("No render progress information found in log.")
 
+    # Progress ETA
+    phase_timeline = st.session_state["phase_timeline"]
+    progress_steps = st.session_state["progress_timeline"]
+    if progress_steps:
+        log_end = phase_timeline[-1]["end"] if phase_timeline else None
+        prediction = predict_completion(progress_steps, now=log_end)
+        intervals = progress_intervals(progress_steps, render_stats["resolution"])
+
+        cols = st.columns(3)
+        cols[0].metric("Progress", f"{prediction['percent']}%")
+        if prediction["complete"]:
+            cols[1].metric("Remaining", "Done")
+        elif prediction["remaining"] is not None:
+            cols[1].metric(
+                "Remaining (ETA)",
+                format_time(prediction["remaining"]),
+                help=f"95% band: {format_time(prediction['remaining_low'])} - {format_time(prediction['remaining_high'])}",
+            )
+            cols[2].metric("Predicted Total", format_time(prediction["total"]))
+        else:
+            cols[1].metric("Remaining (ETA)", "N/A")
+
+        if prediction["stalled_for"] is not None:
+            st.error(
+                f"No progress for {format_time(prediction['stalled_for'])} since {prediction['percent']}%, "
+                "the frame may be stuck."
+            )
+        stalled = [interval["interval"] for interval in intervals if interval["stalled"]]
+        if stalled:
+            st.warning(f"Stalled intervals: {', '.join(stalled)}")
+
+        with st.expander("View Progress Intervals"):
+            st.dataframe(
+                pd.DataFrame(intervals),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "percent_per_minute": st.column_config.NumberColumn("% / minute", format="%.2f"),
+                    "rays_per_second": st.column_config.NumberColumn("rays / second (est.)", format="%.0f"),
+                },
+            )
+
+    # Phase Timeline
+    st.subheader("Phase Timeline")
+    if phase_timeline:
+        if phase_timeline[-1]["phase"] != "shutdown":
+            st.warning(
+                f"Log ends during {phase_timeline[-1]['phase']}, it may be truncated or the render is still running."
+            )
+        display_phase_timeline(phase_timeline)
+    else:
+        st.info("No timestamped lines found in log.")
+
     # Scene creation time
     st.subheader("Scene Creation")
     cols = st.columns(3)
@@ -600,6 +829,32 @@ def main():
         "Render time as percentage"
         )
 
+    # Bottleneck analysis
+    st.subheader("Bottleneck Analysis")
+    with st.expander("Adjust Thresholds"):
+        thresholds = {}
+        for metric, threshold in BOTTLENECK_THRESHOLDS.items():
+            col1, col2 = st.columns(2)
+            thresholds[metric] = {
+                "warn": col1.number_input(f"{METRIC_LABELS[metric]} - moderate", value=threshold["warn"]),
+                "bad": col2.number_input(f"{METRIC_LABELS[metric]} - poor", value=threshold["bad"]),
+            }
+    analysis = analyze_bottlenecks(sections, thresholds)
+    st.write(analysis["summary"])
+    cols = st.columns(3)
+    for index, row in enumerate(analysis["metrics"]):
+        value = row["value"]
+        cols[index % 3].metric(
+            row["label"],
+            "N/A" if value is None else f"{value:,.2f}",
+            delta=STATUS_INDICATORS[row["status"]],
+            delta_color="off",
+            help=row["explanation"] or None,
+        )
+    for row in analysis["metrics"]:
+        if row["explanation"]:
+            st.warning(f"**{row['label']}**: {row['explanation']}")
+
     # Memory Statistics
     st.subheader("Memory")
     cols = st.columns(4)
@@ -674,16 +929,62 @@ def main():
         convert_values=False,
     )
 
+    # Memory over the log, with the largest jumps attributed to phases
+    st.subheader("Memory Timeline")
+    memory_samples, memory_jumps = st.session_state["memory_timeline"]
+    if memory_samples:
+        display_memory_timeline(memory_samples, memory_jumps)
+        if memory_jumps:
+            st.write("**Largest Memory Jumps**")
+            st.dataframe(
+                pd.DataFrame(memory_jumps, columns=[
+                    "delta_mb", "phase", "tag", "elapsed", "line",
+                    "memory_before_mb", "memory_after_mb", "text",
+                ]),
+                hide_index=True,
+                use_container_width=True,
+            )
+    else:
+        st.info("No per-line memory samples found in log.")
+
     # Ray Stats
     st.subheader("Rays")
-    if has_data(ray_stats):
+    if throughput["rays"]:
+        cols = st.columns(3)
+        cols[0].metric("Total Rays", f"{throughput['total_rays']:,}")
+        if throughput["rays_per_second"] is not None:
+            cols[1].metric("Rays / Second", f"{throughput['rays_per_second']:,.0f}")
+        cols[2].metric("Ray Types", len(throughput["rays"]))
+        display_bar_chart(
+            {row["label"]: row["count"] for row in throughput["rays"]}, "Rays", "Total rays per ray type"
+        )
+        st.dataframe(
+            pd.DataFrame(throughput["rays"], columns=RAY_TABLE_COLUMNS),
+            hide_index=True,
+            use_container_width=True,
+        )
+    elif has_data(ray_stats):
         display_bar_chart(ray_stats, "Rays", "Total rays per category")
     else:
         st.info("No ray statistics found in log. Enable detailed logging to see ray counts.")
 
     # Shader Stats
     st.subheader("Shaders")
-    if has_data(shader_stats):
+    if throughput["shader_calls"]:
+        cols = st.columns(3)
+        cols[0].metric("Total Shader Calls", f"{throughput['total_shader_calls']:,}")
+        if throughput["shader_calls_per_second"] is not None:
+            cols[1].metric("Shader Calls / Second", f"{throughput['shader_calls_per_second']:,.0f}")
+        cols[2].metric("Shader Contexts", len(throughput["shader_calls"]))
+        display_bar_chart(
+            {row["label"]: row["count"] for row in throughput["shader_calls"]}, "Shaders", "Shader calls per context"
+        )
+        st.dataframe(
+            pd.DataFrame(throughput["shader_calls"], columns=SHADER_TABLE_COLUMNS),
+            hide_index=True,
+            use_container_width=True,
+        )
+    elif has_data(shader_stats):
         display_bar_chart(shader_stats, "Shaders", "Shader calls per category.")
     else:
         st.info("No shader statistics found in log. Enable detailed logging to see shader calls.")
@@ -703,8 +1004,8 @@ def main():
     st.subheader("Textures")
     if has_data(texture_stats):
         cols = st.columns(6)
-        cols[0].metric("Peak Cache Memory", texture_stats["peak_cache_memory"])
-        cols[1].metric("Pixel Data Read", texture_stats["pixel_data_read"])
+        cols[0].metric("Peak Cache Memory", format_memory(texture_stats["peak_cache_mb"]))
+        cols[1].metric("Pixel Data Read", format_memory(texture_stats["pixel_data_read_mb"]))
         cols[2].metric("Unique Images", texture_stats["unique_images"])
         cols[3].metric("Duplicate Images", texture_stats["duplicate_images"])
         cols[4].metric("Constant Value Images", texture_stats["constant_value_images"])
@@ -712,6 +1013,85 @@ def main():
     else:
         st.info("No texture statistics found in log. Enable detailed logging to see texture info.")
 
+    # Per-texture I/O
+    texture_io = sections["texture_io"]
+    if texture_io:
+        texture_report = texture_io_report(texture_io, texture_stats, top_n=TEXTURE_TOP_N)
+        cols = st.columns(4)
+        cols[0].metric("Textures Read", len(texture_io))
+        cols[1].metric(
+            "Read / Peak Cache",
+            f"{texture_report['cache_efficiency']:.1f}x" if texture_report["cache_efficiency"] is not None else "N/A",
+            help="Pixel data read divided by peak cache memory. Values well above 1 mean "
+                 "textures are evicted and read again, raise the cache size or mip-map them.",
+        )
+        cols[2].metric("Untiled", texture_report["untiled"])
+        cols[3].metric("Unmipped", texture_report["unmipped"])
+        if texture_report["untiled"] or texture_report["unmipped"]:
+            st.warning("Untiled or unmipped textures are read whole, convert them to .tx with maketx.")
+
+        texture_columns = {
+            "mb_read": st.column_config.NumberColumn("MB read", format="%.1f"),
+            "redundant_mb": st.column_config.NumberColumn("Redundant MB", format="%.1f"),
+            "io_seconds": st.column_config.NumberColumn("I/O time (s)", format="%.2f"),
+        }
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Top {TEXTURE_TOP_N} by MB Read**")
+            st.dataframe(pd.DataFrame(texture_report["by_mb_read"]), hide_index=True,
+                         use_container_width=True, column_config=texture_columns)
+        with col2:
+            st.write(f"**Top {TEXTURE_TOP_N} by Redundant Reads**")
+            if texture_report["by_redundancy"]:
+                st.dataframe(pd.DataFrame(texture_report["by_redundancy"]), hide_index=True,
+                             use_container_width=True, column_config=texture_columns)
+            else:
+                st.success("No texture was read more than once.")
+
+        with st.expander(f"View All {len(texture_io)} Textures"):
+            display_paginated_dataframe(pd.DataFrame(texture_io), key="texture_io")
+
+    # Node / shader timing from the profile JSON
+    profile_timing = st.session_state["profile_timing"]
+    if profile_timing is not None:
+        st.subheader("Profile Timing")
+        timing_columns = {
+            "seconds": st.column_config.NumberColumn("total (s)", format="%.3f"),
+            "mean_seconds": st.column_config.NumberColumn("mean (s)", format="%.6f"),
+            "max_seconds": st.column_config.NumberColumn("max (s)", format="%.6f"),
+        }
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Top {PROFILE_TOP_N} Nodes**")
+            st.dataframe(pd.DataFrame(profile_timing["nodes"]), hide_index=True,
+                         use_container_width=True, column_config=timing_columns)
+        with col2:
+            st.write(f"**Top {PROFILE_TOP_N} Shaders**")
+            if profile_timing["shaders"]:
+                st.dataframe(pd.DataFrame(profile_timing["shaders"]), hide_index=True,
+                             use_container_width=True, column_config=timing_columns)
+            else:
+                st.info("No shader events found in the profile.")
+
+    ########################################
+    # Parser Profile (hidden)
+    ########################################
+    if profile_enabled:
+        st.header("Parser profile", divider=True)
+        profile_report = parser.get_profile_report()
+
+        st.subheader("Sections")
+        st.dataframe(pd.DataFrame(profile_report["sections"]), hide_index=True, use_container_width=True)
+
+        st.subheader("Patterns")
+        st.dataframe(pd.DataFrame(profile_report["patterns"]), hide_index=True, use_container_width=True)
+
+        st.subheader("Never Matched")
+        if profile_report["never_matched"]:
+            st.write(", ".join(profile_report["never_matched"]))
+        else:
+            st.success("Every pattern matched at least once.")
+
     # Display Sidebar
     sidebar()
 
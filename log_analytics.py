@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_analytics.py
+Description: Vectorized aggregations over batch parse results for farm-wide views.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import hashlib
+import json
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from log_export import RENDER_COLUMNS, find_log_files, parse_log_files, read_parquet, render_row
+from log_metrics import CORE_COUNT_PATTERN
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Metric column -> display label
+DISTRIBUTION_METRICS = {
+    "frame_time": "Frame Time (s)",
+    "peak_CPU_memory_used": "Peak CPU Memory (MB)",
+    "threads_blocked": "Threads Blocked (s)",
+    "pixel_data_read_gb": "Texture Data Read (GB)",
+    "core_hours": "Core-Hours",
+    "normalized_core_hours": "Normalized Core-Hours",
+}
+
+# Breakdown column -> display label
+BREAKDOWNS = {
+    "host_name": "Host",
+    "arnold_version": "Arnold Version",
+    "cpu": "CPU Model",
+}
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Metric column -> display label for frame sequences
+SEQUENCE_METRICS = {
+    "frame_time": "Frame Time (s)",
+    "peak_CPU_memory_used": "Peak CPU Memory (MB)",
+    "triangle_count": "Triangles",
+    "pixel_data_read_gb": "Texture Data Read (GB)",
+}
+
+# Frames in the centred window giving each frame its local median and MAD
+SEQUENCE_WINDOW = 51
+
+# Modified z-score above which a frame is an outlier (Iglewicz and Hoaglin)
+OUTLIER_THRESHOLD = 3.5
+
+# MAD and mean absolute deviation to standard deviation for normal data
+MAD_SCALE = 0.6745
+MEAN_AD_SCALE = 0.7979
+
+# Columns identifying the same work, renders of a scene on different CPU
+# models are what tells the CPU models apart
+SCENE_COLUMNS = ["show", "camera"]
+
+# Alternating median passes fitting the scene and CPU effects
+NORMALIZATION_ITERATIONS = 20
+
+
+# FUNCTIONS
+# =========================
+def _is_parquet_source(path: str) -> bool:
+    """Check whether a path is a Parquet file or a directory of Parquet files."""
+    if os.path.isfile(path):
+        return path.lower().endswith(".parquet")
+    for _, _, names in os.walk(path):
+        if any(name.endswith(".parquet") for name in names):
+            return True
+    return False
+
+
+def _source_files(source: str) -> List[str]:
+    """List the files load_renders() reads for a source."""
+    if os.path.isfile(source):
+        return [source]
+    if _is_parquet_source(source):
+        return [
+            os.path.join(root, name)
+            for root, _, names in os.walk(source)
+            for name in names if name.endswith(".parquet")
+        ]
+    return find_log_files([source])
+
+
+def source_signature(source: str) -> str:
+    """Digest the path, size and modification time of every file of a source.
+    A directory's own mtime misses logs rewritten in place and Parquet
+    parts added to a partition subdirectory, this does not.
+    Args:
+        source (str): Same as load_renders()
+    Returns:
+        str: Hex digest that changes whenever the loaded data can change
+    """
+    digest = hashlib.sha1()
+    for path in sorted(_source_files(source)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # Removed while listing
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _rows_from_json(path: str) -> List[Dict[str, any]]:
+    """Read export rows from `python -m log_parser` JSON or NDJSON output."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith((".ndjson", ".jsonl")):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+
+    return [
+        render_row(record["path"], record["sections"])
+        for record in records
+        if "sections" in record
+    ]
+
+
+def load_renders(source: str, workers: int = None) -> pd.DataFrame:
+    """Load one row per render from a batch result or a directory of logs.
+    Args:
+        source (str): Parquet file/dataset, CLI JSON/NDJSON output, or a log directory
+        workers (int): Parse worker processes when parsing raw logs
+    Returns:
+        pd.DataFrame: Render rows with RENDER_COLUMNS
+    """
+    if _is_parquet_source(source):
+        df = read_parquet(source).to_pandas()
+    elif os.path.isfile(source) and source.lower().endswith((".json", ".ndjson", ".jsonl")):
+        df = pd.DataFrame(_rows_from_json(source), columns=list(RENDER_COLUMNS))
+    else:
+        rows = [row for row in parse_log_files(find_log_files([source]), workers=workers) if row is not None]
+        df = pd.DataFrame(rows, columns=list(RENDER_COLUMNS))
+
+    return prepare_renders(df)
+
+
+def prepare_renders(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize dtypes so filters and group-bys stay vectorized."""
+    df = df.copy()
+    # Datasets exported before the numeric worker columns existed
+    if "logical_cores" not in df.columns and "core_count" in df.columns:
+        cores = df["core_count"].astype("string").str.extract(CORE_COUNT_PATTERN.pattern)
+        df["physical_cores"] = pd.to_numeric(cores[0])
+        df["logical_cores"] = pd.to_numeric(cores[1]).fillna(df["physical_cores"])
+    if "core_hours" not in df.columns and {"frame_time", "logical_cores"} <= set(df.columns):
+        df["core_hours"] = pd.to_numeric(df["frame_time"], errors="coerce") * df["logical_cores"] / 3600
+
+    for column, kind in RENDER_COLUMNS.items():
+        if column not in df.columns:
+            continue
+        if kind == "category":
+            df[column] = df[column].astype("string").fillna("Unknown").astype("category")
+        elif kind in ("int", "float"):
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+def filter_renders(df: pd.DataFrame, filters: Dict[str, List[str]]) -> pd.DataFrame:
+    """Filter renders with one isin() mask per breakdown column."""
+    mask = pd.Series(True, index=df.index)
+    for column, values in filters.items():
+        if values:
+            mask &= df[column].isin(values)
+    return df[mask]
+
+
+def timed_renders(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop renders without a frame time, truncated or crashed logs that would drag every percentile down."""
+    if "frame_time" not in df.columns:
+        return df
+    return df[df["frame_time"] > 0]
+
+
+def percentile_table(df: pd.DataFrame, metric: str, by: str = None, percentiles=PERCENTILES) -> pd.DataFrame:
+    """Percentiles of a metric over the renders with a frame time, overall or per group.
+    Args:
+        df (pd.DataFrame): Render rows
+        metric (str): Numeric column
+        by (str): Column to group by (default none)
+        percentiles (tuple): Quantiles to compute
+    Returns:
+        pd.DataFrame: count, mean and one pXX column per percentile
+    """
+    values = timed_renders(df)[[metric] + ([by] if by else [])].dropna(subset=[metric])
+    labels = {q: f"p{int(q * 100)}" for q in percentiles}
+
+    if by:
+        grouped = values.groupby(by, observed=True)[metric]
+        table = grouped.quantile(list(percentiles)).unstack().rename(columns=labels)
+        table.insert(0, "mean", grouped.mean())
+        table.insert(0, "count", grouped.size())
+        return table.sort_values("count", ascending=False)
+
+    series = values[metric]
+    table = series.quantile(list(percentiles)).rename(index=labels).to_frame().T
+    table.insert(0, "mean", series.mean())
+    table.insert(0, "count", series.size)
+    table.index = ["All renders"]
+    return table
+
+
+def percentile_tables(df: pd.DataFrame, metrics: List[str] = None,
+                      breakdowns: List[str] = None) -> Dict[Tuple[str, str], pd.DataFrame]:
+    """Precompute percentile_table() for every metric, overall and per breakdown.
+    Args:
+        df (pd.DataFrame): Render rows
+        metrics (list): Metric columns (default DISTRIBUTION_METRICS)
+        breakdowns (list): Group-by columns (default BREAKDOWNS)
+    Returns:
+        dict: (metric, breakdown) -> table, breakdown None for all renders
+    """
+    metrics = [metric for metric in (metrics or DISTRIBUTION_METRICS) if metric in df.columns]
+    breakdowns = [column for column in (breakdowns or BREAKDOWNS) if column in df.columns]
+    df = timed_renders(df)
+    return {
+        (metric, by): percentile_table(df, metric, by)
+        for metric in metrics
+        for by in [None] + breakdowns
+    }
+
+
+def cpu_factors(df: pd.DataFrame, metric: str = "core_hours", by: str = "cpu",
+                scene_columns: List[str] = None, iterations: int = NORMALIZATION_ITERATIONS) -> pd.DataFrame:
+    """Learn how much more of a metric each CPU model needs for the same work.
+
+    log(metric) is modelled as a scene effect plus a CPU effect, fitted by
+    alternating group medians so a CPU model that happened to render the
+    heavy shots is not blamed for them. Factors are relative to the CPU
+    model with the most renders. A CPU model that shares no scene with
+    another one cannot be compared and gets no factor. Renders without a
+    frame time are left out.
+    Args:
+        df (pd.DataFrame): Render rows, the more history the better
+        metric (str): Positive cost column, e.g. core_hours
+        by (str): Hardware column
+        scene_columns (list): Columns identifying the same work (default SCENE_COLUMNS)
+        iterations (int): Alternating median passes
+    Returns:
+        pd.DataFrame: One row per CPU model with renders, scenes,
+            shared_scenes, the median metric and its factor
+    """
+    scene_columns = [column for column in (scene_columns or SCENE_COLUMNS) if column in df.columns]
+    data = timed_renders(df)[[metric, by] + scene_columns].dropna(subset=[metric, by])
+    data = data[data[metric] > 0]
+    if data.empty:
+        return pd.DataFrame(columns=[by, "renders", "scenes", "shared_scenes", metric, "factor"])
+
+    y = np.log(data[metric].astype("float64"))
+    cpu = data[by].astype("string")
+    # Integer group ids keep the median passes fast on long histories
+    if scene_columns:
+        scene = data.groupby(scene_columns, observed=True, dropna=False, sort=False).ngroup()
+    else:
+        scene = pd.Series(0, index=data.index)
+    cpu_codes = pd.Series(pd.factorize(cpu)[0], index=data.index)
+
+    cpu_effect = pd.Series(0.0, index=data.index)
+    for _ in range(iterations):
+        scene_effect = (y - cpu_effect).groupby(scene).transform("median")
+        cpu_effect = (y - scene_effect).groupby(cpu_codes).transform("median")
+
+    cpus_per_scene = cpu.groupby(scene).transform("nunique")
+    table = pd.DataFrame({
+        "renders": cpu.groupby(cpu).size(),
+        "scenes": scene.groupby(cpu).nunique(),
+        "shared_scenes": scene[cpus_per_scene > 1].groupby(cpu[cpus_per_scene > 1]).nunique(),
+        metric: data[metric].groupby(cpu).median(),
+        "effect": cpu_effect.groupby(cpu).first(),
+    })
+    table["shared_scenes"] = table["shared_scenes"].fillna(0).astype("int64")
+    baseline = table["renders"].idxmax()
+    table["factor"] = np.exp(table["effect"] - table.loc[baseline, "effect"])
+    table.loc[(table["shared_scenes"] == 0) & (table.index != baseline), "factor"] = np.nan
+    table.index.name = by
+    return table.drop(columns="effect").sort_values("renders", ascending=False).reset_index()
+
+
+def normalize_renders(df: pd.DataFrame, factors: pd.DataFrame, metric: str = "core_hours",
+                      by: str = "cpu") -> pd.DataFrame:
+    """Add cpu_factor and normalized_<metric> columns, the metric as if rendered on the baseline CPU."""
+    df = df.copy()
+    factor = df[by].astype("string").map(factors.set_index(by)["factor"]).astype("float64")
+    df["cpu_factor"] = factor
+    df[f"normalized_{metric}"] = df[metric] / factor
+    return df
+
+
+def frame_sequence(df: pd.DataFrame, metrics: List[str] = None) -> pd.DataFrame:
+    """One row per frame number, sorted, keeping the last render of re-rendered frames.
+    Args:
+        df (pd.DataFrame): Render rows of a single shot
+        metrics (list): Metric columns to keep (default SEQUENCE_METRICS)
+    Returns:
+        pd.DataFrame: frame_number, path and metric columns
+    """
+    metrics = list(metrics or SEQUENCE_METRICS)
+    columns = ["frame_number", "path"] + metrics
+    frames = df.dropna(subset=["frame_number"])
+    if "started_at" in frames.columns:
+        frames = frames.sort_values("started_at", kind="stable", na_position="first")
+    frames = frames.drop_duplicates("frame_number", keep="last")
+    frames = frames.sort_values("frame_number")[columns].reset_index(drop=True)
+    frames["frame_number"] = frames["frame_number"].astype("int64")
+    return frames
+
+
+def robust_z_scores(values: pd.Series, window: int = SEQUENCE_WINDOW) -> pd.Series:
+    """Modified z-score of each value against the median and MAD of its neighbours.
+
+    A centred rolling median follows slow trends (a camera move adding
+    geometry) so only frames that jump away from their neighbours score
+    high. Where the local MAD is zero (flat runs) the mean absolute
+    deviation of the whole sequence is used instead.
+    Args:
+        values (pd.Series): Metric in frame order
+        window (int): Frames in the rolling window
+    Returns:
+        pd.Series: Signed scores, NaN for missing values
+    """
+    values = values.astype("float64")
+    rolling = values.rolling(window, center=True, min_periods=1)
+    deviation = values - rolling.median()
+    mad = deviation.abs().rolling(window, center=True, min_periods=1).median()
+
+    scale = mad / MAD_SCALE
+    mean_ad = deviation.abs().mean()
+    fallback = mean_ad / MEAN_AD_SCALE if mean_ad > 0 else np.nan
+    scale = scale.where(scale > 0, fallback)
+    return deviation / scale
+
+
+def sequence_outliers(frames: pd.DataFrame, metrics: List[str] = None, window: int = SEQUENCE_WINDOW,
+                      threshold: float = OUTLIER_THRESHOLD) -> pd.DataFrame:
+    """Score every metric of a frame sequence and flag the outlier frames.
+    Args:
+        frames (pd.DataFrame): Output of frame_sequence()
+        metrics (list): Metric columns to score (default SEQUENCE_METRICS)
+        window (int): Frames in the rolling window
+        threshold (float): Absolute score flagging an outlier
+    Returns:
+        pd.DataFrame: frames with a <metric>_z column per metric, an
+            "outlier" flag and the "outlier_metrics" that triggered it
+    """
+    metrics = [metric for metric in (metrics or SEQUENCE_METRICS) if metric in frames.columns]
+    frames = frames.copy()
+    flags = pd.DataFrame(index=frames.index)
+    for metric in metrics:
+        frames[f"{metric}_z"] = robust_z_scores(frames[metric], window)
+        flags[metric] = frames[f"{metric}_z"].abs() > threshold
+
+    frames["outlier"] = flags.any(axis=1)
+    # Comma separated metric names per row, built column by column
+    labels = pd.Series("", index=frames.index)
+    for metric in metrics:
+        labels = labels.where(~flags[metric], labels + metric + ",")
+    frames["outlier_metrics"] = labels.str.rstrip(",")
+    return frames
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_charts.py
+Description: Plotly figures and value formatting shared by the viewer and the HTML report.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+# GLOBALS / CONSTANTS
+# =========================
+DONUT_COLOURS = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A',
+                 '#19D3F3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52']
+
+
+# FUNCTIONS
+# =========================
+def has_data(data_dict, default_value="Can't parse details from log."):
+    """Check if a dictionary has any non-default, non-zero values."""
+    if not data_dict:
+        return False
+    for value in data_dict.values():
+        if value != default_value and value != 0 and value != 0.0 and value != "" and value != "0":
+            return True
+    return False
+
+def format_time(seconds):
+    """Format time in a human-readable format.
+    Args:
+        seconds (float): Time in seconds
+    Returns:
+        str: Formatted time string
+    """
+    if seconds < 60:
+        return f"{seconds:.2f}s"
+    minutes = int(seconds // 60)
+    remaining_seconds = seconds % 60
+    if minutes < 60:
+        return f"{minutes}m {remaining_seconds:.2f}s"
+    hours = int(minutes // 60)
+    remaining_minutes = minutes % 60
+    return f"{hours}h {remaining_minutes}m {remaining_seconds:.2f}s"
+
+def format_memory(megabytes):
+    """Format memory in appropriate units (MB or GB).
+    Args:
+        megabytes (float): Memory size in megabytes
+    Returns:
+        str: Formatted memory string
+    """
+    if megabytes == 0:
+        return "0 MB"
+    elif megabytes < 1024:
+        return f"{megabytes:.2f} MB"
+    else:
+        gigabytes = megabytes / 1024
+        return f"{gigabytes:.2f} GB"
+
+def chart_config(filename, width=1200, height=800):
+    """
+    Plotly config with the PNG download button.
+
+    Parameters:
+    filename (str): Download file name without extension
+    width (int): Downloaded image width
+    height (int): Downloaded image height
+    """
+    return {
+        'toImageButtonOptions': {
+            'format': 'png',
+            'filename': filename,
+            'height': height,
+            'width': width,
+            'scale': 2
+        },
+        'displayModeBar': True,
+        'displaylogo': False
+    }
+
+def bar_chart_figure(
+    values,
+    _index,
+    _x_label,
+    _y_label=None,
+    _horizontal=True,
+    convert_values=True,
+):
+    """
+    Build an interactive bar chart with tooltips.
+    Parameters:
+    values: Dictionary or DataFrame of values
+    _index (str): The index label
+    _x_label (str): The x-axis label
+    _y_label (str): The y-axis label
+    _horizontal (bool): Whether to display horizontal bars
+    convert_values (bool): Whether to convert dict to DataFrame
+    """
+    if convert_values:
+        df = pd.DataFrame(values, index=[str(_index)])
+    else:
+        if isinstance(values, pd.DataFrame):
+            df = values
+        elif isinstance(values, dict):
+            # A flat dict of scalars needs an explicit single-row index
+            df = pd.DataFrame([values], index=[str(_index)])
+        else:
+            df = pd.DataFrame(values)
+
+    # Ensure all values are numeric (convert to float if possible)
+    if isinstance(df, pd.DataFrame):
+        for col in df.columns:
+            try:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            except:
+                pass
+
+    # Create Plotly bar chart with better colors and interactivity
+    if _horizontal:
+        # Horizontal bar chart
+        fig = go.Figure()
+        for idx, row in df.iterrows():
+            fig.add_trace(go.Bar(
+                y=df.columns.tolist(),
+                x=row.tolist(),
+                orientation='h',
+                name=str(idx),
+                marker=dict(
+                    color=row.tolist(),
+                    colorscale='Viridis',
+                    showscale=True,
+                    colorbar=dict(title=_y_label or "Value")
+                ),
+                hovertemplate='<b>%{y}</b><br>' +
+                             f'{_y_label or "Value"}: %{{x:.2f}}<br>' +
+                             '<extra></extra>'
+            ))
+
+        fig.update_layout(
+            xaxis_title=_y_label or "Value",
+            yaxis_title=_x_label or "Category",
+            hovermode='closest',
+            showlegend=False,
+            height=max(400, len(df.columns) * 25),
+        )
+    else:
+        # Vertical bar chart
+        fig = go.Figure()
+        for idx, row in df.iterrows():
+            fig.add_trace(go.Bar(
+                x=df.columns.tolist(),
+                y=row.tolist(),
+                name=str(idx),
+                marker=dict(
+                    color=row.tolist(),
+                    colorscale='Viridis',
+                    showscale=True
+                ),
+                hovertemplate='<b>%{x}</b><br>' +
+                             f'{_y_label or "Value"}: %{{y:.2f}}<br>' +
+                             '<extra></extra>'
+            ))
+
+        fig.update_layout(
+            xaxis_title=_x_label or "Category",
+            yaxis_title=_y_label or "Value",
+            hovermode='closest',
+            showlegend=False,
+        )
+
+    return fig
+
+def donut_chart_figure(labels, values):
+    """
+    Build an interactive donut chart with tooltips.
+
+    Parameters:
+    labels (list): The labels for the chart.
+    values (list): The values for the chart.
+    """
+    # Create the donut chart with better colors
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=0.8,
+        marker=dict(
+            colors=DONUT_COLOURS,
+            line=dict(color='#FFFFFF', width=2)
+        ),
+        hovertemplate='<b>%{label}</b><br>' +
+                     'Value: %{value}<br>' +
+                     'Percentage: %{percent}<br>' +
+                     '<extra></extra>',
+        textposition='inside',
+        textinfo='percent+label'
+    )])
+
+    # Customize the layout
+    fig.update_layout(
+        width=300,
+        height=300,
+        margin=dict(t=5, b=5, l=5, r=5),
+        legend=dict(
+            x=1,
+            y=0.8,
+            traceorder="normal",
+            orientation="h",
+            font=dict(size=15),
+            bgcolor="rgba(255, 255, 255, 0)",
+            bordercolor="rgba(255, 255, 255, 0)",
+        ),
+    )
+    return fig
+
+def memory_timeline_figure(samples, jumps):
+    """
+    Build resident memory over the log with the largest jumps annotated.
+
+    Parameters:
+    samples (list): Output of ArnoldLogParser.get_memory_samples()
+    jumps (list): Output of ArnoldLogParser.get_memory_jumps()
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[sample["line"] for sample in samples],
+        y=[sample["memory_mb"] for sample in samples],
+        mode="lines",
+        line=dict(shape="hv", color="#636EFA"),
+        customdata=[[format_time(sample["elapsed"]), sample["phase"]] for sample in samples],
+        hovertemplate='<b>Line %{x}</b><br>' +
+                      'Memory: %{y} MB<br>' +
+                      'Elapsed: %{customdata[0]}<br>' +
+                      'Phase: %{customdata[1]}<br>' +
+                      '<extra></extra>',
+    ))
+
+    for jump in jumps:
+        fig.add_annotation(
+            x=jump["line"],
+            y=jump["memory_after_mb"],
+            text=f"+{format_memory(jump['delta_mb'])} {jump['tag'] or jump['phase']}",
+            showarrow=True,
+            arrowhead=2,
+        )
+
+    fig.update_layout(
+        xaxis_title="Log line",
+        yaxis_title="Resident memory (MB)",
+        hovermode="closest",
+        showlegend=False,
+    )
+    return fig
+
+def phase_timeline_figure(segments):
+    """
+    Build the wall-clock phases of the log as a Gantt chart.
+
+    Parameters:
+    segments (list): Output of ArnoldLogParser.get_phase_timeline()
+    """
+    phases = list(dict.fromkeys(segment["phase"] for segment in segments))
+    palette = px.colors.qualitative.Plotly
+
+    fig = go.Figure()
+    for i, phase in enumerate(phases):
+        phase_segments = [segment for segment in segments if segment["phase"] == phase]
+        fig.add_trace(go.Bar(
+            name=phase,
+            orientation="h",
+            y=[segment["label"] for segment in phase_segments],
+            x=[segment["duration"] for segment in phase_segments],
+            base=[segment["start"] for segment in phase_segments],
+            marker_color=palette[i % len(palette)],
+            customdata=[
+                [format_time(segment["start"]), format_time(segment["duration"]),
+                 segment["start_line"], segment["end_line"]]
+                for segment in phase_segments
+            ],
+            hovertemplate='<b>%{y}</b><br>' +
+                          'Start: %{customdata[0]}<br>' +
+                          'Duration: %{customdata[1]}<br>' +
+                          'Lines: %{customdata[2]}-%{customdata[3]}<br>' +
+                          '<extra></extra>',
+        ))
+
+    fig.update_layout(
+        xaxis_title="Elapsed (seconds)",
+        yaxis=dict(
+            categoryorder="array",
+            categoryarray=[segment["label"] for segment in segments],
+            autorange="reversed",
+        ),
+        height=max(300, 22 * len(segments)),
+        legend_title="Phase",
+    )
+    return fig
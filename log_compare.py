@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_compare.py
+Description: Compare the parsed stats of a baseline and a candidate Arnold log.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import re
+from typing import Dict, List, Set, Tuple
+
+from log_parser import ArnoldLogParser
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Sections compared field by field
+COMPARED_SECTIONS = ["render_time", "memory_stats", "ray_stats", "texture_stats"]
+
+# Everything a comparison needs from a single log
+COMPARISON_SECTIONS = COMPARED_SECTIONS + ["warnings", "plugin_info"]
+
+# Unit of the compared fields per section, with per-field exceptions.
+# Rows are only ranked against rows of the same unit.
+SECTION_UNITS = {
+    "render_time": "s",
+    "memory_stats": "MB",
+    "ray_stats": "rays",
+    "texture_stats": "files",
+}
+FIELD_UNITS = {
+    ("texture_stats", "peak_cache_memory"): "GB",
+    ("texture_stats", "pixel_data_read"): "GB",
+    ("texture_stats", "peak_cache_mb"): "MB",
+    ("texture_stats", "pixel_data_read_mb"): "MB",
+}
+
+# Order of the change groups in sorted comparisons
+CHANGE_ORDER = {"regression": 0, "improvement": 1, "unchanged": 2}
+
+# Patterns replaced by placeholders to turn warnings into templates
+TEMPLATE_PATTERNS = [
+    (re.compile(r'"[^"]*"'), '"<str>"'),
+    # Arnold quotes names as `name', replaced first so the plain quote pattern
+    # cannot pair their closing ' with a later one. A quote right after a
+    # word or a placeholder closes something, it never opens a string.
+    (re.compile(r"`[^']*'"), "`<str>'"),
+    (re.compile(r"(?<![\w>])'[^']*'"), "'<str>'"),
+    (re.compile(r"(?:[A-Za-z]:)?[\\/][\w.\-\\/]+"), "<path>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+
+
+# FUNCTIONS
+# =========================
+def parse_log_sections(log_content: str) -> Dict[str, any]:
+    """Parse the sections used for a comparison."""
+    return ArnoldLogParser(log_content).parse(COMPARISON_SECTIONS)
+
+
+def _to_number(value) -> float:
+    """Convert a parsed stat to a float, treating unparsed values as 0."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def compare_stats(baseline: Dict[str, any], candidate: Dict[str, any]) -> List[Dict[str, any]]:
+    """Align every compared field of two parsed logs.
+    Args:
+        baseline (dict): Parsed sections of the baseline log
+        candidate (dict): Parsed sections of the candidate log
+    Every compared stat is a cost, so a higher candidate value is a regression.
+    Returns:
+        list: One row per field with its unit, both values, the delta, the
+            relative delta (None when the baseline is 0) and the change
+            (regression, improvement or unchanged)
+    """
+    rows = []
+    for section in COMPARED_SECTIONS:
+        base_stats = baseline.get(section, {})
+        cand_stats = candidate.get(section, {})
+        for field in list(base_stats) + [key for key in cand_stats if key not in base_stats]:
+            base_value = _to_number(base_stats.get(field))
+            cand_value = _to_number(cand_stats.get(field))
+            delta = cand_value - base_value
+            rows.append({
+                "section": section,
+                "field": field,
+                "unit": FIELD_UNITS.get((section, field), SECTION_UNITS[section]),
+                "baseline": base_value,
+                "candidate": cand_value,
+                "delta": delta,
+                "relative": delta / base_value if base_value else None,
+                "change": "regression" if delta > 0 else "improvement" if delta < 0 else "unchanged",
+            })
+    return rows
+
+
+def sort_regressions(rows: List[Dict[str, any]], by: str = "relative") -> List[Dict[str, any]]:
+    """Sort comparison rows regressions first, then improvements, then unchanged.
+
+    Within a group, rows are sorted by the size of their relative change.
+    Rows without a relative change (a baseline of 0) come last. With
+    by="delta", rows are instead grouped by unit and sorted by absolute
+    change, so seconds, MB and ray counts are never ranked against each other.
+    """
+    if by == "delta":
+        return sorted(rows, key=lambda row: (CHANGE_ORDER[row["change"]], row["unit"], -abs(row["delta"])))
+    return sorted(
+        rows,
+        key=lambda row: (
+            CHANGE_ORDER[row["change"]],
+            row["relative"] is None,
+            -abs(row["relative"] or 0.0),
+            row["unit"],
+            -abs(row["delta"]),
+        ),
+    )
+
+
+def warning_template(line: str) -> str:
+    """Reduce a warning line to its message template.
+
+    The timestamp/memory prefix is dropped and names, paths and numbers are
+    replaced by placeholders, so the same warning on different nodes or
+    frames compares equal.
+    """
+    message = line.split("|", 1)[1].strip() if "|" in line else line.strip()
+    for pattern, placeholder in TEMPLATE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def loaded_plugins(plugin_info: Dict[str, List[str]]) -> Set[str]:
+    """Get the set of loaded plugin nodes from get_plugin_info() output."""
+    plugins = set()
+    for lines in plugin_info.values():
+        for line in lines:
+            if " uses Arnold" in line:
+                plugins.add(line.split(" uses Arnold", 1)[0].strip())
+    return plugins
+
+
+def set_difference(baseline: Set[str], candidate: Set[str]) -> Tuple[List[str], List[str]]:
+    """Get the items only in the baseline and only in the candidate."""
+    return sorted(baseline - candidate), sorted(candidate - baseline)
+
+
+def compare_logs(baseline: Dict[str, any], candidate: Dict[str, any]) -> Dict[str, any]:
+    """Compare two logs parsed with parse_log_sections().
+    Returns:
+        dict: "stats" rows, plus "warnings" and "plugins" as
+            (only in baseline, only in candidate) lists
+    """
+    return {
+        "stats": compare_stats(baseline, candidate),
+        "warnings": set_difference(
+            {warning_template(line) for line in baseline["warnings"]},
+            {warning_template(line) for line in candidate["warnings"]},
+        ),
+        "plugins": set_difference(
+            loaded_plugins(baseline["plugin_info"]),
+            loaded_plugins(candidate["plugin_info"]),
+        ),
+    }
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_export.py
+Description: Batch parse Arnold logs and export one row per render to Parquet.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import hashlib
+import os
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+from log_metrics import core_hours, sampling_throughput, total_rays, worker_specs
+from log_parser import (
+    COMPRESSED_EXTENSIONS,
+    DECOMPRESSION_ERRORS,
+    ArnoldLogParser,
+    compression_module,
+    iter_parse_chunks,
+)
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Sections needed to build an export row
+EXPORT_SECTIONS = [
+    "errors",
+    "warnings",
+    "render_info",
+    "worker_info",
+    "colour_space",
+    "scene_creation",
+    "render_time",
+    "memory_stats",
+    "ray_stats",
+    "shader_stats",
+    "ray_table",
+    "shader_table",
+    "geometry_stats",
+    "texture_stats",
+]
+
+# Column name -> column type, one row per render.
+# "category" columns are dictionary encoded as they repeat across renders.
+RENDER_COLUMNS = {
+    "path": "string",
+    "digest": "string",
+    "show": "category",
+    "date": "date",
+    "started_at": "timestamp",
+    "frame_number": "int",
+    "camera": "category",
+    "width": "int",
+    "height": "int",
+    "ass_file_size_mb": "float",
+    "render_time": "float",
+    "aov_count": "int",
+    "deep_aov_count": "int",
+    "render_mode": "category",
+    "output_file": "string",
+    "host_name": "category",
+    "cpu": "category",
+    "core_count": "category",
+    "physical_cores": "int",
+    "logical_cores": "int",
+    "worker_ram_mb": "int",
+    "host_application": "category",
+    "arnold_version": "category",
+    "colour_space": "category",
+    "error_count": "int",
+    "warning_count": "int",
+    # Scene creation
+    "scene_creation": "float",
+    "ass_parsing": "float",
+    "scene_unaccounted": "float",
+    # Render time
+    **{key: "float" for key in [
+        "frame_time", "license_checkout_time", "node_init", "sanity_checks",
+        "driver_init_close", "rendering", "subdivision", "threads_blocked",
+        "mesh_processing", "displacement", "accel_building", "importance_maps",
+        "output_driver", "pixel_rendering", "unaccounted",
+    ]},
+    # Frame time x logical cores, in hours
+    "core_hours": "float",
+    # Memory in MB
+    **{key: "float" for key in [
+        "peak_CPU_memory_used", "at_startup", "AOV_samples", "output_buffers",
+        "framebuffers", "node_overhead", "message_passing", "memory_pools",
+        "geometry", "polymesh", "vertices", "vertex_indices", "packed_normals",
+        "normal_indices", "uv_coords", "uv_coords_idxs", "uniform_indices",
+        "userdata", "subdivs", "accel_structs", "skydome_importance_map",
+        "strings", "texture_cache", "profiler", "backtrace_handler",
+    ]},
+    # Rays and shader calls
+    "camera_rays": "int",
+    "shadow_rays": "int",
+    "specular_reflect_rays": "int",
+    "specular_transmit_rays": "int",
+    "total_rays": "int",
+    "rays_per_second": "float",
+    "shader_calls_per_second": "float",
+    "primary_shader_calls": "int",
+    "transparent_shadow_shader_calls": "int",
+    "background_shader_calls": "int",
+    "light_filter_shader_calls": "int",
+    "importance_shader_calls": "int",
+    # Geometry
+    "polymesh_count": "int",
+    "proc_count": "int",
+    "triangle_count": "int",
+    "subdivision_surfaces": "int",
+    # Textures
+    "peak_cache_memory_gb": "float",
+    "pixel_data_read_gb": "float",
+    "unique_images": "int",
+    "duplicate_images": "int",
+    "constant_value_images": "int",
+    "broken_invalid_images": "int",
+}
+
+LOG_EXTENSIONS = tuple(
+    extension + compressed
+    for extension in (".log", ".txt")
+    for compressed in ("",) + COMPRESSED_EXTENSIONS
+)
+
+
+# FUNCTIONS
+# =========================
+def _to_int(value):
+    """Convert a parsed value to int, or None if it was not parsed."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_float(value):
+    """Convert a parsed value to float, or None if it was not parsed."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_text(value):
+    """Return a parsed string, or None for the parser's placeholder."""
+    if not value or value == "Can't parse details from log.":
+        return None
+    return value
+
+
+def _to_seconds(value):
+    """Convert a parsed MM:SS.ss / HH:MM:SS.ss string to seconds."""
+    if _to_text(value) is None:
+        return None
+    return ArnoldLogParser.time_to_seconds(value)
+
+
+def _mb_to_gb(value):
+    """Convert a size in MB to GB, or None if it was not parsed."""
+    return value / 1024 if value is not None else None
+
+
+def _stats_block(values: Dict[str, any]) -> Dict[str, any]:
+    """Get the values of a stats block, all None when the block is not in the log.
+
+    The parser reports the fields of a block it did not find as zeros, which
+    would read as real zero times, sizes and counts in every aggregate.
+    """
+    if any(_to_float(value) for value in values.values()):
+        return values
+    return dict.fromkeys(values)
+
+
+def _to_datetime(value):
+    """Convert the 'log started' date, e.g. 'Tue Jul 21 15:26:25 2015'."""
+    try:
+        return datetime.strptime(" ".join(value.split()), "%a %b %d %H:%M:%S %Y")
+    except (ValueError, AttributeError):
+        return None
+
+
+def render_row(path: str, sections: Dict[str, any], digest: str = None, show: str = None) -> Dict[str, any]:
+    """Flatten parsed sections into a typed export row.
+    Args:
+        path (str): Path of the parsed log
+        sections (dict): Output of ArnoldLogParser.parse() for EXPORT_SECTIONS
+        digest (str): Content digest of the log, used to spot duplicates
+        show (str): Show name to partition by
+    Returns:
+        dict: Row with one value per RENDER_COLUMNS entry
+    """
+    render_info = sections["render_info"]
+    worker_info = sections["worker_info"]
+    scene_creation = _stats_block(sections["scene_creation"])
+    render_time = _stats_block(sections["render_time"])
+    memory_stats = _stats_block(sections["memory_stats"])
+    ray_stats = _stats_block(sections["ray_stats"])
+    shader_stats = _stats_block(sections["shader_stats"])
+    geometry_stats = _stats_block(sections["geometry_stats"])
+    texture_stats = _stats_block(sections["texture_stats"])
+
+    started_at = _to_datetime(render_info["date_time"])
+
+    width = height = None
+    resolution = _to_text(render_info["resolution"])
+    if resolution and "x" in resolution:
+        width, height = (_to_int(part) for part in resolution.split("x", 1))
+
+    aov_count = deep_aov_count = None
+    aovs = _to_text(render_info["aov_count"])
+    if aovs:
+        aov_count = _to_int(aovs.split(" ", 1)[0])
+        deep_aov_count = _to_int(aovs.split("(", 1)[-1].split(" ", 1)[0])
+
+    ass_file_size = _to_text(render_info["file_size"])
+    specs = worker_specs(worker_info)
+    throughput = sampling_throughput(sections)
+
+    row = {
+        "path": path,
+        "digest": digest,
+        "show": show,
+        "date": started_at.date() if started_at else None,
+        "started_at": started_at,
+        "frame_number": _to_int(render_info["frame_number"]),
+        "camera": _to_text(render_info["camera"]),
+        "width": width,
+        "height": height,
+        "ass_file_size_mb": _to_float(ass_file_size.split()[0]) if ass_file_size else None,
+        "render_time": _to_seconds(render_info["render_time"]),
+        "aov_count": aov_count,
+        "deep_aov_count": deep_aov_count,
+        "render_mode": _to_text(render_info["cpu_gpu"]),
+        "output_file": _to_text(render_info["output_file"]),
+        "host_name": _to_text(worker_info["host_name"]),
+        "cpu": _to_text(worker_info["cpu"]),
+        "core_count": _to_text(worker_info["core_count"]),
+        "physical_cores": specs["physical_cores"],
+        "logical_cores": specs["logical_cores"],
+        "worker_ram_mb": _to_int(specs["ram_mb"]),
+        "host_application": _to_text(worker_info["host_application"]),
+        "arnold_version": _to_text(worker_info["arnold_version"]),
+        "colour_space": _to_text(sections["colour_space"]["colour_space"]),
+        "error_count": len(sections["errors"]),
+        "warning_count": len(sections["warnings"]),
+        "scene_creation": scene_creation["scene_creation"],
+        "ass_parsing": scene_creation["ass_parsing"],
+        "scene_unaccounted": scene_creation["unaccounted"],
+        "core_hours": core_hours(sections),
+        "camera_rays": ray_stats["camera"],
+        "shadow_rays": ray_stats["shadow"],
+        "specular_reflect_rays": ray_stats["specular_reflect"],
+        "specular_transmit_rays": ray_stats["specular_transmit"],
+        "total_rays": total_rays(sections) or None,
+        "rays_per_second": throughput["rays_per_second"],
+        "shader_calls_per_second": throughput["shader_calls_per_second"],
+        # The unit-aware sizes, "peak_cache_memory" and "pixel_data_read" only match GB
+        "peak_cache_memory_gb": _mb_to_gb(texture_stats["peak_cache_mb"]),
+        "pixel_data_read_gb": _mb_to_gb(texture_stats["pixel_data_read_mb"]),
+        "unique_images": _to_int(texture_stats["unique_images"]),
+        "duplicate_images": _to_int(texture_stats["duplicate_images"]),
+        "constant_value_images": _to_int(texture_stats["constant_value_images"]),
+        "broken_invalid_images": _to_int(texture_stats["broken_invalid_images"]),
+    }
+    row.update(render_time)
+    row.update(memory_stats)
+    row.update({f"{key}_shader_calls": value for key, value in shader_stats.items()})
+    row.update(geometry_stats)
+    # A frame never takes no time or memory, a zero is a line that was not found
+    for column in ("frame_time", "peak_CPU_memory_used"):
+        row[column] = row[column] or None
+
+    return {column: row.get(column) for column in RENDER_COLUMNS}
+
+
+def _open_decompressed(raw):
+    """Get the decompressed bytes of a seekable binary log stream, from its start."""
+    raw.seek(0)
+    module = compression_module(raw.read(6))
+    raw.seek(0)
+    return module.open(raw, "rb") if module is not None else raw
+
+
+def log_digest(source) -> str:
+    """SHA-256 of the decompressed bytes of a log.
+
+    The one digest of a log in the export, the history and the viewer, so
+    plain and compressed copies, and a log with or without a final newline
+    read either way, always get the same digest.
+    Args:
+        source: File path or seekable binary file object, optionally compressed
+    """
+    owns_source = isinstance(source, (str, bytes)) or hasattr(source, "__fspath__")
+    raw = open(source, "rb") if owns_source else source
+    digest = hashlib.sha256()
+    try:
+        stream = _open_decompressed(raw)
+        for block in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(block)
+        # Closing a decompressor leaves the file object it reads open
+        if stream is not raw:
+            stream.close()
+    finally:
+        if owns_source:
+            raw.close()
+    return digest.hexdigest()
+
+
+def parse_log_file(path: str, show: str = None) -> Dict[str, any]:
+    """Parse a single log file into an export row.
+
+    The log is parsed chunk by chunk, so only one chunk of a large or
+    compressed log is in memory at a time. A log that cannot be read, such
+    as a truncated .gz, is reported on stderr and gives no row.
+    Returns:
+        dict: Export row, or None if the log could not be read
+    """
+    digest = hashlib.sha256()
+    try:
+        # Digest the decompressed bytes as they are parsed, the same bytes as log_digest()
+        for progress in iter_parse_chunks(path, EXPORT_SECTIONS, digest=digest):
+            pass
+    except DECOMPRESSION_ERRORS as e:
+        print(f"{path}: {e}", file=sys.stderr)
+        return None
+
+    return render_row(path, progress.results, digest=digest.hexdigest(), show=show)
+
+
+def find_log_files(paths: Iterable[str]) -> List[str]:
+    """Expand directories into the log files they contain, recursively."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.lower().endswith(LOG_EXTENSIONS)
+                )
+        else:
+            files.append(path)
+    return files
+
+
+def parse_log_files(paths: Iterable[str], show: str = None, workers: int = None) -> Iterator[Dict[str, any]]:
+    """Parse many logs across worker processes, yielding rows in input order.
+    Args:
+        paths (list): Log files to parse
+        show (str): Show name stored on every row
+        workers (int): Worker process count (default: CPU count)
+    Yields:
+        dict: Export row per log, None for a log that could not be read
+    """
+    paths = list(paths)
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield parse_log_file(path, show)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_log_file, paths, [show] * len(paths), chunksize=16)
+
+
+def arrow_schema():
+    """Build the Arrow schema for RENDER_COLUMNS."""
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("s"),
+    }
+    return pa.schema([(column, types[kind]) for column, kind in RENDER_COLUMNS.items()])
+
+
+def read_parquet(source: str):
+    """Read a Parquet file or a dataset written by write_parquet().
+
+    Partition keys are typed from RENDER_COLUMNS instead of being inferred
+    from the directory names. Rows without a value for a partition column
+    are written under __HIVE_DEFAULT_PARTITION__. With inferred types those
+    rows make the whole dataset unreadable. With the explicit types they
+    come back as nulls. Columns missing from older exports are filled
+    with nulls too.
+    Args:
+        source (str): Parquet file or dataset root directory
+    Returns:
+        pyarrow.Table: Rows with the arrow_schema() columns, categories as strings
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # Category columns are read as plain strings, since a partition key has
+    # no dictionary. prepare_renders() converts them back to categories.
+    schema = pa.schema([
+        pa.field(field.name, field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+        for field in arrow_schema()
+    ])
+    partitioning = ds.HivePartitioning.discover(schema=schema)
+    return ds.dataset(source, format="parquet", partitioning=partitioning, schema=schema).to_table()
+
+
+def rows_to_table(rows: Iterable[Dict[str, any]]):
+    """Convert export rows to a typed Arrow table."""
+    import pyarrow as pa
+
+    return pa.Table.from_pylist(list(rows), schema=arrow_schema())
+
+
+def write_parquet(rows: Iterable[Dict[str, any]], out_dir: str, partition_by: List[str] = ("date",)) -> int:
+    """Append export rows to a partitioned Parquet dataset.
+    Args:
+        rows (list): Export rows
+        out_dir (str): Dataset root directory
+        partition_by (list): Columns to partition by, e.g. ["show", "date"]
+    Returns:
+        int: Number of rows written
+    """
+    import pyarrow.parquet as pq
+
+    table = rows_to_table(rows)
+    if table.num_rows == 0:
+        return 0
+
+    # Unique file names let repeated exports append to the same dataset
+    pq.write_to_dataset(
+        table,
+        out_dir,
+        partition_cols=list(partition_by) or None,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return table.num_rows
+
+
+# MAIN FUNCTION
+# =========================
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point for Parquet export.
+    """
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m log_export",
+        description="Parse Arnold render logs and export one row per render to a Parquet dataset.",
+    )
+    arg_parser.add_argument(
+        "logs", nargs="+", help="log files or directories of logs, optionally .gz/.bz2/.xz compressed"
+    )
+    arg_parser.add_argument("-o", "--output", required=True, help="Parquet dataset directory")
+    arg_parser.add_argument(
+        "--partition-by", default="date",
+        help="comma separated partition columns, e.g. 'show,date' (default date, '' for none)",
+    )
+    arg_parser.add_argument("--show", help="show name stored on every row")
+    arg_parser.add_argument("--workers", type=int, default=None, help="parse worker processes")
+    arg_parser.add_argument("--batch-size", type=int, default=10000, help="rows per written batch")
+    arg_parser.add_argument(
+        "--history", nargs="?", const="", metavar="DB",
+        help="also record the rows in the SQLite render history (default database if DB is omitted)",
+    )
+    args = arg_parser.parse_args(argv)
+
+    partition_by = [column.strip() for column in args.partition_by.split(",") if column.strip()]
+    unknown = [column for column in partition_by if column not in RENDER_COLUMNS]
+    if unknown:
+        arg_parser.error("unknown partition column(s): " + ", ".join(unknown))
+    if "show" in partition_by and not args.show:
+        arg_parser.error("--show is required to partition by show")
+
+    history = None
+    if args.history is not None:
+        import log_history
+
+        history = log_history.RenderHistory(args.history or log_history.DEFAULT_HISTORY_PATH)
+
+    written = 0
+    recorded = 0
+    skipped = 0
+    batch = []
+    for row in parse_log_files(find_log_files(args.logs), show=args.show, workers=args.workers):
+        if row is None:
+            skipped += 1
+            continue
+        batch.append(row)
+        if len(batch) >= args.batch_size:
+            written += write_parquet(batch, args.output, partition_by)
+            recorded += history.record(batch) if history else 0
+            batch = []
+    written += write_parquet(batch, args.output, partition_by)
+    recorded += history.record(batch) if history else 0
+
+    print(f"Wrote {written} render(s) to {args.output}")
+    if skipped:
+        print(f"Skipped {skipped} unreadable log(s)")
+    if history is not None:
+        print(f"Recorded {recorded} new render(s) in {history.path}")
+        history.close()
+    return 1 if skipped else 0
+
+
+# RUN THE SCRIPT
+# =========================
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_history.py
+Description: Local SQLite history of parsed renders, one typed row per log.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+
+from log_export import RENDER_COLUMNS, find_log_files, parse_log_files, render_row
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# History database, ARNOLD_LOG_HISTORY overrides the default location
+DEFAULT_HISTORY_PATH = os.environ.get(
+    "ARNOLD_LOG_HISTORY", os.path.join(os.path.expanduser("~"), ".arnold_log_viewer", "history.sqlite")
+)
+
+# RENDER_COLUMNS type -> SQLite column type, dates are stored as ISO text
+SQL_TYPES = {
+    "string": "TEXT",
+    "category": "TEXT",
+    "int": "INTEGER",
+    "float": "REAL",
+    "date": "TEXT",
+    "timestamp": "TEXT",
+}
+
+# Columns queried by the history page, each gets an index
+INDEXED_COLUMNS = ["date", "host_name", "arnold_version", "camera", "output_file"]
+
+# Rows written per transaction
+INSERT_BATCH_SIZE = 500
+
+# Rows returned by a query unless asked otherwise
+DEFAULT_QUERY_LIMIT = 5000
+
+
+# FUNCTIONS
+# =========================
+def _sql_value(value):
+    """Convert a row value to a type SQLite stores."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class RenderHistory:
+    """SQLite table of render rows with the RENDER_COLUMNS of the Parquet export."""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # WAL lets the app read while a CLI run records
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def create_schema(self):
+        """Create the table and indexes, adding columns new to RENDER_COLUMNS."""
+        columns = ", ".join(f'"{column}" {SQL_TYPES[kind]}' for column, kind in RENDER_COLUMNS.items())
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS renders (id INTEGER PRIMARY KEY, recorded_at TEXT, {columns})"
+            )
+            existing = {row["name"] for row in self.connection.execute("PRAGMA table_info(renders)")}
+            for column, kind in RENDER_COLUMNS.items():
+                if column not in existing:
+                    self.connection.execute(f'ALTER TABLE renders ADD COLUMN "{column}" {SQL_TYPES[kind]}')
+
+            # A log recorded twice (reloaded in the app, re-exported) is kept once
+            self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS renders_digest ON renders (digest)")
+            # Most queries also bound the date, so it trails every index
+            for column in INDEXED_COLUMNS:
+                keys = "date" if column == "date" else f'"{column}", date'
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS renders_{column} ON renders ({keys})")
+
+    def record(self, rows: Iterable[Dict[str, any]], batch_size: int = INSERT_BATCH_SIZE) -> int:
+        """Insert render rows, one transaction per batch.
+        Args:
+            rows (list): Rows from log_export.render_row()
+            batch_size (int): Rows per transaction
+        Returns:
+            int: Rows inserted, logs already recorded are skipped
+        """
+        columns = list(RENDER_COLUMNS)
+        quoted = ", ".join(f'"{column}"' for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT OR IGNORE INTO renders (recorded_at, {quoted}) VALUES (?, {placeholders})"
+        recorded_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+
+        inserted = 0
+        batch = []
+        for row in rows:
+            batch.append([recorded_at] + [_sql_value(row.get(column)) for column in columns])
+            if len(batch) >= batch_size:
+                inserted += self._insert(sql, batch)
+                batch = []
+        if batch:
+            inserted += self._insert(sql, batch)
+        return inserted
+
+    def _insert(self, sql: str, batch: List[list]) -> int:
+        """Insert one batch in a single transaction."""
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(sql, batch)
+            return self.connection.total_changes - before
+
+    def query(self, filters: Dict[str, any] = None, days: int = None, since: date = None,
+              columns: List[str] = None, limit: int = DEFAULT_QUERY_LIMIT,
+              prefixes: Dict[str, str] = None) -> List[Dict[str, any]]:
+        """Get recorded renders, newest first.
+        Args:
+            filters (dict): Column -> value or list of values, e.g. {"output_file": path}
+            prefixes (dict): Text column -> prefix its values start with, a
+                range over the column index, e.g. {"output_file": "/shows/abc/"}
+            days (int): Only renders of the last N days
+            since (date): Only renders on or after this date
+            columns (list): Columns to return (default all)
+            limit (int): Most rows returned
+        Returns:
+            list: Row dicts
+        """
+        where = []
+        params = []
+        for column, value in (filters or {}).items():
+            if column not in RENDER_COLUMNS:
+                raise ValueError(f"unknown column: {column}")
+            if value is None or value == []:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            where.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+            params.extend(_sql_value(item) for item in values)
+        for column, prefix in (prefixes or {}).items():
+            if column not in RENDER_COLUMNS:
+                raise ValueError(f"unknown column: {column}")
+            if not prefix:
+                continue
+            # Values from the prefix up to the next prefix, which LIKE would not use the index for
+            where.append(f'"{column}" >= ? AND "{column}" < ?')
+            params.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+
+        if days is not None:
+            since = max(since or date.min, date.today() - timedelta(days=days))
+        if since is not None:
+            where.append("date >= ?")
+            params.append(since.isoformat())
+
+        selected = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        sql = f"SELECT {selected} FROM renders"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def distinct(self, column: str) -> List[str]:
+        """Get the recorded values of a column, for filter choices."""
+        if column not in RENDER_COLUMNS:
+            raise ValueError(f"unknown column: {column}")
+        sql = f'SELECT DISTINCT "{column}" FROM renders WHERE "{column}" IS NOT NULL ORDER BY 1'
+        return [row[0] for row in self.connection.execute(sql)]
+
+    def count(self) -> int:
+        """Number of recorded renders."""
+        return self.connection.execute("SELECT COUNT(*) FROM renders").fetchone()[0]
+
+
+def record_sections(sections: Dict[str, any], path: str, digest: str,
+                    history_path: str = DEFAULT_HISTORY_PATH) -> int:
+    """Record one parsed log (all EXPORT_SECTIONS) in the history database."""
+    with RenderHistory(history_path) as history:
+        return history.record([render_row(path, sections, digest=digest)])
+
+
+# MAIN FUNCTION
+# =========================
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point: record logs in the history or query it.
+    """
+    import argparse
+    import json
+    import sys
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m log_history",
+        description="Record parsed Arnold logs in a local SQLite history and query it.",
+    )
+    arg_parser.add_argument("--db", default=DEFAULT_HISTORY_PATH, help=f"history database (default {DEFAULT_HISTORY_PATH})")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="parse logs and record them")
+    record_parser.add_argument("logs", nargs="+", help="log files or directories of logs")
+    record_parser.add_argument("--show", help="show name stored on every row")
+    record_parser.add_argument("--workers", type=int, default=None, help="parse worker processes")
+
+    query_parser = commands.add_parser("query", help="print recorded renders as NDJSON")
+    for column in INDEXED_COLUMNS[1:] + ["digest", "show"]:
+        query_parser.add_argument(f"--{column.replace('_', '-')}", dest=column, action="append")
+    query_parser.add_argument("--days", type=int, help="only renders of the last N days")
+    query_parser.add_argument("--limit", type=int, default=DEFAULT_QUERY_LIMIT, help="most rows printed")
+    args = arg_parser.parse_args(argv)
+
+    with RenderHistory(args.db) as history:
+        if args.command == "record":
+            rows = parse_log_files(find_log_files(args.logs), show=args.show, workers=args.workers)
+            inserted = history.record(rows)
+            print(f"Recorded {inserted} new render(s) in {args.db}")
+            return 0
+
+        filters = {column: getattr(args, column) for column in INDEXED_COLUMNS[1:] + ["digest", "show"]}
+        for row in history.query(filters, days=args.days, limit=args.limit):
+            sys.stdout.write(json.dumps(row) + "\n")
+    return 0
+
+
+# RUN THE SCRIPT
+# =========================
+if __name__ == "__main__":
+    raise SystemExit(main())
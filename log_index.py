@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_index.py
+Description: Facet index of log lines by severity, subsystem tag and elapsed time.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import bisect
+import itertools
+from typing import Dict, Iterable, List, Tuple
+
+from log_parser import ArnoldLogParser
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Severity -> marker, matching get_errors() and get_warnings()
+SEVERITY_MARKERS = {
+    "error": "ERROR |",
+    "warning": "WARNING |",
+}
+SEVERITIES = ["error", "warning", "info"]
+
+
+# FUNCTIONS
+# =========================
+def _bitmap(line_numbers: Iterable[int], line_count: int) -> int:
+    """Build an int bitmap with one bit per line from 0-based line numbers."""
+    bits = bytearray((line_count + 7) // 8)
+    for index in line_numbers:
+        bits[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bits, "little")
+
+
+def select_lines(lines: Iterable[str], line_numbers: List[int]) -> List[str]:
+    """Get the lines at sorted 0-based line numbers.
+    A LogLines is read once up to the last number instead of once per line.
+    """
+    if isinstance(lines, list):
+        return [lines[index] for index in line_numbers]
+    wanted = set(line_numbers)
+    last = line_numbers[-1] if line_numbers else -1
+    selected = []
+    for index, line in enumerate(itertools.islice(lines, last + 1)):
+        if index in wanted:
+            selected.append(line)
+    return selected
+
+
+class LogIndex:
+    """Per-facet line bitmaps built once, so combined filters are bitwise operations.
+
+    Bit i of a bitmap is set when line i (0-based) belongs to the facet.
+    Values within a facet are OR-ed and facets are AND-ed, so a query costs a
+    few big-int operations whatever the size of the log.
+    """
+
+    def __init__(self, lines: Iterable[str] = ()):
+        """
+        Args:
+            lines: Log lines, a list or a LogLines read in a single pass.
+                More can be added in log order with add_lines().
+        """
+        self._severity_lines = {severity: [] for severity in SEVERITY_MARKERS}
+        self._tag_lines = {}
+        self._bitmaps = None
+        # Elapsed seconds of every line, lines without a timestamp take the
+        # last one and the running maximum keeps the array sorted for bisect
+        self.elapsed = []
+        self._last_elapsed = 0.0
+        self._stamp = None
+        self.add_lines(lines)
+
+    def add_lines(self, lines: Iterable[str]):
+        """Index the next lines of the log, e.g. chunk by chunk while it is parsed."""
+        elapsed = self._last_elapsed
+        stamp = self._stamp
+        prefix_pattern = ArnoldLogParser.PATTERNS["line_prefix"]
+        tag_pattern = ArnoldLogParser.PATTERNS["subsystem_tag"]
+        for index, line in enumerate(lines, len(self.elapsed)):
+            for severity, marker in SEVERITY_MARKERS.items():
+                if marker in line:
+                    self._severity_lines[severity].append(index)
+                    break
+
+            match = tag_pattern.search(line)
+            if match:
+                self._tag_lines.setdefault(match.group(1), []).append(index)
+
+            match = prefix_pattern.match(line)
+            # Consecutive lines mostly share a timestamp, only convert changes
+            if match and match.group(1) != stamp:
+                stamp = match.group(1)
+                elapsed = max(elapsed, ArnoldLogParser.time_to_seconds(stamp))
+            self.elapsed.append(elapsed)
+
+        self._last_elapsed = elapsed
+        self._stamp = stamp
+        # Bitmaps are built on the first query after lines were added
+        self._bitmaps = None
+
+    def _build(self):
+        """Get (all, severities, tags) bitmaps, building them after lines were added."""
+        if self._bitmaps is None:
+            line_count = len(self.elapsed)
+            every_line = (1 << line_count) - 1
+            severities = {
+                severity: _bitmap(numbers, line_count) for severity, numbers in self._severity_lines.items()
+            }
+            # Every other line is info
+            severities["info"] = every_line & ~(severities["error"] | severities["warning"])
+            tags = {tag: _bitmap(numbers, line_count) for tag, numbers in sorted(self._tag_lines.items())}
+            self._bitmaps = (every_line, severities, tags)
+        return self._bitmaps
+
+    @property
+    def line_count(self) -> int:
+        """Number of indexed lines."""
+        return len(self.elapsed)
+
+    @property
+    def all(self) -> int:
+        """Bitmap of every line."""
+        return self._build()[0]
+
+    @property
+    def severities(self) -> Dict[str, int]:
+        """Severity -> bitmap of its lines."""
+        return self._build()[1]
+
+    @property
+    def tags(self) -> Dict[str, int]:
+        """Subsystem tag -> bitmap of its lines."""
+        return self._build()[2]
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        """First and last elapsed seconds in the log."""
+        if not self.elapsed:
+            return 0.0, 0.0
+        return self.elapsed[0], self.elapsed[-1]
+
+    def counts(self, facet: str, mask: int = None) -> Dict[str, int]:
+        """Count the lines of each value of a facet ("severity" or "tag"), optionally within a mask."""
+        bitmaps = self.severities if facet == "severity" else self.tags
+        mask = self.all if mask is None else mask
+        return {value: (bitmap & mask).bit_count() for value, bitmap in bitmaps.items()}
+
+    def time_window(self, start: float = None, end: float = None) -> int:
+        """Bitmap of the lines logged between start and end elapsed seconds (inclusive)."""
+        first = 0 if start is None else bisect.bisect_left(self.elapsed, start)
+        last = self.line_count if end is None else bisect.bisect_right(self.elapsed, end)
+        if last <= first:
+            return 0
+        return ((1 << last) - 1) ^ ((1 << first) - 1)
+
+    def query(self, severities: Iterable[str] = None, tags: Iterable[str] = None,
+              start: float = None, end: float = None) -> int:
+        """Bitmap of the lines matching every given facet.
+        Args:
+            severities (list): Any of SEVERITIES (default all)
+            tags (list): Subsystem tags without brackets (default all lines)
+            start (float): Earliest elapsed seconds (default start of log)
+            end (float): Latest elapsed seconds (default end of log)
+        Returns:
+            int: Bitmap of matching lines, see line_numbers()
+        """
+        mask = self.all
+        if severities:
+            selected = 0
+            for severity in severities:
+                selected |= self.severities.get(severity, 0)
+            mask &= selected
+        if tags:
+            selected = 0
+            for tag in tags:
+                selected |= self.tags.get(tag, 0)
+            mask &= selected
+        if start is not None or end is not None:
+            mask &= self.time_window(start, end)
+        return mask
+
+    @staticmethod
+    def line_numbers(mask: int) -> List[int]:
+        """Get the 0-based line numbers set in a bitmap, in log order."""
+        bits = bin(mask)[:1:-1]
+        numbers = []
+        index = bits.find("1")
+        while index != -1:
+            numbers.append(index)
+            index = bits.find("1", index + 1)
+        return numbers
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_json.py
+Description: Load Arnold render stats JSON and profile JSON into parser sections.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import io
+import json
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Only the standard library is imported, log_parser imports this module for
+# its command line.
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Top-level stats group (substring of its key) -> parser section it fills
+STATS_GROUPS = [
+    ("scene creation", "scene_creation"),
+    ("frame time", "render_time"),
+    ("render time", "render_time"),
+    ("memory", "memory_stats"),
+    ("ray", "ray_stats"),
+    ("shader", "shader_stats"),
+]
+
+# Stats names that differ from the parser field names, per section
+STATS_ALIASES = {
+    "scene_creation": {"scene_creation_time": "scene_creation"},
+    "render_time": {"license_checkout": "license_checkout_time"},
+    "memory_stats": {
+        "memory_at_startup": "at_startup",
+        "startup": "at_startup",
+        "peak_memory": "peak_cpu_memory_used",
+        "uv_coords_indices": "uv_coords_idxs",
+        "accel_structures": "accel_structs",
+    },
+}
+
+# Value keys of a stats entry, with the factor converting them to the units
+# the parser uses (seconds, MB, counts)
+STATS_UNITS = {
+    "microseconds": 1e-6,
+    "milliseconds": 1e-3,
+    "seconds": 1.0,
+    "bytes": 1.0 / 1024 ** 2,
+    "kb": 1.0 / 1024,
+    "mb": 1.0,
+    "gb": 1024.0,
+    "rays": 1,
+    "calls": 1,
+    "count": 1,
+    "total": 1,
+}
+
+# Characters read per chunk while streaming a profile
+PROFILE_CHUNK_SIZE = 1 << 16
+
+WHITESPACE = re.compile(r"[\s,]*")
+
+
+# FUNCTIONS
+# =========================
+@contextmanager
+def open_json(source):
+    """Open a JSON file path, or read a binary file object (e.g. an upload) as text."""
+    if isinstance(source, str) or hasattr(source, "__fspath__"):
+        with open(source, "r", encoding="utf-8") as f:
+            yield f
+        return
+
+    source.seek(0)
+    text = io.TextIOWrapper(source, encoding="utf-8")
+    try:
+        yield text
+    finally:
+        # Leave the caller's file object open
+        text.detach()
+
+
+def stats_key(name: str) -> str:
+    """Normalize a stats entry name to a parser field name, e.g. 'accel. building'."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def split_stats_unit(name: str) -> Tuple[str, float]:
+    """Split the unit off a flat stats name, e.g. 'frame time microseconds' -> ('frame_time', 1e-6).
+
+    Returns the normalized name and None when it does not end with a unit.
+    """
+    key = stats_key(name)
+    head, _, unit = key.rpartition("_")
+    factor = STATS_UNITS.get(unit)
+    if head and factor is not None:
+        return head, factor
+    return key, None
+
+
+def stats_value(entry):
+    """Get the value of a stats entry converted to parser units, or None."""
+    if isinstance(entry, bool):
+        return None
+    if isinstance(entry, (int, float)):
+        return entry
+    if isinstance(entry, dict):
+        for key, value in entry.items():
+            factor = STATS_UNITS.get(key.lower())
+            if factor is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+                return value * factor if factor != 1 else value
+    return None
+
+
+def _stats_fields(section: str, name: str, entry, fields: Dict[str, any]):
+    """Collect the fields of a stats entry and its children into a section."""
+    value = stats_value(entry)
+    if isinstance(entry, (int, float)) and value is not None:
+        # A flat value carries its unit in the name, e.g. "peak CPU memory used bytes"
+        key, factor = split_stats_unit(name)
+        if factor is not None and factor != 1:
+            value *= factor
+    else:
+        key = stats_key(name)
+    key = STATS_ALIASES.get(section, {}).get(key, key)
+    if value is not None:
+        fields[key] = value
+
+    if isinstance(entry, dict):
+        for child, child_entry in entry.items():
+            if isinstance(child_entry, dict) or child.lower() not in STATS_UNITS:
+                _stats_fields(section, child, child_entry, fields)
+
+
+def stats_sections(stats: Dict[str, any]) -> Dict[str, Dict[str, any]]:
+    """Map a render stats document onto parser sections.
+
+    A stats file holds one "render NNNN" object per render, the last one
+    wins like repeated lines in a log.
+    Args:
+        stats (dict): Loaded render stats JSON
+    Returns:
+        dict: Section -> normalized field -> value in parser units
+    """
+    renders = [value for key, value in stats.items() if key.startswith("render") and isinstance(value, dict)]
+    render = renders[-1] if renders else stats
+
+    sections = {}
+    for name, entry in render.items():
+        for marker, section in STATS_GROUPS:
+            if marker in name.lower():
+                _stats_fields(section, name, entry, sections.setdefault(section, {}))
+                break
+    return sections
+
+
+def load_stats_json(source) -> Dict[str, Dict[str, any]]:
+    """Load a render stats JSON file or file object into parser sections, see stats_sections()."""
+    with open_json(source) as f:
+        return stats_sections(json.load(f))
+
+
+def merge_json_sections(sections: Dict[str, any], json_sections: Dict[str, Dict[str, any]],
+                        defaults: Dict[str, any]) -> Dict[str, any]:
+    """Overwrite parsed sections with the exact values from a stats file.
+
+    Only fields the parser knows are taken, matched case-insensitively.
+    Args:
+        sections (dict): Parsed sections, updated in place
+        json_sections (dict): Output of stats_sections()
+        defaults (dict): Sections parsed from an empty log
+    Returns:
+        dict: The updated sections
+    """
+    for section, fields in json_sections.items():
+        if section not in defaults or not isinstance(defaults[section], dict):
+            continue
+        known = {field.lower(): field for field in defaults[section]}
+        target = sections.setdefault(section, dict(defaults[section]))
+        for key, value in fields.items():
+            if key in known:
+                target[known[key]] = value
+    return sections
+
+
+def is_profile_json(source) -> bool:
+    """Check whether a JSON file is a trace-event profile rather than render stats."""
+    with open_json(source) as f:
+        head = f.read(4096)
+    return head.lstrip().startswith("[") or '"traceEvents"' in head
+
+
+def iter_trace_events(source, chunk_size: int = PROFILE_CHUNK_SIZE) -> Iterator[Dict[str, any]]:
+    """Stream the events of a trace-event profile one at a time.
+
+    Events are decoded from a sliding buffer, so memory stays bounded by the
+    largest event however large the profile is. Both a bare event array and
+    an object with a "traceEvents" array are read, and an unterminated array
+    (allowed by the trace format) ends at the last complete event.
+    Args:
+        source: Profile JSON file path or binary file object
+        chunk_size (int): Characters read at a time
+    Yields:
+        dict: Trace events in file order
+    """
+    decoder = json.JSONDecoder()
+    with open_json(source) as f:
+        buffer = ""
+        eof = False
+
+        def fill():
+            nonlocal buffer, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+
+        # Find the opening bracket of the event array
+        while True:
+            fill()
+            stripped = buffer.lstrip()
+            if stripped.startswith("["):
+                pos = len(buffer) - len(stripped) + 1
+                break
+            match = re.search(r'"traceEvents"\s*:\s*\[', buffer)
+            if match:
+                pos = match.end()
+                break
+            if eof:
+                return
+            # Keep enough of the tail for a key split across chunks
+            buffer = buffer[-64:]
+
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                if eof:
+                    return
+                buffer = buffer[pos:]
+                pos = 0
+                fill()
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                event, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    return
+                buffer = buffer[pos:]
+                pos = 0
+                fill()
+                continue
+            yield event
+            pos = end
+
+
+def profile_timings(events: Iterator[Dict[str, any]]) -> List[Dict[str, any]]:
+    """Sum the time of each node in a stream of trace events.
+
+    Complete ("X") events are used directly, begin/end ("B"/"E") pairs are
+    matched per thread.
+    Args:
+        events: Trace events, e.g. from iter_trace_events()
+    Returns:
+        list: One row per node and category with calls, total, mean and
+            max seconds, slowest first
+    """
+    totals = {}
+    open_events = {}
+
+    def add(event, microseconds):
+        args = event.get("args") or {}
+        node = args.get("node") or args.get("name") or event.get("name", "")
+        category = event.get("cat", "")
+        row = totals.get((node, category))
+        if row is None:
+            row = totals[(node, category)] = {
+                "node": node,
+                "category": category,
+                "type": args.get("type") or args.get("node_type") or "",
+                "calls": 0,
+                "seconds": 0.0,
+                "max_seconds": 0.0,
+            }
+        seconds = microseconds * 1e-6
+        row["calls"] += 1
+        row["seconds"] += seconds
+        row["max_seconds"] = max(row["max_seconds"], seconds)
+
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        phase = event.get("ph")
+        if phase == "X" and isinstance(event.get("dur"), (int, float)):
+            add(event, event["dur"])
+        elif phase == "B":
+            open_events.setdefault((event.get("pid"), event.get("tid")), []).append(event)
+        elif phase == "E":
+            stack = open_events.get((event.get("pid"), event.get("tid")))
+            if stack:
+                begin = stack.pop()
+                add(begin, event.get("ts", 0) - begin.get("ts", 0))
+
+    rows = sorted(totals.values(), key=lambda row: row["seconds"], reverse=True)
+    for row in rows:
+        row["mean_seconds"] = row["seconds"] / row["calls"]
+    return rows
+
+
+def is_shader_timing(row: Dict[str, any]) -> bool:
+    """Check whether a profile timing row belongs to a shader."""
+    return "shader" in row["category"].lower() or "shader" in str(row["type"]).lower()
+
+
+def load_profile_json(source, top_n: int = 20) -> Dict[str, List[Dict[str, any]]]:
+    """Stream a profile JSON file into per-node and per-shader top-N tables.
+    Args:
+        source: Profile JSON file path or binary file object
+        top_n (int): Rows in each table
+    Returns:
+        dict: "nodes" and "shaders" timing rows, slowest first
+    """
+    rows = profile_timings(iter_trace_events(source))
+    return {
+        "nodes": rows[:top_n],
+        "shaders": [row for row in rows if is_shader_timing(row)][:top_n],
+    }
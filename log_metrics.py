@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_metrics.py
+Description: Derived performance metrics and bottleneck analysis for parsed logs.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import math
+import re
+import statistics
+from typing import Dict, List, Tuple
+
+from log_parser import ArnoldLogParser
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Sections the bottleneck analysis reads
+METRIC_SECTIONS = [
+    "render_info",
+    "worker_info",
+    "scene_creation",
+    "render_time",
+    "ray_stats",
+    "ray_table",
+    "geometry_stats",
+]
+
+# Metric -> thresholds. A metric is "warn" past the warn value and "bad"
+# past the bad value, in the direction given by higher_is_better.
+BOTTLENECK_THRESHOLDS = {
+    "rays_per_second_per_core": {"warn": 1.0e6, "bad": 2.5e5, "higher_is_better": True},
+    "pixel_rendering_share": {"warn": 0.6, "bad": 0.4, "higher_is_better": True},
+    "threads_blocked_ratio": {"warn": 0.05, "bad": 0.15, "higher_is_better": False},
+    "unaccounted_ratio": {"warn": 0.1, "bad": 0.25, "higher_is_better": False},
+    "accel_seconds_per_million_triangles": {"warn": 0.5, "bad": 2.0, "higher_is_better": False},
+    "ass_parse_mb_per_second": {"warn": 100.0, "bad": 20.0, "higher_is_better": True},
+}
+
+METRIC_LABELS = {
+    "rays_per_second_per_core": "Rays / Second / Core",
+    "pixel_rendering_share": "Pixel Rendering Share",
+    "threads_blocked_ratio": "Threads Blocked Ratio",
+    "unaccounted_ratio": "Unaccounted Ratio",
+    "accel_seconds_per_million_triangles": "Accel Build s / M Triangles",
+    "ass_parse_mb_per_second": ".ass Parse MB/s",
+}
+
+# Explanation shown when a metric is past its warn threshold
+METRIC_EXPLANATIONS = {
+    "rays_per_second_per_core": "Ray throughput per core is low: shading, textures or volumes are expensive per ray, or cores are starved.",
+    "pixel_rendering_share": "Little of the frame is spent rendering pixels: setup phases (scene creation, accel building, subdivision, I/O) dominate.",
+    "threads_blocked_ratio": "Render threads spend time blocked, usually waiting on texture I/O, locks or single-threaded work.",
+    "unaccounted_ratio": "A large part of the frame is not attributed to any phase, often plugin, procedural or host overhead.",
+    "accel_seconds_per_million_triangles": "Acceleration structures are slow to build for the triangle count, check motion keys and instancing.",
+    "ass_parse_mb_per_second": ".ass files parse slowly, check network storage throughput and file compression.",
+}
+
+# Render time fields that are phases of the frame (not totals)
+PHASE_FIELDS = [
+    "license_checkout_time",
+    "node_init",
+    "sanity_checks",
+    "driver_init_close",
+    "subdivision",
+    "threads_blocked",
+    "mesh_processing",
+    "displacement",
+    "accel_building",
+    "importance_maps",
+    "output_driver",
+    "pixel_rendering",
+    "unaccounted",
+]
+
+CORE_COUNT_PATTERN = re.compile(r"(\d+)\s+cores?(?:,\s*(\d+)\s+logical)?")
+RAM_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(KB|MB|GB|TB)", re.IGNORECASE)
+IMAGE_RESOLUTION_PATTERN = re.compile(r"(\d+)x(\d+)")
+
+# An interval is a stall when it takes STALL_FACTOR times the median interval
+# and at least MIN_STALL_SECONDS
+STALL_FACTOR = 3.0
+MIN_STALL_SECONDS = 120.0
+
+# Most recent progress steps used for the ETA fit, and the z value of its band
+ETA_FIT_STEPS = 10
+ETA_CONFIDENCE_Z = 1.96
+
+# Columns of the sampling_throughput() ray and shader call rows, display order
+SHADER_TABLE_COLUMNS = ["label", "count", "per_second", "per_pixel", "per_sample", "percent"]
+RAY_TABLE_COLUMNS = SHADER_TABLE_COLUMNS + ["avg_hits", "max_hits"]
+
+# GPU startup costs paid once per render before the first sample -> label
+GPU_STARTUP_LABELS = {
+    "shader_compilation": "Shader Compilation",
+    "cache_compilation": "Cache Compilation",
+    "prepopulation": "Cache Pre-population",
+}
+
+
+# FUNCTIONS
+# =========================
+def parse_core_count(core_count: str) -> Tuple[int, int]:
+    """Parse '6 cores, 12 logical' into (physical, logical) counts.
+    Returns:
+        tuple: (physical, logical), None for counts that are missing
+    """
+    match = CORE_COUNT_PATTERN.search(core_count or "")
+    if not match:
+        return None, None
+    physical = int(match.group(1))
+    logical = int(match.group(2)) if match.group(2) else physical
+    return physical, logical
+
+
+def parse_ram_mb(worker_ram: str) -> float:
+    """Parse a worker RAM string such as '32712MB' into MB, or None."""
+    match = RAM_PATTERN.search(worker_ram or "")
+    if not match:
+        return None
+    return ArnoldLogParser.size_to_mb(match.group(1), match.group(2))
+
+
+def worker_specs(worker_info: Dict[str, str]) -> Dict[str, any]:
+    """Get the numeric hardware of the worker from its display strings.
+    Args:
+        worker_info (dict): Output of ArnoldLogParser.get_worker_info()
+    Returns:
+        dict: physical_cores, logical_cores and ram_mb, None when missing
+    """
+    physical_cores, logical_cores = parse_core_count(worker_info.get("core_count"))
+    return {
+        "physical_cores": physical_cores,
+        "logical_cores": logical_cores,
+        "ram_mb": parse_ram_mb(worker_info.get("worker_ram")),
+    }
+
+
+def _ratio(numerator, denominator):
+    """Divide, or None when the denominator is missing or zero."""
+    if numerator is None or not denominator:
+        return None
+    return numerator / denominator
+
+
+def _frame_seconds(sections: Dict[str, any]) -> float:
+    """Get the frame time, falling back to the 'render done in' time."""
+    frame_time = sections["render_time"].get("frame_time")
+    if frame_time:
+        return frame_time
+
+    return ArnoldLogParser.time_to_seconds(sections["render_info"].get("render_time", "")) or None
+
+
+def _rendering_seconds(sections: Dict[str, any]) -> float:
+    """Get the time spent sampling, falling back to pixel rendering."""
+    render_time = sections["render_time"]
+    return render_time.get("rendering") or render_time.get("pixel_rendering")
+
+
+def _table_total(table: Dict[str, Dict[str, any]]) -> int:
+    """Get the "total" row count of a ray or shader table, else the sum of its rows."""
+    if "total" in table:
+        return table["total"]["count"]
+    return sum(row["count"] for row in table.values())
+
+
+def total_rays(sections: Dict[str, any]) -> int:
+    """Get the total ray count of a log, from the full ray table when parsed."""
+    ray_table = sections.get("ray_table")
+    if ray_table:
+        return _table_total(ray_table)
+    return sum(sections["ray_stats"].values())
+
+
+def sampling_throughput(sections: Dict[str, any]) -> Dict[str, any]:
+    """Get the ray and shader call rates over the rendering time.
+    Args:
+        sections (dict): Parsed render_time, ray_table and shader_table
+    Returns:
+        dict: total_rays, total_shader_calls, rays_per_second and
+            shader_calls_per_second (None when unknown), and "rays" and
+            "shader_calls" rows with label, count, per_pixel, per_sample,
+            percent and per_second, largest first, without the total
+    """
+    rendering = _rendering_seconds(sections)
+    result = {}
+    for name, section in (("rays", "ray_table"), ("shader_calls", "shader_table")):
+        table = sections.get(section) or {}
+        result[f"total_{name}"] = _table_total(table) if table else None
+        result[f"{name}_per_second"] = _ratio(result[f"total_{name}"], rendering)
+        rows = [
+            {"label": label, **row, "per_second": _ratio(row["count"], rendering)}
+            for label, row in table.items() if label != "total"
+        ]
+        result[name] = sorted(rows, key=lambda row: row["count"], reverse=True)
+    return result
+
+
+def core_hours(sections: Dict[str, any]) -> float:
+    """Get the cost of a frame in logical core-hours, or None if unknown."""
+    _, logical_cores = parse_core_count(sections["worker_info"].get("core_count"))
+    frame_seconds = _frame_seconds(sections)
+    if not frame_seconds or not logical_cores:
+        return None
+    return frame_seconds * logical_cores / 3600
+
+
+def derive_metrics(sections: Dict[str, any]) -> Dict[str, float]:
+    """Derive throughput and ratio metrics from parsed sections.
+    Args:
+        sections (dict): Parsed METRIC_SECTIONS
+    Returns:
+        dict: Metric -> value, None when the inputs are not in the log
+    """
+    render_time = sections["render_time"]
+    frame_seconds = _frame_seconds(sections)
+    rendering = _rendering_seconds(sections)
+    _, logical_cores = parse_core_count(sections["worker_info"].get("core_count"))
+
+    triangles = sections["geometry_stats"].get("triangle_count") or 0
+
+    file_size = sections["render_info"].get("file_size", "")
+    ass_mb = float(file_size.split()[0]) if file_size.endswith("MB") else None
+
+    return {
+        "rays_per_second_per_core": _ratio(
+            _ratio(total_rays(sections) or None, rendering), logical_cores
+        ),
+        "pixel_rendering_share": _ratio(render_time.get("pixel_rendering"), frame_seconds),
+        "threads_blocked_ratio": _ratio(render_time.get("threads_blocked"), rendering),
+        "unaccounted_ratio": _ratio(render_time.get("unaccounted"), frame_seconds),
+        "accel_seconds_per_million_triangles": _ratio(
+            render_time.get("accel_building") if triangles else None, triangles / 1e6
+        ),
+        "ass_parse_mb_per_second": _ratio(ass_mb, sections["scene_creation"].get("ass_parsing")),
+    }
+
+
+def rate_metric(value: float, threshold: Dict[str, any]) -> str:
+    """Rate a metric value as good, warn, bad or unknown."""
+    if value is None:
+        return "unknown"
+    if threshold.get("higher_is_better"):
+        if value < threshold["bad"]:
+            return "bad"
+        if value < threshold["warn"]:
+            return "warn"
+        return "good"
+    if value > threshold["bad"]:
+        return "bad"
+    if value > threshold["warn"]:
+        return "warn"
+    return "good"
+
+
+def phase_breakdown(sections: Dict[str, any]) -> List[Dict[str, any]]:
+    """Get the frame phases sorted by time, with their share of the frame."""
+    render_time = sections["render_time"]
+    frame_seconds = _frame_seconds(sections)
+
+    phases = [(field, render_time.get(field) or 0.0) for field in PHASE_FIELDS]
+    phases.append(("ass_parsing", sections["scene_creation"].get("ass_parsing") or 0.0))
+
+    return [
+        {"phase": phase, "seconds": seconds, "share": _ratio(seconds, frame_seconds)}
+        for phase, seconds in sorted(phases, key=lambda item: item[1], reverse=True)
+        if seconds > 0
+    ]
+
+
+def analyze_bottlenecks(sections: Dict[str, any], thresholds: Dict[str, Dict[str, any]] = None) -> Dict[str, any]:
+    """Rank derived metrics against thresholds and find the dominant phase.
+    Args:
+        sections (dict): Parsed METRIC_SECTIONS
+        thresholds (dict): Per-metric overrides of BOTTLENECK_THRESHOLDS
+    Returns:
+        dict: "metrics" rows worst first, "phases" sorted by time and
+            "dominant_phase" with a plain-language "summary"
+    """
+    limits = {metric: dict(threshold) for metric, threshold in BOTTLENECK_THRESHOLDS.items()}
+    for metric, override in (thresholds or {}).items():
+        limits.setdefault(metric, {}).update(override)
+
+    severity = {"bad": 0, "warn": 1, "good": 2, "unknown": 3}
+    rows = []
+    for metric, value in derive_metrics(sections).items():
+        status = rate_metric(value, limits[metric])
+        rows.append({
+            "metric": metric,
+            "label": METRIC_LABELS[metric],
+            "value": value,
+            "status": status,
+            "warn": limits[metric]["warn"],
+            "bad": limits[metric]["bad"],
+            "explanation": METRIC_EXPLANATIONS[metric] if status in ("warn", "bad") else "",
+        })
+    rows.sort(key=lambda row: severity[row["status"]])
+
+    phases = phase_breakdown(sections)
+    dominant = phases[0] if phases else None
+    if dominant is None:
+        summary = "No phase timings found in log."
+    elif dominant["share"] is not None:
+        summary = (
+            f"{dominant['phase'].replace('_', ' ').capitalize()} dominates the frame "
+            f"at {dominant['share']:.0%} of frame time."
+        )
+    else:
+        summary = f"{dominant['phase'].replace('_', ' ').capitalize()} is the longest phase."
+
+    return {
+        "metrics": rows,
+        "phases": phases,
+        "dominant_phase": dominant,
+        "summary": summary,
+    }
+
+
+def _image_pixels(resolution: str) -> int:
+    """Get the pixel count of a '1920x1080' resolution, or None."""
+    match = IMAGE_RESOLUTION_PATTERN.match(resolution or "")
+    return int(match.group(1)) * int(match.group(2)) if match else None
+
+
+def progress_intervals(steps: List[Dict[str, any]], resolution: str = None,
+                       stall_factor: float = STALL_FACTOR,
+                       min_stall_seconds: float = MIN_STALL_SECONDS) -> List[Dict[str, any]]:
+    """Get the throughput of every interval between two progress steps.
+    Args:
+        steps (list): Output of ArnoldLogParser.get_progress_timeline()
+        resolution (str): Image resolution, enables the rays/second estimate
+        stall_factor (float): Multiple of the median interval that is a stall
+        min_stall_seconds (float): Shortest interval that can be a stall
+    Returns:
+        list: Intervals with seconds, percent/minute, estimated rays/second
+            (None without a resolution) and a stall flag
+    """
+    pixels = _image_pixels(resolution)
+    intervals = []
+    for before, after in zip(steps, steps[1:]):
+        seconds = after["elapsed"] - before["elapsed"]
+        percent = after["percent"] - before["percent"]
+        rays_per_second = None
+        if pixels and seconds > 0:
+            # rays/pixel is the running average over the pixels done so far
+            rays_before = pixels * before["percent"] / 100 * before["rays_per_pixel"]
+            rays_after = pixels * after["percent"] / 100 * after["rays_per_pixel"]
+            rays_per_second = max(rays_after - rays_before, 0) / seconds
+        intervals.append({
+            "interval": f"{before['percent']}-{after['percent']}%",
+            "start": before["elapsed"],
+            "seconds": seconds,
+            "percent_per_minute": percent / seconds * 60 if seconds > 0 else None,
+            "rays_per_second": rays_per_second,
+            "stalled": False,
+        })
+
+    if intervals:
+        typical = statistics.median(interval["seconds"] for interval in intervals)
+        for interval in intervals:
+            interval["stalled"] = (
+                interval["seconds"] >= min_stall_seconds
+                and interval["seconds"] > stall_factor * typical
+            )
+    return intervals
+
+
+def predict_completion(steps: List[Dict[str, any]], now: float = None,
+                       fit_steps: int = ETA_FIT_STEPS) -> Dict[str, any]:
+    """Predict when a render reaches 100% from its progress steps.
+
+    Elapsed time is fitted linearly against percent done over the most
+    recent steps, and the band is the prediction interval of that fit at
+    100%.
+    Args:
+        steps (list): Output of ArnoldLogParser.get_progress_timeline()
+        now (float): Elapsed seconds of the last log line (default last step)
+        fit_steps (int): Number of recent steps to fit
+    Returns:
+        dict: Last percent, predicted total and remaining seconds with their
+            low/high band (None when there are too few steps), and
+            "stalled_for" seconds since the last step when past a stall
+    """
+    result = {
+        "percent": steps[-1]["percent"] if steps else None,
+        "complete": bool(steps) and steps[-1]["percent"] >= 100,
+        "total": None,
+        "total_low": None,
+        "total_high": None,
+        "remaining": None,
+        "remaining_low": None,
+        "remaining_high": None,
+        "stalled_for": None,
+    }
+    if not steps:
+        return result
+
+    last = steps[-1]
+    now = max(now if now is not None else last["elapsed"], last["elapsed"])
+    if result["complete"]:
+        result.update(total=last["elapsed"], total_low=last["elapsed"], total_high=last["elapsed"],
+                      remaining=0.0, remaining_low=0.0, remaining_high=0.0)
+        return result
+
+    intervals = progress_intervals(steps)
+    if intervals:
+        typical = statistics.median(interval["seconds"] for interval in intervals)
+        if now - last["elapsed"] >= MIN_STALL_SECONDS and now - last["elapsed"] > STALL_FACTOR * typical:
+            result["stalled_for"] = now - last["elapsed"]
+
+    recent = steps[-fit_steps:]
+    xs = [step["percent"] for step in recent]
+    ys = [step["elapsed"] for step in recent]
+    n = len(recent)
+    x_mean = sum(xs) / n
+    y_mean = sum(ys) / n
+    sxx = sum((x - x_mean) ** 2 for x in xs)
+    if n < 2 or not sxx:
+        return result
+
+    slope = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sxx
+    intercept = y_mean - slope * x_mean
+    total = intercept + slope * 100
+
+    band = 0.0
+    if n > 2:
+        residual = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys)) / (n - 2)
+        band = ETA_CONFIDENCE_Z * math.sqrt(residual * (1 + 1 / n + (100 - x_mean) ** 2 / sxx))
+
+    # When the next step is overdue, the remaining work starts from now
+    total += max(now - (intercept + slope * last["percent"]), 0.0)
+    result.update(
+        total=total,
+        total_low=max(total - band, now),
+        total_high=total + band,
+        remaining=total - now,
+        remaining_low=max(total - band - now, 0.0),
+        remaining_high=total + band - now,
+    )
+    return result
+
+
+def texture_io_report(texture_io: List[Dict[str, any]], texture_stats: Dict[str, any],
+                      top_n: int = 10) -> Dict[str, any]:
+    """Rank textures by I/O and measure how well the texture cache performs.
+    Args:
+        texture_io (list): Output of ArnoldLogParser.get_texture_io()
+        texture_stats (dict): Output of ArnoldLogParser.get_texture_stats()
+        top_n (int): Number of files in each ranking
+    Returns:
+        dict: "by_mb_read" and "by_redundancy" rankings, the "cache_efficiency"
+            ratio of pixel data read to peak cache memory (None when either is
+            missing), and counts of untiled and unmipped files
+    """
+    pixel_data_read = texture_stats.get("pixel_data_read_mb") or sum(row["mb_read"] for row in texture_io)
+    redundant = [
+        row for row in texture_io
+        if row["redundant_mb"] or row["redundant_tiles"] or row["opens"] > 1
+    ]
+
+    return {
+        "by_mb_read": sorted(texture_io, key=lambda row: row["mb_read"], reverse=True)[:top_n],
+        # Newer OIIO reports redundant reads, older versions only reopens
+        "by_redundancy": sorted(
+            redundant,
+            key=lambda row: (row["redundant_mb"] or 0.0, row["redundant_tiles"] or 0, row["opens"]),
+            reverse=True,
+        )[:top_n],
+        "cache_efficiency": _ratio(pixel_data_read or None, texture_stats.get("peak_cache_mb")),
+        "pixel_data_read_mb": pixel_data_read,
+        "untiled": sum(row["untiled"] for row in texture_io),
+        "unmipped": sum(row["unmipped"] for row in texture_io),
+    }
+
+
+def gpu_report(sections: Dict[str, any]) -> Dict[str, any]:
+    """Summarize GPU devices, their memory peaks and the startup overhead.
+    Args:
+        sections (dict): Parsed render_info, render_time, gpu_stats,
+            gpu_devices and gpu_memory
+    Returns:
+        dict: "devices" rows with name, memory_mb, peak_mb and peak_share of
+            device memory, "startup" rows with seconds and share of the frame,
+            startup_seconds, startup_share and frame_seconds (None when unknown)
+    """
+    gpu_stats = sections["gpu_stats"]
+    devices = {}
+    for row in sections["gpu_devices"]:
+        devices[row["device"]] = dict(row, peak_mb=None)
+    for sample in sections["gpu_memory"]:
+        device = devices.setdefault(sample["device"], {
+            "device": sample["device"], "name": None, "compute": None,
+            "memory_mb": None, "available_mb": None, "peak_mb": None,
+        })
+        device["peak_mb"] = max(device["peak_mb"] or 0.0, sample["memory_mb"])
+    # A single device without its own report peaks at the log's GPU peak
+    if len(devices) == 1 and gpu_stats["peak_gpu_memory_mb"]:
+        device = next(iter(devices.values()))
+        device["peak_mb"] = device["peak_mb"] or gpu_stats["peak_gpu_memory_mb"]
+    for device in devices.values():
+        device["peak_share"] = _ratio(device["peak_mb"], device["memory_mb"])
+
+    frame_seconds = _frame_seconds(sections)
+    startup_seconds = sum(gpu_stats[field] for field in GPU_STARTUP_LABELS)
+    return {
+        "devices": [devices[index] for index in sorted(devices)],
+        "startup": [
+            {"phase": field, "seconds": gpu_stats[field], "share": _ratio(gpu_stats[field], frame_seconds)}
+            for field in GPU_STARTUP_LABELS
+        ],
+        "startup_seconds": startup_seconds,
+        "startup_share": _ratio(startup_seconds, frame_seconds),
+        "frame_seconds": frame_seconds,
+    }
@@ -1,5 +1,292 @@
+import bz2
+import gzip
+import io
+import itertools
+import lzma
+import os
 import re
-from typing import Dict, List, Tuple
+import time
+from functools import wraps
+from typing import Dict, Iterable, List, Tuple
+
+
+# Leading magic bytes of the compressed formats logs are archived in
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": gzip,
+    b"BZh": bz2,
+    b"\xfd7zXZ\x00": lzma,
+}
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".xz")
+
+# Errors raised when a compressed log is corrupt or truncated
+DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+# Helper patterns for values already cut out of a matched line. Only the
+# ArnoldLogParser.PATTERNS searched by a parser instance are profiled, these are not.
+TEXTURE_MIP_COUNT_PATTERN = re.compile(r"MIP-COUNT\s*\[([\d,\s]*)\]")
+INTEGER_PATTERN = re.compile(r"\d+")
+# OIIO interval amounts such as '1h 2m 3.4s'
+INTERVAL_UNIT_PATTERN = re.compile(r"([\d.]+)\s*([hms])")
+
+
+def compression_module(header: bytes):
+    """Get the gzip/bz2/lzma module matching a file header, or None."""
+    for magic, module in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return module
+    return None
+
+
+def _stream_header(f) -> bytes:
+    """Read the first bytes of a binary stream without consuming them."""
+    if f.seekable():
+        f.seek(0)
+        header = f.read(6)
+        f.seek(0)
+        return header
+    # Pipes such as stdin can only be peeked
+    return f.peek(6)[:6]
+
+
+def open_log(source, encoding: str = "utf-8", errors: str = "replace"):
+    """Open a log for streaming, transparently decompressing .gz/.bz2/.xz.
+
+    The decompressed text is read line by line as it is iterated, so a
+    compressed log is never expanded in memory as a whole.
+    Args:
+        source: File path or binary file object (e.g. an uploaded file)
+        encoding (str): Text encoding of the log
+        errors (str): How to handle undecodable bytes
+    Returns:
+        Text file object yielding the log lines
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as f:
+            header = f.read(6)
+    else:
+        header = _stream_header(source)
+
+    module = compression_module(header)
+    if module is not None:
+        return module.open(source, "rt", encoding=encoding, errors=errors)
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        return open(source, "r", encoding=encoding, errors=errors)
+    return io.TextIOWrapper(source, encoding=encoding, errors=errors)
+
+
+class _UnclosedStream(io.RawIOBase):
+    """Read-only view of a binary stream that is not closed with the view."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self.raw.readinto(buffer)
+
+
+class _DigestStream(io.RawIOBase):
+    """Binary stream view that feeds every byte read through it to a digest."""
+
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self.raw.readinto(buffer)
+        self.digest.update(memoryview(buffer)[:count])
+        return count
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
+def _iter_stream_lines(raw, errors: str = "replace", digest=None):
+    """Iterate the lines of a binary stream like open_log(), leaving the stream open.
+
+    Closing the text wrapper of open_log() also closes the stream it wraps,
+    which a caller such as the viewer may still want to read again.
+    A digest (e.g. hashlib.sha256()) is updated with the decompressed bytes.
+    """
+    if raw.seekable():
+        raw.seek(0)
+    stream = io.BufferedReader(_UnclosedStream(raw))
+    if digest is not None:
+        module = compression_module(_stream_header(stream))
+        if module is not None:
+            stream = module.open(stream, "rb")
+        stream = io.BufferedReader(_DigestStream(stream, digest))
+    with open_log(stream, errors=errors) as f:
+        yield from f
+
+
+class LogLines:
+    """Re-readable sequence of the lines of a seekable log.
+
+    Every iteration streams the log again from its start, decompressing it
+    as it goes, so the line-level views of a parser can run over a log too
+    large to hold as a list of lines. Only iteration and slicing are cheap,
+    use log_index.select_lines() to pick many lines by number.
+    """
+
+    def __init__(self, source, errors: str = "replace"):
+        """
+        Args:
+            source: File path or seekable binary file object, optionally compressed
+            errors (str): How to handle undecodable bytes
+        """
+        self.source = source
+        self.errors = errors
+        self._count = None
+
+    def __iter__(self):
+        owns_source = isinstance(self.source, (str, bytes)) or hasattr(self.source, "__fspath__")
+        raw = open(self.source, "rb") if owns_source else self.source
+        count = 0
+        try:
+            for line in _iter_stream_lines(raw, self.errors):
+                count += 1
+                yield line.rstrip("\r\n")
+            self._count = count
+        finally:
+            if owns_source:
+                raw.close()
+
+    def __len__(self) -> int:
+        if self._count is None:
+            for _ in self:
+                pass
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(itertools.islice(self, index.start, index.stop, index.step))
+        if index < 0:
+            index += len(self)
+        for line in itertools.islice(self, index, None):
+            return line
+        raise IndexError("log line index out of range")
+
+
+class ParserProfile:
+    """Per-pattern and per-section counters collected while profiling."""
+
+    def __init__(self):
+        self.section = None
+        # (section, pattern) -> [searches, matches, seconds]
+        self.pattern_stats = {}
+        # section -> [calls, seconds]
+        self.section_stats = {}
+
+    def record_search(self, name: str, matched: bool, seconds: float):
+        """Record a single pattern search."""
+        key = (self.section, name)
+        stats = self.pattern_stats.get(key)
+        if stats is None:
+            stats = self.pattern_stats[key] = [0, 0, 0.0]
+        stats[0] += 1
+        stats[1] += matched
+        stats[2] += seconds
+
+    def record_section(self, section: str, seconds: float):
+        """Record a single call of a get_* section."""
+        stats = self.section_stats.setdefault(section, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+    def report(self, pattern_names: Iterable[str]) -> Dict[str, any]:
+        """Build the structured profile report.
+        Args:
+            pattern_names (list): Every pattern name, so unused ones are listed too
+        Returns:
+            dict: "sections" and "patterns" rows sorted by cumulative time, and
+                "never_matched" listing patterns without a single match.
+        """
+        sections = {
+            section: {"section": section, "calls": calls, "searches": 0, "matches": 0, "seconds": seconds}
+            for section, (calls, seconds) in self.section_stats.items()
+        }
+        patterns = {
+            name: {"pattern": name, "sections": [], "searches": 0, "matches": 0, "seconds": 0.0}
+            for name in pattern_names
+        }
+        for (section, name), (searches, matches, seconds) in self.pattern_stats.items():
+            row = patterns[name]
+            if section and section not in row["sections"]:
+                row["sections"].append(section)
+            row["searches"] += searches
+            row["matches"] += matches
+            row["seconds"] += seconds
+
+            if section in sections:
+                sections[section]["searches"] += searches
+                sections[section]["matches"] += matches
+
+        section_rows = sorted(sections.values(), key=lambda row: row["seconds"], reverse=True)
+        pattern_rows = sorted(patterns.values(), key=lambda row: row["seconds"], reverse=True)
+
+        return {
+            "sections": section_rows,
+            "patterns": pattern_rows,
+            "never_matched": [row["pattern"] for row in pattern_rows if row["matches"] == 0],
+        }
+
+
+class _ProfiledPattern:
+    """Compiled pattern wrapper that reports every search to a profile."""
+
+    __slots__ = ("name", "pattern", "profile")
+
+    def __init__(self, name: str, pattern: re.Pattern, profile: ParserProfile):
+        self.name = name
+        self.pattern = pattern
+        self.profile = profile
+
+    def search(self, line: str):
+        start = time.perf_counter()
+        match = self.pattern.search(line)
+        self.profile.record_search(self.name, match is not None, time.perf_counter() - start)
+        return match
+
+    def match(self, line: str):
+        start = time.perf_counter()
+        match = self.pattern.match(line)
+        self.profile.record_search(self.name, match is not None, time.perf_counter() - start)
+        return match
+
+    def findall(self, line: str):
+        start = time.perf_counter()
+        matches = self.pattern.findall(line)
+        self.profile.record_search(self.name, bool(matches), time.perf_counter() - start)
+        return matches
+
+
+def _profiled_section(method):
+    """Time a get_* section when the parser was created with profile=True."""
+    section = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profile = self.profile
+        if profile is None:
+            return method(self, *args, **kwargs)
+
+        outer_section = profile.section
+        profile.section = section
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.record_section(section, time.perf_counter() - start)
+            profile.section = outer_section
+
+    return wrapper
 
 
 class ArnoldLogParser:
@@ -18,10 +305,23 @@ class ArnoldLogParser:
         "cpu_gpu": re.compile(r"using\s+(CPU|GPU)"),
         "output_file": re.compile(r"writing file `([^`]+)'"),
 
+        # Line prefix patterns (elapsed time and resident memory)
+        "line_prefix": re.compile(r"^(\d+:\d+:\d+)\s+(\d+)MB"),
+
+        # Subsystem tag at the start of a message, e.g. [ass] or [mtoa.session]
+        "subsystem_tag": re.compile(r"\|\s*\[([\w.]+)\]"),
+
+        # Plugin patterns
+        "plugin_node": re.compile(r"(\S+):\s+(\S+)\s+uses Arnold\s+([\d.]+)"),
+        "plugin_load": re.compile(
+            r"loaded\s+(\d+)\s+plugins\s+from\s+(\d+)\s+lib\(s\)\s+in\s+((?:\d+:)?\d+:\d+(?:\.\d+)?)"
+        ),
+
         # Worker info patterns
         "cpu": re.compile(r"\|\s*\d+\s+x\s+(.*?)\s+\("),
         "core_count": re.compile(r"\(([^()]+cores[^()]+)\)"),
         "worker_ram": re.compile(r"with\s+(\d+MB)"),
+        "host_name": re.compile(r"running on (\S+?),?\s+pid="),
         "host_application": re.compile(r"host application:\s*(.*?)(?:\s+Maya\s+([\d.]+))?$"),
         "arnold_version": re.compile(r"(Arnold\s+\d+\.\d+\.\d+\.\d+)"),
 
@@ -109,6 +409,16 @@ class ArnoldLogParser:
         "light_filter": re.compile(r"\|\s+light_filter\s+(\d+)"),
         "importance": re.compile(r"\|\s+importance\s+(\d+)"),
 
+        # Full ray and shader tables: label, count (/pixel, /sample) (% total),
+        # ray rows end with (avg. hits) (max hits), shader rows end at the percentage
+        "ray_row": re.compile(
+            r"\|\s+(\w[\w ]*?)\s+(\d+)\s+\(\s*([^,\s]+),\s*([^)\s]+)\)\s+\(\s*([^%\s]+)%\)"
+            r"\s+\(\s*([^)\s]+)\)\s+\(\s*(\d+)\)"
+        ),
+        "shader_row": re.compile(
+            r"\|\s+(\w[\w ]*?)\s+(\d+)\s+\(\s*([^,\s]+),\s*([^)\s]+)\)\s+\(\s*([^%\s]+)%\)\s*$"
+        ),
+
         # Geometry stats patterns
         "polymesh_count": re.compile(r"\|\s+polymeshes\s+(\d+)"),
         "proc_count": re.compile(r"\|\s+procs\s+(\d+)"),
@@ -122,12 +432,148 @@ class ArnoldLogParser:
         "duplicate_images": re.compile(r"\|\s+(\d+)\s+were exact duplicates of other images"),
         "constant_value_images": re.compile(r"\|\s+(\d+)\s+were constant-valued"),
         "broken_invalid_images": re.compile(r"\|\s+Broken or invalid files:\s+(\d+)"),
+        "peak_cache_size": re.compile(r"\|\s+Peak cache memory\s*:\s*([\d.]+)\s*([KMGT]?B)\b"),
+        # OIIO 1.x reports "Read from disk", later versions "Pixel data read"
+        "pixel_data_size": re.compile(r"\|\s+(?:Pixel data read|Read from disk)\s*:\s*([\d.]+)\s*([KMGT]?B)\b"),
+        # Image file statistics row: index, opens, tiles, MB read,
+        # (redundant tiles, MB) on newer OIIO, I/O time, resolution, file + flags
+        "texture_file": re.compile(
+            r"\|\s+\d+\s+(\d+)\s+(\d+)\s+([\d.]+)\s+(?:\(\s*(\d+)\s+([\d.]+)\)\s+)?"
+            r"((?:\d+h\s*)?(?:\d+m\s*)?[\d.]+s)\s+(\d+x\s*\d+\S*)\s+(.+?)\s*$"
+        ),
+        "texture_flags": re.compile(r"^(.+?)((?:\s+[A-Z][A-Z0-9-]+(?:\s*\[[^\]]*\])?)*)$"),
+
+        # GPU patterns
+        "gpu_device_count": re.compile(r"\[gpu\]\s+using\s+(\d+)\s+device"),
+        # Device row: index, name, then "@ clock (compute x.y) with NMB (NMB available)"
+        "gpu_device": re.compile(r"\[gpu\]\s+(?:device\s+)?(\d+):\s+(.+?)\s*$"),
+        "gpu_device_name": re.compile(r"^(.+?)(?:\s+@|\s+\(|\s+with\s|$)"),
+        "gpu_device_compute": re.compile(r"\(compute\s+([\d.]+)\)"),
+        "gpu_device_memory": re.compile(r"with\s+([\d.]+)\s*([KMGT]?B)\b"),
+        "gpu_device_available": re.compile(r"([\d.]+)\s*([KMGT]?B)\s+available"),
+        "gpu_driver": re.compile(r"driver version\s+([\d.]+)"),
+        # Startup timings: shader and program cache compilation, cache pre-population
+        "gpu_timing": re.compile(
+            r"\[gpu\]\s+(.*?(?:compil|populat).*?)\s+(?:took|done in|in)\s+"
+            r"((?:\d+:)?\d+:\d+(?:\.\d+)?|(?:[\d.]+\s*[hms]\s*)+)"
+        ),
+        "gpu_memory": re.compile(r"\[gpu\]\s+device\s+(\d+)\s+(peak\s+)?memory used\s+([\d.]+)\s*([KMGT]?B)\b"),
+        "peak_gpu_memory": re.compile(r"\|\s+peak GPU memory used\s+([\d.]+)\s*([KMGT]?B)\b"),
+        "gpu_out_of_core": re.compile(r"\[gpu\].*?out[- ]of[- ]core.*?([\d.]+)\s*([KMGT]?B)\b"),
     }
 
-    def __init__(self, log_content: str):
-        self.log_content = log_content
+    # Section -> line marker after which no later line can change it, for a
+    # log of a single render. The header is final once rendering starts and
+    # anything that can be logged at any time only at shutdown. Unlisted
+    # sections are final once the statistics are printed and resources are
+    # released, and every section is final at shutdown.
+    FINAL_MARKERS = {
+        "worker_info": "rendering image at",
+        "colour_space": "rendering image at",
+        "errors": "Arnold shutdown",
+        "warnings": "Arnold shutdown",
+        "plugin_info": "Arnold shutdown",
+    }
+    STATS_END_MARKER = "releasing resources"
+    SHUTDOWN_MARKER = "Arnold shutdown"
+    # Starts the next render of concatenated logs, which reopens every section
+    RENDER_START_MARKER = "log started"
+
+    # Line marker -> log phase it starts, checked in order. Lines without a
+    # marker belong to the phase of the line before them.
+    PHASE_MARKERS = [
+        ("unloading", "shutdown"),
+        ("loading plugin", "plugin loading"),
+        ("uses Arnold", "plugin loading"),
+        ("[rlm]", "license checkout"),
+        ("[clm]", "license checkout"),
+        ("[color_manager", "colour management"),
+        ("[ass]", "ass parsing"),
+        ("there are ", "scene creation"),
+        ("initializing", "node init"),
+        ("updating", "node update"),
+        ("[aov]", "aov setup"),
+        ("[subdiv]", "subdivision"),
+        ("[accel]", "accel building"),
+        ("[texturesys]", "texture loading"),
+        ("bucket workers", "rendering"),
+        ("% done", "rendering"),
+        ("writing file", "driver close"),
+        ("render done", "driver close"),
+        ("scene creation time", "statistics"),
+        ("releasing resources", "shutdown"),
+    ]
+
+    # Section name -> get_* method, in the order the viewer displays them
+    SECTIONS = {
+        "errors": "get_errors",
+        "warnings": "get_warnings",
+        "render_info": "get_render_info",
+        "worker_info": "get_worker_info",
+        "plugin_info": "get_plugin_info",
+        "plugin_table": "get_plugin_table",
+        "colour_space": "get_colour_space",
+        "scene_info": "get_scene_info",
+        "sample_info": "get_sample_info",
+        "progress_info": "get_progress_info",
+        "scene_creation": "get_scene_creation",
+        "render_time": "get_render_time",
+        "memory_stats": "get_memory_stats",
+        "ray_stats": "get_ray_stats",
+        "shader_stats": "get_shader_stats",
+        "ray_table": "get_ray_table",
+        "shader_table": "get_shader_table",
+        "geometry_stats": "get_geometry_stats",
+        "texture_stats": "get_texture_stats",
+        "texture_io": "get_texture_io",
+        "gpu_stats": "get_gpu_stats",
+        "gpu_devices": "get_gpu_devices",
+        "gpu_memory": "get_gpu_memory",
+    }
+
+    def __init__(self, log_content: str, profile=False):
         self.lines = log_content.splitlines()
+        self.profile = None
+        # Line number (0-based) and phase the lines start at, when they are
+        # a chunk of a longer log, see LineViews
+        self.first_line = 0
+        self.first_phase = "startup"
+
+        if profile:
+            # Shadow the class patterns with instrumented wrappers, so the
+            # get_* methods stay untouched and cost nothing when not profiling.
+            # An existing ParserProfile can be passed to share it between parsers.
+            self.profile = profile if isinstance(profile, ParserProfile) else ParserProfile()
+            self.PATTERNS = {
+                name: _ProfiledPattern(name, pattern, self.profile)
+                for name, pattern in type(self).PATTERNS.items()
+            }
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], profile=False) -> "ArnoldLogParser":
+        """Create a parser from an iterable of lines, e.g. open_log(path).
+        The lines are stored as they are read, without first joining the
+        whole log into a single string.
+        """
+        parser = cls("", profile=profile)
+        parser.lines = [line.rstrip("\r\n") for line in lines]
+        return parser
+
+    @classmethod
+    def from_source(cls, source, profile=False, errors: str = "replace") -> "ArnoldLogParser":
+        """Create a parser that re-reads a seekable log on every pass over its
+        lines instead of holding them, see LogLines.
+        """
+        parser = cls("", profile=profile)
+        parser.lines = LogLines(source, errors=errors)
+        return parser
+
+    @property
+    def log_content(self) -> str:
+        """The full log text."""
+        return "\n".join(self.lines)
 
+    @_profiled_section
     def get_warnings(self) -> List[str]:
         """Get warnings."""
         data = []
@@ -137,6 +583,7 @@ class ArnoldLogParser:
                 data.append(line)
         return data
 
+    @_profiled_section
     def get_errors(self) -> List[str]:
         """Get Errors."""
         data = []
@@ -146,7 +593,8 @@ class ArnoldLogParser:
                 data.append(line)
         return data
     
-    def time_to_seconds(self, t: str) -> float:
+    @staticmethod
+    def time_to_seconds(t: str) -> float:
         """Convert time string to seconds.
         Args:
             t (str): Time string in format HH:MM:SS.ss or MM:SS.ss
@@ -173,6 +621,26 @@ class ArnoldLogParser:
         except (ValueError, AttributeError):
             return 0.0
 
+    @staticmethod
+    def size_to_mb(value: str, unit: str) -> float:
+        """Convert a size such as ('2.3', 'GB') to megabytes.
+        Returns:
+            float: Size in MB, or 0.0 if conversion fails
+        """
+        scale = {"B": 1.0 / 1024 ** 2, "KB": 1.0 / 1024, "MB": 1.0, "GB": 1024.0, "TB": 1024.0 ** 2}
+        try:
+            return float(value) * scale[unit.upper()]
+        except (ValueError, KeyError, AttributeError):
+            return 0.0
+
+    @staticmethod
+    def interval_to_seconds(t: str) -> float:
+        """Convert an OIIO time interval such as '1h 2m 3.4s' to seconds."""
+        seconds = 0.0
+        for amount, unit in INTERVAL_UNIT_PATTERN.findall(t or ""):
+            seconds += float(amount) * {"h": 3600, "m": 60, "s": 1}[unit]
+        return seconds
+
     def validate_float(self, value: float, min_val: float = 0.0, max_val: float = None) -> float:
         """Validate and clamp a float value to specified bounds.
         Args:
@@ -205,6 +673,7 @@ class ArnoldLogParser:
         except (ValueError, TypeError):
             return min_val
 
+    @_profiled_section
     def get_render_info(self) -> Dict[str, str]:
         """Get render information."""
         data = {
@@ -268,12 +737,14 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_worker_info(self) -> Dict[str, str]:
         """Extract system specifications."""
         data = {
             "cpu": "Can't parse details from log.",
             "core_count": "Can't parse details from log.",
             "worker_ram": "Can't parse details from log.",
+            "host_name": "Can't parse details from log.",
             "host_application": "Can't parse details from log.",
             "arnold_version": "Can't parse details from log.",
         }
@@ -297,6 +768,11 @@ class ArnoldLogParser:
                 if match:
                     data["worker_ram"] = match.group(1)
 
+            # Host name
+            match = self.PATTERNS["host_name"].search(line)
+            if match:
+                data["host_name"] = match.group(1)
+
             # Host application
             match = self.PATTERNS["host_application"].search(line)
             if match:
@@ -309,20 +785,40 @@ class ArnoldLogParser:
 
         return data
 
-    def get_plugin_info(self) -> Dict[str, any]:
-        """Get plugin loading information."""
+    @staticmethod
+    def new_plugin_scan() -> Dict[str, any]:
+        """Create the state of a plugin scan that can resume across chunks."""
+        return {
+            "data": {},
+            "collecting": False,
+            "current_path": None,
+            "current_lines": [],
+            "done": False,
+        }
 
-        data = {}
-        collecting = False
-        current_path = None
-        current_lines = []
+    def scan_plugins(self, state: Dict[str, any]) -> Dict[str, any]:
+        """Continue a plugin scan over this parser's lines.
+        Args:
+            state (dict): Scan state from new_plugin_scan()
+        Returns:
+            dict: The updated state, "done" is set once [ass] is reached
+        """
+        if state["done"]:
+            return state
+
+        data = state["data"]
+        collecting = state["collecting"]
+        current_path = state["current_path"]
+        current_lines = state["current_lines"]
 
         for line in self.lines:
             if "[ass]" in line:
                 # Stop scanning when [ass] is found
+                state["done"] = True
                 break
 
-            if "loading plugins from" in line:
+            # "loading plugins from <dir>" or "loading plugin: <lib> ..."
+            if "loading plugins from" in line or "loading plugin:" in line:
                 # Save previous block
                 if current_path and current_lines:
                     data[current_path] = current_lines
@@ -347,8 +843,278 @@ class ArnoldLogParser:
                 current_path = None
                 current_lines = []
 
+        state["collecting"] = collecting
+        state["current_path"] = current_path
+        state["current_lines"] = current_lines
+        return state
+
+    @_profiled_section
+    def get_plugin_info(self) -> Dict[str, any]:
+        """Get plugin loading information."""
+        return self.scan_plugins(self.new_plugin_scan())["data"]
+
+    @_profiled_section
+    def get_plugin_table(self) -> List[Dict[str, any]]:
+        """Get one row per loaded plugin node.
+        Returns:
+            list: Rows with library, node, the Arnold version it was built
+                against, load timestamp (elapsed seconds) and resident memory (MB)
+        """
+        data = []
+
+        for line in self.lines:
+            if "uses Arnold" not in line:
+                continue
+            match = self.PATTERNS["plugin_node"].search(line)
+            if not match:
+                continue
+
+            timestamp = None
+            memory_mb = None
+            prefix = self.PATTERNS["line_prefix"].search(line)
+            if prefix:
+                timestamp = self.time_to_seconds(prefix.group(1))
+                memory_mb = self.validate_int(prefix.group(2))
+
+            data.append({
+                "library": match.group(1),
+                "node": match.group(2),
+                "arnold_version": match.group(3),
+                "timestamp": timestamp,
+                "memory_mb": memory_mb,
+            })
+
         return data
 
+    @staticmethod
+    def summarize_plugins(rows: List[Dict[str, any]],
+                          plugin_info: Dict[str, List[str]] = None) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+        """Add memory deltas to plugin rows and aggregate them per library.
+
+        A node's memory delta is measured from the node loaded before it in
+        the same library, the first node of a library has none. Load times
+        come from the "loaded N plugins from M lib(s) in T" line closing each
+        block of plugin_info, split between the block's libraries by node
+        count; the per-line timestamps only have whole seconds.
+        Args:
+            rows (list): Output of get_plugin_table()
+            plugin_info (dict): Output of get_plugin_info(), for load times
+        Returns:
+            tuple: (node rows with memory_delta_mb, one row per library with
+                node count, versions, first load time, load duration and memory delta)
+        """
+        # Library -> load seconds, from the summary line of each block
+        load_seconds = {}
+        for lines in (plugin_info or {}).values():
+            block_nodes = {}
+            block_seconds = None
+            for line in lines:
+                match = ArnoldLogParser.PATTERNS["plugin_node"].search(line)
+                if match:
+                    block_nodes[match.group(1)] = block_nodes.get(match.group(1), 0) + 1
+                    continue
+                match = ArnoldLogParser.PATTERNS["plugin_load"].search(line)
+                if match:
+                    block_seconds = ArnoldLogParser.time_to_seconds(match.group(3))
+            total_nodes = sum(block_nodes.values())
+            if block_seconds is None or not total_nodes:
+                continue
+            for library, count in block_nodes.items():
+                load_seconds[library] = load_seconds.get(library, 0.0) + block_seconds * count / total_nodes
+
+        nodes = []
+        libraries = {}
+
+        for row in rows:
+            library = libraries.get(row["library"])
+            if library is None:
+                library = libraries[row["library"]] = {
+                    "library": row["library"],
+                    "nodes": 0,
+                    "arnold_versions": [],
+                    "first_loaded": row["timestamp"],
+                    "memory_delta_mb": 0,
+                    "previous_memory": None,
+                }
+
+            memory = row["memory_mb"]
+            previous_memory = library["previous_memory"]
+            delta = memory - previous_memory if memory is not None and previous_memory is not None else 0
+            if memory is not None:
+                library["previous_memory"] = memory
+            nodes.append({**row, "memory_delta_mb": delta})
+
+            library["nodes"] += 1
+            library["memory_delta_mb"] += delta
+            if row["arnold_version"] not in library["arnold_versions"]:
+                library["arnold_versions"].append(row["arnold_version"])
+            if library["first_loaded"] is None:
+                library["first_loaded"] = row["timestamp"]
+
+        summary = []
+        for library in libraries.values():
+            library.pop("previous_memory")
+            first = library.pop("first_loaded")
+            summary.append({
+                **library,
+                "arnold_versions": ", ".join(library["arnold_versions"]),
+                "first_loaded": first,
+                "load_seconds": load_seconds.get(library["library"]),
+            })
+
+        return nodes, summary
+
+    def iter_line_phases(self):
+        """Walk the log lines with the phase active at each line.
+        Yields:
+            tuple: (line index, line, phase)
+        """
+        phase = self.first_phase
+        for index, line in enumerate(self.lines, self.first_line):
+            for marker, marker_phase in self.PHASE_MARKERS:
+                if marker in line:
+                    phase = marker_phase
+                    break
+            yield index, line, phase
+
+    @_profiled_section
+    def get_phase_timeline(self) -> List[Dict[str, any]]:
+        """Get wall-clock phase segments from the elapsed time of every line.
+
+        Only the per-line timestamps are used, so this also works on logs
+        that were cut off before the final statistics were written. The
+        rendering phase is split into one segment per progress interval.
+        Returns:
+            list: Segments in log order with phase, label, start/end
+                elapsed seconds, duration and first/last line numbers
+        """
+        data = []
+        current = None
+        last_elapsed = None
+        # Last progress segment and its percentage, labelled once the next one starts
+        progress_segment = None
+        progress_percent = None
+
+        for index, line, phase in self.iter_line_phases():
+            prefix = self.PATTERNS["line_prefix"].search(line)
+            if not prefix:
+                continue
+            elapsed = self.time_to_seconds(prefix.group(1))
+            last_elapsed = elapsed
+
+            progress = self.PATTERNS["progress"].search(line) if phase == "rendering" else None
+            label = phase
+            if progress:
+                percent = int(progress.group(1))
+                label = f"rendering from {percent}%"
+                if progress_segment is not None:
+                    progress_segment["label"] = f"rendering {progress_percent}-{percent}%"
+
+            if current is None or current["phase"] != phase or progress:
+                if current is not None:
+                    current["end"] = elapsed
+                current = {
+                    "phase": phase,
+                    "label": label,
+                    "start": elapsed,
+                    "end": elapsed,
+                    "start_line": index + 1,
+                    "end_line": index + 1,
+                }
+                data.append(current)
+                if progress:
+                    progress_segment = current
+                    progress_percent = percent
+            else:
+                current["end"] = elapsed
+                current["end_line"] = index + 1
+
+        if current is not None and last_elapsed is not None:
+            current["end"] = last_elapsed
+
+        for segment in data:
+            segment["duration"] = max(0.0, segment["end"] - segment["start"])
+
+        return data
+
+    @_profiled_section
+    def get_memory_samples(self) -> List[Dict[str, any]]:
+        """Get the resident memory column at every line where it changes.
+        Returns:
+            list: Samples with line number, elapsed seconds, memory (MB),
+                the active phase and the line's subsystem tag
+        """
+        data = []
+        previous_memory = None
+
+        for index, line, phase in self.iter_line_phases():
+            prefix = self.PATTERNS["line_prefix"].search(line)
+            if not prefix:
+                continue
+            memory_mb = int(prefix.group(2))
+            if memory_mb == previous_memory:
+                continue
+            previous_memory = memory_mb
+
+            tag = self.PATTERNS["subsystem_tag"].search(line)
+            data.append({
+                "line": index + 1,
+                "elapsed": self.time_to_seconds(prefix.group(1)),
+                "memory_mb": memory_mb,
+                "phase": phase,
+                "tag": tag.group(1) if tag else None,
+            })
+
+        return data
+
+    @_profiled_section
+    def get_memory_jumps(self, top_n: int = 10) -> List[Dict[str, any]]:
+        """Get the largest increases of the resident memory column.
+
+        The memory printed on a line is sampled when that line is logged, so
+        an increase is attributed to the line before it, whose work was in
+        progress while memory grew.
+        Args:
+            top_n (int): Number of jumps to return
+        Returns:
+            list: Jumps, largest first, with memory before/after, delta (MB),
+                elapsed seconds, phase, subsystem tag and the causing line
+        """
+        jumps = []
+        previous = None
+
+        for index, line, phase in self.iter_line_phases():
+            prefix = self.PATTERNS["line_prefix"].search(line)
+            if not prefix:
+                continue
+            memory_mb = int(prefix.group(2))
+
+            if previous is not None and memory_mb > previous["memory_mb"]:
+                jumps.append({
+                    "line": previous["line"],
+                    "elapsed": previous["elapsed"],
+                    "memory_before_mb": previous["memory_mb"],
+                    "memory_after_mb": memory_mb,
+                    "delta_mb": memory_mb - previous["memory_mb"],
+                    "phase": previous["phase"],
+                    "tag": previous["tag"],
+                    "text": previous["text"],
+                })
+
+            tag = self.PATTERNS["subsystem_tag"].search(line)
+            previous = {
+                "line": index + 1,
+                "elapsed": self.time_to_seconds(prefix.group(1)),
+                "memory_mb": memory_mb,
+                "phase": phase,
+                "tag": tag.group(1) if tag else None,
+                "text": line.split("|", 1)[1].strip() if "|" in line else line.strip(),
+            }
+
+        jumps.sort(key=lambda jump: jump["delta_mb"], reverse=True)
+        return jumps[:top_n]
+
+    @_profiled_section
     def get_colour_space(self) -> Dict[str, str]:
         """Get colour space information."""
         data = {
@@ -370,6 +1136,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_scene_info(self) -> Dict[str, any]:
         """Get scene contents and initialization information."""
         data = {
@@ -400,6 +1167,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_sample_info(self) -> Dict[str, any]:
         """Get samples and ray statistics."""
         data = {
@@ -450,6 +1218,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_progress_info(self) -> Dict[str, any]:
         """Get render progress information."""
         data = {}
@@ -463,6 +1232,32 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
+    def get_progress_timeline(self) -> List[Dict[str, any]]:
+        """Get every progress step with the elapsed time it was logged at.
+        Returns:
+            list: Steps in log order with line, elapsed seconds, percent
+                done and rays/pixel
+        """
+        data = []
+
+        for index, line in enumerate(self.lines, self.first_line):
+            match = self.PATTERNS["progress"].search(line)
+            if not match:
+                continue
+            prefix = self.PATTERNS["line_prefix"].search(line)
+            if not prefix:
+                continue
+            data.append({
+                "line": index + 1,
+                "elapsed": self.time_to_seconds(prefix.group(1)),
+                "percent": int(match.group(1)),
+                "rays_per_pixel": int(match.group(2)),
+            })
+
+        return data
+
+    @_profiled_section
     def get_scene_creation(self) -> Dict[str, any]:
         """Parse scene creation data from log. """
         data = {
@@ -492,6 +1287,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_render_time(self) -> Dict[str, float]:
         """Get all render time stats."""
         data = {
@@ -577,6 +1373,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_memory_stats(self) -> Dict[str, float]:
         """Get detailed memory statistics."""
         data = {
@@ -621,6 +1418,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_ray_stats(self) -> Dict[str, any]:
         """Get ray stats as a dictionary."""
         data = {
@@ -651,6 +1449,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_shader_stats(self) -> Dict[str, int]:
         """Get shader stats from log."""
         data = {
@@ -675,6 +1474,62 @@ class ArnoldLogParser:
 
         return data
 
+    def _table_row(self, match) -> Tuple[str, Dict[str, any]]:
+        """Convert a ray_row or shader_row match to a (label, row) pair."""
+        label, count, per_pixel, per_sample, percent = match.groups()[:5]
+        return label.strip(), {
+            "count": self.validate_int(int(count)),
+            "per_pixel": self._table_float(per_pixel),
+            "per_sample": self._table_float(per_sample),
+            "percent": self._table_float(percent),
+        }
+
+    @staticmethod
+    def _table_float(value: str) -> float:
+        """Convert a table cell, None for cells Arnold prints as nan."""
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+        return None if value != value else value
+
+    @_profiled_section
+    def get_ray_table(self) -> Dict[str, Dict[str, any]]:
+        """Get every row of the "ray counts" table.
+        Returns:
+            dict: Ray type (including "total") -> count, per_pixel, per_sample,
+                percent, avg_hits and max_hits, in log order
+        """
+        data = {}
+
+        for line in self.lines:
+            match = self.PATTERNS["ray_row"].search(line)
+            if match:
+                label, row = self._table_row(match)
+                row["avg_hits"] = self._table_float(match.group(6))
+                row["max_hits"] = int(match.group(7))
+                data[label] = row
+
+        return data
+
+    @_profiled_section
+    def get_shader_table(self) -> Dict[str, Dict[str, any]]:
+        """Get every row of the "shader calls" table.
+        Returns:
+            dict: Shader context (including "total") -> count, per_pixel,
+                per_sample and percent, in log order
+        """
+        data = {}
+
+        for line in self.lines:
+            match = self.PATTERNS["shader_row"].search(line)
+            if match:
+                label, row = self._table_row(match)
+                data[label] = row
+
+        return data
+
+    @_profiled_section
     def get_geometry_stats(self) -> Dict[str, int]:
         """Get geometry statistics."""
         data = {
@@ -698,6 +1553,7 @@ class ArnoldLogParser:
 
         return data
 
+    @_profiled_section
     def get_texture_stats(self) -> Dict[str, str]:
         """Get texture stats from log."""
         data = {
@@ -717,8 +1573,184 @@ class ArnoldLogParser:
                     if match:
                         data[key] = match.group(1)
 
+        # Unit-aware totals, the fields above only match sizes printed in GB
+        data["peak_cache_mb"] = 0.0
+        data["pixel_data_read_mb"] = 0.0
+        for line in self.lines:
+            match = self.PATTERNS["peak_cache_size"].search(line)
+            if match:
+                data["peak_cache_mb"] = self.size_to_mb(*match.groups())
+            match = self.PATTERNS["pixel_data_size"].search(line)
+            if match:
+                data["pixel_data_read_mb"] = self.size_to_mb(*match.groups())
+
+        return data
+
+    @_profiled_section
+    def get_texture_io(self) -> List[Dict[str, any]]:
+        """Get the per-file rows of the OIIO "Image file statistics" table.
+        Returns:
+            list: One row per texture with opens, tiles and MB read,
+                redundant tiles/MB (None on OIIO versions without them),
+                I/O seconds, resolution, untiled/unmipped flags and the
+                tiles read per MIP level
+        """
+        data = []
+
+        for line in self.lines:
+            match = self.PATTERNS["texture_file"].search(line)
+            if not match:
+                continue
+            opens, tiles, mb_read, redundant_tiles, redundant_mb, io_time, resolution, rest = match.groups()
+            path, flags = self.PATTERNS["texture_flags"].match(rest).groups()
+            mip_count = TEXTURE_MIP_COUNT_PATTERN.search(flags)
+
+            data.append({
+                "file": path.strip(),
+                "opens": int(opens),
+                "tiles": int(tiles),
+                "mb_read": float(mb_read),
+                "redundant_tiles": int(redundant_tiles) if redundant_tiles is not None else None,
+                "redundant_mb": float(redundant_mb) if redundant_mb is not None else None,
+                "io_seconds": self.interval_to_seconds(io_time),
+                "resolution": resolution.replace(" ", ""),
+                "untiled": "UNTILED" in flags,
+                "unmipped": "UNMIPPED" in flags,
+                "mip_tiles": [int(count) for count in INTEGER_PATTERN.findall(mip_count.group(1))] if mip_count else [],
+            })
+
         return data
 
+    @staticmethod
+    def duration_to_seconds(t: str) -> float:
+        """Convert a duration printed as '0:12.34' or '12.3s' / '1m 2s' to seconds."""
+        if ":" in t:
+            return ArnoldLogParser.time_to_seconds(t)
+        return ArnoldLogParser.interval_to_seconds(t)
+
+    @_profiled_section
+    def get_gpu_stats(self) -> Dict[str, any]:
+        """Get the GPU driver, device count and startup costs of a GPU render.
+        Returns:
+            dict: driver, device_count, shader_compilation, cache_compilation
+                and prepopulation (seconds), peak_gpu_memory_mb and the
+                out_of_core_mb of textures moved to host memory
+        """
+        data = {
+            "driver": "",
+            "device_count": 0,
+            "shader_compilation": 0.0,
+            "cache_compilation": 0.0,
+            "prepopulation": 0.0,
+            "peak_gpu_memory_mb": 0.0,
+            "out_of_core_mb": 0.0,
+        }
+
+        for line in self.lines:
+            # GPU lines are tagged [gpu] or name the GPU, skip CPU log lines cheaply
+            if "gpu" not in line and "GPU" not in line:
+                continue
+            match = self.PATTERNS["gpu_driver"].search(line)
+            if match:
+                data["driver"] = match.group(1)
+            match = self.PATTERNS["gpu_device_count"].search(line)
+            if match:
+                data["device_count"] = self.validate_int(int(match.group(1)))
+            match = self.PATTERNS["gpu_timing"].search(line)
+            if match:
+                text = match.group(1).lower()
+                if "populat" in text:
+                    key = "prepopulation"
+                elif "shader" in text:
+                    key = "shader_compilation"
+                else:
+                    key = "cache_compilation"
+                data[key] = self.duration_to_seconds(match.group(2))
+            match = self.PATTERNS["peak_gpu_memory"].search(line)
+            if match:
+                data["peak_gpu_memory_mb"] = self.size_to_mb(*match.groups())
+            match = self.PATTERNS["gpu_out_of_core"].search(line)
+            if match:
+                data["out_of_core_mb"] = self.size_to_mb(*match.groups())
+
+        return data
+
+    @_profiled_section
+    def get_gpu_devices(self) -> List[Dict[str, any]]:
+        """Get the GPU devices a render used.
+        Returns:
+            list: One row per device line with device index, name, compute
+                capability, memory_mb and available_mb (None when not printed)
+        """
+        data = []
+
+        for line in self.lines:
+            if "[gpu]" not in line:
+                continue
+            match = self.PATTERNS["gpu_device"].search(line)
+            if not match:
+                continue
+            rest = match.group(2)
+            compute = self.PATTERNS["gpu_device_compute"].search(rest)
+            memory = self.PATTERNS["gpu_device_memory"].search(rest)
+            available = self.PATTERNS["gpu_device_available"].search(rest)
+            data.append({
+                "device": int(match.group(1)),
+                "name": self.PATTERNS["gpu_device_name"].match(rest).group(1),
+                "compute": compute.group(1) if compute else None,
+                "memory_mb": self.size_to_mb(*memory.groups()) if memory else None,
+                "available_mb": self.size_to_mb(*available.groups()) if available else None,
+            })
+
+        return data
+
+    @_profiled_section
+    def get_gpu_memory(self) -> List[Dict[str, any]]:
+        """Get the per-device GPU memory reports.
+        Returns:
+            list: One row per report with device index, memory_mb and
+                whether Arnold printed it as the device peak
+        """
+        data = []
+
+        for line in self.lines:
+            if "[gpu]" not in line:
+                continue
+            match = self.PATTERNS["gpu_memory"].search(line)
+            if match:
+                device, peak, value, unit = match.groups()
+                data.append({
+                    "device": int(device),
+                    "memory_mb": self.size_to_mb(value, unit),
+                    "peak": peak is not None,
+                })
+
+        return data
+
+    def parse(self, sections: List[str] = None) -> Dict[str, any]:
+        """Run the section extractors.
+        Args:
+            sections (list): Section names from SECTIONS to run (default all)
+        Returns:
+            dict: Section name -> extracted data
+        Raises:
+            KeyError: If a section name is unknown
+        """
+        if sections is None:
+            sections = list(self.SECTIONS)
+
+        return {section: getattr(self, self.SECTIONS[section])() for section in sections}
+
+    def get_profile_report(self) -> Dict[str, any]:
+        """Get the parser profile as a structured report.
+        Returns:
+            dict: See ParserProfile.report(), empty if the parser was not
+                created with profile=True.
+        """
+        if self.profile is None:
+            return {}
+        return self.profile.report(type(self).PATTERNS)
+
     def _format_time(self, seconds: float) -> str:
         """Format time in a human-readable format."""
         if seconds < 60:
@@ -732,3 +1764,843 @@ class ArnoldLogParser:
         return f"{hours}h {remaining_minutes}m {remaining_seconds:.2f}s"
 
 
+
+
+# Characters of log text parsed per chunk by the chunked parse driver
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class ParseProgress:
+    """Snapshot of a chunked parse, yielded after every chunk."""
+
+    def __init__(self, results, complete, bytes_done, total_bytes, lines_done, elapsed,
+                 finished=False, lines=None, profile=None):
+        self.results = results
+        self.complete = complete
+        self.bytes_done = bytes_done
+        self.total_bytes = total_bytes
+        self.lines_done = lines_done
+        self.elapsed = elapsed
+        self.finished = finished
+        self.lines = lines
+        self.profile = profile
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the input read, between 0 and 1."""
+        if self.finished:
+            return 1.0
+        if not self.total_bytes:
+            return 0.0
+        return min(1.0, self.bytes_done / self.total_bytes)
+
+    @property
+    def lines_per_second(self) -> float:
+        """Parse throughput so far."""
+        return self.lines_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> float:
+        """Estimated seconds left, or None until it can be estimated."""
+        if self.finished:
+            return 0.0
+        if not self.bytes_done or not self.total_bytes or self.elapsed <= 0:
+            return None
+        return self.elapsed * (self.total_bytes - self.bytes_done) / self.bytes_done
+
+
+class LineViews:
+    """Memory, phase and progress timelines of a log, built chunk by chunk.
+
+    Gives the same results as get_memory_samples(), get_memory_jumps(),
+    get_phase_timeline() and get_progress_timeline() over the whole log
+    without holding its lines, e.g. from the on_lines hook of
+    iter_parse_chunks(). Each chunk is parsed after the tail of the previous
+    one, from its last timestamped line, so memory jumps and phase segments
+    carry over chunk boundaries.
+    """
+
+    def __init__(self, top_n: int = 10, profile=None):
+        """
+        Args:
+            top_n (int): Memory jumps to keep
+            profile (ParserProfile): Profile to record the chunk parsers in
+        """
+        self.top_n = top_n
+        self.profile = profile
+        self.memory_samples = []
+        self.memory_jumps = []
+        self.phase_timeline = []
+        self.progress_timeline = []
+        self.lines_done = 0
+        # Lines from the last timestamped one, and the phase before them
+        self._tail = []
+        self._tail_phase = "startup"
+        # Last progress segment and its percent, labelled once the next one starts
+        self._open_progress = None
+
+    def add_lines(self, lines: List[str]):
+        """Add the next lines of the log."""
+        parser = ArnoldLogParser.from_lines(self._tail + list(lines), profile=self.profile or False)
+        parser.first_line = self.lines_done - len(self._tail)
+        parser.first_phase = self._tail_phase
+        first_new = self.lines_done + 1
+
+        self.memory_samples.extend(sample for sample in parser.get_memory_samples() if sample["line"] >= first_new)
+        steps = parser.get_progress_timeline()
+        self.progress_timeline.extend(step for step in steps if step["line"] >= first_new)
+        # Both lists come ranked with ties in log order, which a stable sort keeps
+        jumps = self.memory_jumps + parser.get_memory_jumps(self.top_n)
+        self.memory_jumps = sorted(jumps, key=lambda jump: jump["delta_mb"], reverse=True)[:self.top_n]
+        self._add_segments(parser.get_phase_timeline(), {step["line"]: step["percent"] for step in steps})
+
+        # The tail starts the next chunk, with the phase before its first line
+        prefix_pattern = ArnoldLogParser.PATTERNS["line_prefix"]
+        last = next((index for index in range(len(parser.lines) - 1, -1, -1)
+                     if prefix_pattern.search(parser.lines[index])), None)
+        phase_before = phase = parser.first_phase
+        for index, _, phase in parser.iter_line_phases():
+            if index - parser.first_line == last:
+                break
+            phase_before = phase
+        if last is None:
+            self._tail = []
+            self._tail_phase = phase
+        else:
+            self._tail = parser.lines[last:]
+            self._tail_phase = phase_before
+        self.lines_done += len(lines)
+
+    def _add_segments(self, segments: List[Dict[str, any]], percents: Dict[int, int]):
+        """Append the phase segments of a chunk.
+        Args:
+            segments (list): get_phase_timeline() of the chunk after the tail
+            percents (dict): Line number -> percent of the chunk's progress steps
+        """
+        added = segments
+        if segments and self._tail and self.phase_timeline:
+            # The first segment of the chunk continues the last one from the tail line
+            first, segments = segments[0], segments[1:]
+            last = self.phase_timeline[-1]
+            last["end"] = first["end"]
+            last["end_line"] = first["end_line"]
+            if first["label"] != first["phase"]:
+                # The tail line started the open progress segment, the chunk labels it
+                last["label"] = first["label"]
+                self._open_progress = None
+            added = [last] + segments
+
+        for segment in segments:
+            if segment["label"] != segment["phase"] and self._open_progress is not None:
+                # The first progress step of the chunk ends the one left open
+                open_segment, open_percent = self._open_progress
+                open_segment["label"] = f"rendering {open_percent}-{percents[segment['start_line']]}%"
+                self._open_progress = None
+            self.phase_timeline.append(segment)
+
+        for segment in reversed(added):
+            if segment["start_line"] not in percents:
+                continue  # Started before the chunk, still open if it was
+            if segment["label"].startswith("rendering from "):
+                self._open_progress = (segment, percents[segment["start_line"]])
+                break
+            if segment["label"] != segment["phase"]:
+                break
+        for segment in added:
+            segment["duration"] = max(0.0, segment["end"] - segment["start"])
+
+    def results(self) -> Dict[str, List[Dict[str, any]]]:
+        """Get the timelines, keyed like the get_* methods without their prefix."""
+        return {
+            "memory_samples": self.memory_samples,
+            "memory_jumps": self.memory_jumps,
+            "phase_timeline": self.phase_timeline,
+            "progress_timeline": self.progress_timeline,
+        }
+
+
+def merge_sections(merged: Dict[str, any], partial: Dict[str, any], defaults: Dict[str, any]):
+    """Merge the sections parsed from one chunk into the running results.
+
+    Chunks must be merged in log order. Lists are appended, progress steps
+    update in order, and any other field takes the chunk's value when the
+    chunk resolved it to something other than its default, which keeps the
+    last-match-wins behaviour of the get_* methods. A later match that
+    yields exactly the default value cannot be told apart from no match.
+    Args:
+        merged (dict): Running results, updated in place
+        partial (dict): Sections parsed from the next chunk
+        defaults (dict): Sections parsed from an empty log
+    """
+    for section, value in partial.items():
+        if isinstance(value, list):
+            merged[section].extend(value)
+        elif section == "progress_info":
+            merged[section].update(value)
+        else:
+            default = defaults[section]
+            target = merged[section]
+            for key, field in value.items():
+                # A type change catches matches equal to the default, e.g. 0.0 vs 0
+                default_field = default.get(key)
+                if field != default_field or type(field) is not type(default_field):
+                    target[key] = field
+
+
+def final_marker(section: str) -> str:
+    """Get the line marker after which a section can no longer change."""
+    return ArnoldLogParser.FINAL_MARKERS.get(section, ArnoldLogParser.STATS_END_MARKER)
+
+
+def scan_final_markers(lines: List[str], markers: Iterable[str]) -> Tuple[bool, set]:
+    """Find final markers in a chunk of lines.
+    Returns:
+        tuple: (whether a new render starts in the chunk, markers found
+            after the last render start)
+    """
+    text = "\n".join(lines)
+    restart = text.rfind(ArnoldLogParser.RENDER_START_MARKER)
+    if restart != -1:
+        text = text[restart:]
+    return restart != -1, {marker for marker in markers if marker in text}
+
+
+def _update_seen(seen: set, scan: Tuple[bool, set]):
+    """Merge the scan_final_markers() result of the next chunk into the markers seen so far."""
+    restarted, found = scan
+    if restarted:
+        seen.clear()
+    seen.update(found)
+
+
+def complete_sections(sections: List[str], seen: set) -> List[str]:
+    """Get the sections that later chunks cannot change any more.
+
+    Merging is last-match-wins, so a section is only final once the marker
+    that ends it has been read, see ArnoldLogParser.FINAL_MARKERS.
+    Args:
+        sections (list): Section names being parsed
+        seen (set): Final markers found in the chunks merged so far
+    """
+    if ArnoldLogParser.SHUTDOWN_MARKER in seen:
+        return list(sections)
+    return [section for section in sections if final_marker(section) in seen]
+
+
+def _stream_size(f) -> int:
+    """Get the size of a seekable binary stream, or None."""
+    try:
+        return os.fstat(f.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    try:
+        position = f.tell()
+        size = f.seek(0, io.SEEK_END)
+        f.seek(position)
+        return size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def iter_parse_chunks(source, sections: List[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      keep_lines: bool = False, profile: bool = False, errors: str = "replace",
+                      should_stop=None, max_kept_chars: int = None, on_lines=None, digest=None):
+    """Parse a log chunk by chunk, yielding progress after every chunk.
+
+    Only one chunk of lines is held at a time unless keep_lines is set, and
+    compressed logs are decompressed as they are read. Stopping early, either
+    through should_stop or by closing the generator, closes a log opened from
+    a path; a file object is left open.
+    Args:
+        source: File path or binary file object, optionally compressed
+        sections (list): Section names from SECTIONS to run (default all)
+        chunk_size (int): Characters of log text per chunk
+        keep_lines (bool): Keep every line, e.g. to build a parser afterwards
+        profile: Profile the extractors across all chunks, True or a ParserProfile to record in
+        errors (str): How to handle undecodable bytes
+        should_stop (callable): Checked between chunks, stops the parse when True
+        max_kept_chars (int): Drop the kept lines, and stop keeping them, once
+            they exceed this many characters; the last progress then has no lines
+        on_lines (callable): Called with the lines of every chunk in log order,
+            e.g. LineViews.add_lines, so line-level views need no second pass
+        digest: Hash object (e.g. hashlib.sha256()) updated with the decompressed bytes
+    Yields:
+        ParseProgress: Merged results so far; the last one has finished set
+    """
+    if sections is None:
+        sections = list(ArnoldLogParser.SECTIONS)
+
+    line_sections = [section for section in sections if section != "plugin_info"]
+    defaults = ArnoldLogParser("").parse(sections)
+    results = ArnoldLogParser("").parse(sections)
+    plugin_scan = ArnoldLogParser.new_plugin_scan() if "plugin_info" in sections else None
+    if isinstance(profile, ParserProfile):
+        shared_profile = profile
+    else:
+        shared_profile = ParserProfile() if profile else None
+    kept_lines = [] if keep_lines else None
+    kept_chars = 0
+    markers = {final_marker(section) for section in sections} | {ArnoldLogParser.SHUTDOWN_MARKER}
+    seen = set()
+
+    owns_source = isinstance(source, (str, bytes)) or hasattr(source, "__fspath__")
+    raw = open(source, "rb") if owns_source else source
+    total_bytes = _stream_size(raw)
+    start = time.perf_counter()
+    lines_done = 0
+
+    def parse_chunk(chunk, size):
+        nonlocal lines_done, kept_lines, kept_chars
+        parser = ArnoldLogParser.from_lines(chunk, profile=shared_profile)
+        merge_sections(results, parser.parse(line_sections), defaults)
+        _update_seen(seen, scan_final_markers(parser.lines, markers))
+        if plugin_scan is not None:
+            parser.scan_plugins(plugin_scan)
+            results["plugin_info"] = plugin_scan["data"]
+        if on_lines is not None:
+            on_lines(parser.lines)
+        if kept_lines is not None:
+            kept_chars += size
+            if max_kept_chars is not None and kept_chars > max_kept_chars:
+                kept_lines = None
+            else:
+                kept_lines.extend(parser.lines)
+        lines_done += len(parser.lines)
+
+    def snapshot(finished):
+        complete = list(sections) if finished else complete_sections(sections, seen)
+        if plugin_scan is not None and plugin_scan["done"] and "plugin_info" not in complete:
+            complete.append("plugin_info")
+        try:
+            bytes_done = raw.tell()
+        except (OSError, ValueError):
+            bytes_done = 0
+        return ParseProgress(
+            results, complete, bytes_done, total_bytes, lines_done,
+            time.perf_counter() - start, finished=finished,
+            lines=kept_lines, profile=shared_profile,
+        )
+
+    # A caller's stream is left open, e.g. for LogLines to read it again
+    lines = _iter_stream_lines(raw, errors, digest)
+    try:
+        chunk = []
+        size = 0
+        for line in lines:
+            chunk.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                parse_chunk(chunk, size)
+                chunk = []
+                size = 0
+                yield snapshot(False)
+                if should_stop is not None and should_stop():
+                    return
+
+        parse_chunk(chunk, size)
+        yield snapshot(True)
+    finally:
+        lines.close()
+        if owns_source:
+            raw.close()
+
+
+def _decode_lines(data: bytes, errors: str = "replace") -> List[str]:
+    """Split log bytes into lines the same way open_log() iterates them."""
+    return [line.rstrip("\r\n") for line in io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors=errors)]
+
+
+def _parse_piece(piece, sections: List[str], errors: str) -> Dict[str, any]:
+    """Parse one piece of a log in a worker process.
+    Args:
+        piece: Log bytes, or (path, start, end) to read them from an
+            uncompressed file without sending them between processes
+        sections (list): Section names to run
+        errors (str): How to handle undecodable bytes
+    Returns:
+        tuple: (parsed sections, number of lines, scan_final_markers() result)
+    """
+    if isinstance(piece, tuple):
+        path, start, end = piece
+        with open(path, "rb") as f:
+            f.seek(start)
+            piece = f.read(end - start)
+    parser = ArnoldLogParser.from_lines(_decode_lines(piece, errors))
+    markers = {final_marker(section) for section in sections} | {ArnoldLogParser.SHUTDOWN_MARKER}
+    return parser.parse(sections), len(parser.lines), scan_final_markers(parser.lines, markers)
+
+
+def iter_parse_parallel(source, sections: List[str] = None, workers: int = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE, keep_lines: bool = False,
+                        errors: str = "replace", should_stop=None, max_kept_chars: int = None):
+    """Parse a single log across worker processes, yielding progress in log order.
+
+    The log is split at line boundaries into pieces of about chunk_size
+    bytes, which are parsed concurrently and merged in order with
+    merge_sections(), so results match iter_parse_chunks(). The plugin scan
+    carries state from line to line and runs in this process while the
+    workers parse. Pieces of an uncompressed file are read by the workers
+    themselves; compressed logs and streams are read here and sent over.
+    At most two pieces per worker are in flight, which bounds memory.
+    Profiling is not supported across processes.
+    Args:
+        source: File path or binary file object, optionally compressed
+        sections (list): Section names from SECTIONS to run (default all)
+        workers (int): Worker processes (default one per CPU)
+        chunk_size (int): Bytes of log per piece
+        keep_lines (bool): Keep every line, e.g. to build a parser afterwards
+        errors (str): How to handle undecodable bytes
+        should_stop (callable): Checked between pieces, stops the parse when True
+        max_kept_chars (int): Drop the kept lines, and stop keeping them, once
+            they exceed this many characters; the last progress then has no lines
+    Yields:
+        ParseProgress: Merged results so far; the last one has finished set
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if sections is None:
+        sections = list(ArnoldLogParser.SECTIONS)
+    workers = workers or os.cpu_count() or 1
+
+    line_sections = [section for section in sections if section != "plugin_info"]
+    defaults = ArnoldLogParser("").parse(sections)
+    results = ArnoldLogParser("").parse(sections)
+    plugin_scan = ArnoldLogParser.new_plugin_scan() if "plugin_info" in sections else None
+    kept_lines = [] if keep_lines else None
+    kept_chars = 0
+    seen = set()
+    if plugin_scan is not None:
+        results["plugin_info"] = plugin_scan["data"]
+
+    owns_source = isinstance(source, (str, bytes)) or hasattr(source, "__fspath__")
+    raw = open(source, "rb") if owns_source else source
+    total_bytes = _stream_size(raw)
+    module = compression_module(_stream_header(raw))
+    # Workers read pieces of a plain file by offset instead of receiving them
+    by_offset = owns_source and module is None
+    start = time.perf_counter()
+    bytes_done = 0
+    lines_done = 0
+
+    def snapshot(finished):
+        complete = list(sections) if finished else complete_sections(sections, seen)
+        if plugin_scan is not None and plugin_scan["done"] and "plugin_info" not in complete:
+            complete.append("plugin_info")
+        return ParseProgress(
+            results, complete, bytes_done, total_bytes, lines_done,
+            time.perf_counter() - start, finished=finished, lines=kept_lines,
+        )
+
+    stream = module.open(raw, "rb") if module is not None else raw
+    pending = []
+    try:
+        # Forking a multithreaded host such as the viewer's server can copy
+        # locks held by other threads into the workers, spawn starts clean
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            while True:
+                piece_start = stream.tell() if by_offset else None
+                needs_data = not by_offset or kept_lines is not None or (
+                    plugin_scan is not None and not plugin_scan["done"]
+                )
+                if needs_data:
+                    data = stream.read(chunk_size)
+                    if data and not data.endswith(b"\n"):
+                        data += stream.readline()
+                    if not data:
+                        break
+                else:
+                    stream.seek(chunk_size, io.SEEK_CUR)
+                    stream.readline()
+                    data = None
+
+                if by_offset:
+                    piece_end = min(stream.tell(), total_bytes)
+                    if piece_end <= piece_start:
+                        break
+                    piece = (os.fspath(source), piece_start, piece_end)
+                else:
+                    piece = data
+
+                if data is not None and (kept_lines is not None or plugin_scan is not None):
+                    lines = _decode_lines(data, errors)
+                    if plugin_scan is not None and not plugin_scan["done"]:
+                        ArnoldLogParser.from_lines(lines).scan_plugins(plugin_scan)
+                    if kept_lines is not None:
+                        kept_chars += sum(len(line) + 1 for line in lines)
+                        if max_kept_chars is not None and kept_chars > max_kept_chars:
+                            kept_lines = None
+                        else:
+                            kept_lines.extend(lines)
+
+                try:
+                    position = raw.tell()
+                except (OSError, ValueError):
+                    position = 0
+                pending.append((executor.submit(_parse_piece, piece, line_sections, errors), position))
+
+                # Merge the oldest pieces in order once enough are in flight
+                while len(pending) >= 2 * workers:
+                    future, position = pending.pop(0)
+                    partial, line_count, scan = future.result()
+                    merge_sections(results, partial, defaults)
+                    _update_seen(seen, scan)
+                    lines_done += line_count
+                    bytes_done = position
+                    yield snapshot(False)
+                    if should_stop is not None and should_stop():
+                        for future, _ in pending:
+                            future.cancel()
+                        return
+
+            while pending:
+                future, position = pending.pop(0)
+                partial, line_count, scan = future.result()
+                merge_sections(results, partial, defaults)
+                _update_seen(seen, scan)
+                lines_done += line_count
+                bytes_done = position
+                if pending:
+                    yield snapshot(False)
+
+        yield snapshot(True)
+    finally:
+        if stream is not raw:
+            stream.close()
+        if owns_source:
+            raw.close()
+
+
+# Sections with fixed fields that a summary parse can resolve from the head
+# and tail of a log. Lists such as warnings need every line.
+SUMMARY_SECTIONS = [
+    "render_info",
+    "worker_info",
+    "colour_space",
+    "scene_info",
+    "sample_info",
+    "scene_creation",
+    "render_time",
+    "memory_stats",
+    "ray_stats",
+    "shader_stats",
+    "geometry_stats",
+    "texture_stats",
+]
+
+# Bytes read from the start (header facts) and the end (stats tables) of a
+# log by a summary parse, and the block size they are scanned in
+SUMMARY_HEAD_BYTES = 64 * 1024
+SUMMARY_TAIL_BYTES = 256 * 1024
+SUMMARY_BLOCK_SIZE = 16 * 1024
+
+
+def _iter_blocks_forward(f, start: int, end: int, block_size: int):
+    """Read [start, end) of a file in blocks of whole lines, first block first."""
+    f.seek(start)
+    while f.tell() < end:
+        data = f.read(min(block_size, end - f.tell()))
+        if not data:
+            return
+        if not data.endswith(b"\n") and f.tell() < end:
+            data += f.readline()
+        yield data
+
+
+def _iter_blocks_reverse(f, start: int, end: int, block_size: int):
+    """Read [start, end) of a file in blocks of whole lines, last block first."""
+    carry = b""
+    position = end
+    while position > start:
+        size = min(block_size, position - start)
+        position -= size
+        f.seek(position)
+        data = f.read(size) + carry
+        carry = b""
+        if position > start:
+            # Bytes before the first newline end a line that starts in an earlier block
+            cut = data.find(b"\n")
+            if cut == -1:
+                carry = data
+                continue
+            carry, data = data[:cut + 1], data[cut + 1:]
+        yield data
+    if carry:
+        yield carry
+
+
+def _line_boundary(f, offset: int) -> int:
+    """Get the start of the first line beginning at or after offset."""
+    if offset <= 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def summarize_log(path: str, sections: List[str] = None, head_bytes: int = SUMMARY_HEAD_BYTES,
+                  tail_bytes: int = SUMMARY_TAIL_BYTES, fallback: List[str] = None,
+                  errors: str = "replace") -> Tuple[Dict[str, any], Dict[str, any]]:
+    """Parse the fixed-field sections of an on-disk log from its head and tail.
+
+    The tail is scanned backwards block by block, so the first block that
+    resolves a field holds its last match, as in a full parse. Header facts
+    are then taken from the head, scanned forwards, and are first-block-wins:
+    the first head block that resolves a field gives its value, so a header
+    field logged again later, e.g. by a second render, keeps its first value
+    where a full parse would keep the last. Each scan stops as soon as every
+    field is resolved. Only the fields named in fallback are then searched
+    backwards through the middle of the log when still unresolved, every
+    other field stays unresolved rather than costing a full read. A field
+    whose value in the log equals its default cannot be told apart from a
+    missing one. Compressed logs cannot be seeked and are parsed in full.
+    Args:
+        path (str): Log file
+        sections (list): Sections from SUMMARY_SECTIONS (default all of them)
+        head_bytes (int): Bytes read from the start of the log
+        tail_bytes (int): Bytes read from the end of the log
+        fallback (list): "section" or "section.field" names to search for in
+            the middle of the log (default none)
+        errors (str): How to handle undecodable bytes
+    Returns:
+        tuple: (sections dict, info dict with bytes_read, size, seconds,
+            full_scan and the fields left "unresolved")
+    Raises:
+        ValueError: If a section is not in SUMMARY_SECTIONS or a fallback
+            name is not one of its fields
+    """
+    sections = list(sections or SUMMARY_SECTIONS)
+    unknown = [section for section in sections if section not in SUMMARY_SECTIONS]
+    if unknown:
+        raise ValueError("not available in a summary parse: " + ", ".join(unknown))
+
+    start = time.perf_counter()
+    defaults = ArnoldLogParser("").parse(sections)
+    results = ArnoldLogParser("").parse(sections)
+    unresolved = {section: set(defaults[section]) for section in sections}
+    info = {"bytes_read": 0, "size": os.path.getsize(path), "full_scan": False}
+
+    # Section -> fields the middle of the log may be searched for
+    fallback_fields = {section: set() for section in sections}
+    for name in fallback or []:
+        section, _, key = name.partition(".")
+        if section not in defaults or (key and key not in defaults[section]):
+            raise ValueError(f"not a field of the summary sections: {name}")
+        fallback_fields[section].update([key] if key else defaults[section])
+
+    def resolve(data, targets):
+        """Take the fields of targets a block resolves, True once none is left."""
+        info["bytes_read"] += len(data)
+        pending = [section for section in sections if targets[section]]
+        partial = ArnoldLogParser.from_lines(_decode_lines(data, errors)).parse(pending)
+        for section, fields in partial.items():
+            default = defaults[section]
+            for key, field in fields.items():
+                if key in targets[section] and (
+                    field != default[key] or type(field) is not type(default[key])
+                ):
+                    results[section][key] = field
+                    unresolved[section].discard(key)
+                    targets[section].discard(key)
+        return not any(targets.values())
+
+    with open(path, "rb") as f:
+        if compression_module(f.read(6)) is not None:
+            for progress in iter_parse_chunks(path, sections, errors=errors):
+                pass
+            results = progress.results
+            info.update(bytes_read=info["size"], full_scan=True)
+            unresolved = {
+                section: {key for key, default in defaults[section].items() if results[section][key] == default}
+                for section in sections
+            }
+        else:
+            size = info["size"]
+            tail_start = _line_boundary(f, size - tail_bytes)
+            head_end = min(_line_boundary(f, head_bytes), tail_start)
+
+            done = False
+            for data in _iter_blocks_reverse(f, tail_start, size, SUMMARY_BLOCK_SIZE):
+                if resolve(data, unresolved):
+                    done = True
+                    break
+            if not done:
+                for data in _iter_blocks_forward(f, 0, head_end, SUMMARY_BLOCK_SIZE):
+                    if resolve(data, unresolved):
+                        done = True
+                        break
+            wanted = {section: unresolved[section] & fallback_fields[section] for section in sections}
+            if not done and any(wanted.values()):
+                for data in _iter_blocks_reverse(f, head_end, tail_start, SUMMARY_BLOCK_SIZE):
+                    if resolve(data, wanted):
+                        break
+            info["full_scan"] = info["bytes_read"] >= size
+
+    info["seconds"] = time.perf_counter() - start
+    info["unresolved"] = {section: sorted(fields) for section, fields in unresolved.items() if fields}
+    return results, info
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: parse logs and print the sections as JSON.
+
+    Only the standard library is imported here, so the CLI starts quickly
+    enough to run as a post-task hook for every frame on the farm.
+    """
+    import argparse
+    import json
+    import sys
+
+    import log_json
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m log_parser",
+        description="Parse Arnold render logs and print the extracted stats as JSON.",
+    )
+    arg_parser.add_argument(
+        "logs", nargs="*", help="log files to parse, optionally .gz/.bz2/.xz compressed, '-' reads stdin"
+    )
+    arg_parser.add_argument(
+        "--format", choices=["json", "ndjson"], default="json",
+        help="a single JSON document, or one JSON object per log and line (default json)",
+    )
+    arg_parser.add_argument(
+        "--sections",
+        help="comma separated sections to extract (default all): " + ", ".join(ArnoldLogParser.SECTIONS),
+    )
+    arg_parser.add_argument("--indent", type=int, default=None, help="indent json output")
+    arg_parser.add_argument("--profile", action="store_true", help="include the parser profile report")
+    arg_parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="worker processes parsing each log in parallel, 0 uses every core (default 1)",
+    )
+    arg_parser.add_argument(
+        "--summary", action="store_true",
+        help="only read the head and tail of on-disk logs for the fixed-field sections: "
+             + ", ".join(SUMMARY_SECTIONS),
+    )
+    arg_parser.add_argument(
+        "--fallback", metavar="FIELDS",
+        help="with --summary, comma-separated sections or section.field names to search for in the middle "
+             "of the log when the head and tail do not resolve them (default none)",
+    )
+    arg_parser.add_argument(
+        "--stats-json", metavar="FILE",
+        help="Arnold render stats JSON of a single log, its exact values replace the stats parsed from the log text",
+    )
+    arg_parser.add_argument(
+        "--profile-json", metavar="FILE",
+        help="Arnold profile JSON of a single log, adds per-node and per-shader timing tables",
+    )
+    arg_parser.add_argument("--top", type=int, default=20, help="rows in the profile timing tables (default 20)")
+    arg_parser.add_argument(
+        "--history", nargs="?", const="", metavar="DB",
+        help="record every parsed log in the SQLite render history (default database if DB is omitted)",
+    )
+    args = arg_parser.parse_args(argv)
+
+    if not args.logs and not (args.stats_json or args.profile_json):
+        arg_parser.error("give at least one log, --stats-json or --profile-json")
+    if len(args.logs) > 1 and (args.stats_json or args.profile_json):
+        arg_parser.error("--stats-json and --profile-json need a single log")
+    if args.profile and args.jobs != 1:
+        arg_parser.error("--profile cannot be combined with --jobs")
+    if args.summary and (args.profile or args.jobs != 1):
+        arg_parser.error("--summary cannot be combined with --profile or --jobs")
+
+    sections = None
+    if args.sections:
+        sections = [section.strip() for section in args.sections.split(",") if section.strip()]
+        unknown = [section for section in sections if section not in ArnoldLogParser.SECTIONS]
+        if unknown:
+            arg_parser.error("unknown section(s): " + ", ".join(unknown))
+    if args.summary:
+        sections = sections or list(SUMMARY_SECTIONS)
+        unknown = [section for section in sections if section not in SUMMARY_SECTIONS]
+        if unknown:
+            arg_parser.error("not available with --summary: " + ", ".join(unknown))
+    fallback = None
+    if args.fallback:
+        if not args.summary:
+            arg_parser.error("--fallback needs --summary")
+        fallback = [name.strip() for name in args.fallback.split(",") if name.strip()]
+        summary_defaults = ArnoldLogParser("").parse(sections)
+        unknown = []
+        for name in fallback:
+            section, _, key = name.partition(".")
+            if section not in summary_defaults or (key and key not in summary_defaults[section]):
+                unknown.append(name)
+        if unknown:
+            arg_parser.error("unknown --fallback field(s): " + ", ".join(unknown))
+
+    history = None
+    if args.history is not None:
+        import log_history
+        from log_export import EXPORT_SECTIONS, log_digest, render_row
+
+        if args.summary or (sections and not set(EXPORT_SECTIONS) <= set(sections)):
+            arg_parser.error("--history needs the full parse of every export section")
+        history = log_history.RenderHistory(args.history or log_history.DEFAULT_HISTORY_PATH)
+
+    json_sections = None
+    profile_timing = None
+    try:
+        if args.stats_json:
+            json_sections = log_json.load_stats_json(args.stats_json)
+        if args.profile_json:
+            profile_timing = log_json.load_profile_json(args.profile_json, top_n=args.top)
+    except (OSError, ValueError) as e:
+        arg_parser.error(f"failed to load JSON: {e}")
+    defaults = ArnoldLogParser("").parse(sections)
+
+    results = []
+    exit_code = 0
+    # Without a log the JSON files fill the sections on their own
+    for path in args.logs or [args.stats_json or args.profile_json]:
+        record = {"path": path}
+        try:
+            if not args.logs:
+                record["sections"] = ArnoldLogParser("").parse(sections)
+            elif args.summary and path != "-":
+                # Only the head and tail are read, however large the log is
+                record["sections"], record["summary"] = summarize_log(path, sections, fallback=fallback)
+            else:
+                # Parse in chunks so memory stays bounded however large the log is
+                log_source = sys.stdin.buffer if path == "-" else path
+                if args.jobs != 1:
+                    chunks = iter_parse_parallel(log_source, sections, workers=args.jobs or None)
+                else:
+                    chunks = iter_parse_chunks(log_source, sections, profile=args.profile)
+                for progress in chunks:
+                    pass
+                record["sections"] = progress.results
+        except DECOMPRESSION_ERRORS as e:
+            record["error"] = str(e)
+            exit_code = 1
+        else:
+            if json_sections:
+                log_json.merge_json_sections(record["sections"], json_sections, defaults)
+            if profile_timing is not None:
+                record["profile_timing"] = profile_timing
+            if args.profile and args.logs:
+                record["profile"] = progress.profile.report(ArnoldLogParser.PATTERNS)
+            if history is not None and args.logs:
+                digest = None if path == "-" else log_digest(path)
+                history.record([render_row(path, record["sections"], digest=digest)])
+
+        if args.format == "ndjson":
+            sys.stdout.write(json.dumps(record) + "\n")
+        else:
+            results.append(record)
+
+    if args.format == "json":
+        json.dump(results, sys.stdout, indent=args.indent)
+        sys.stdout.write("\n")
+    if history is not None:
+        history.close()
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
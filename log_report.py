@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_report.py
+Description: Render the viewer report of an Arnold log into a static HTML file.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import html
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List
+
+import pandas as pd
+import plotly.offline
+
+from log_charts import (
+    bar_chart_figure,
+    chart_config,
+    format_memory,
+    format_time,
+    has_data,
+    memory_timeline_figure,
+    phase_timeline_figure,
+)
+from log_json import load_profile_json, load_stats_json, merge_json_sections
+from log_metrics import (
+    GPU_STARTUP_LABELS,
+    RAY_TABLE_COLUMNS,
+    SHADER_TABLE_COLUMNS,
+    analyze_bottlenecks,
+    gpu_report,
+    predict_completion,
+    progress_intervals,
+    sampling_throughput,
+    texture_io_report,
+)
+from log_parser import DECOMPRESSION_ERRORS, ArnoldLogParser, LineViews, iter_parse_chunks
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# How plotly.js reaches the page: embedded once per report, a shared
+# plotly.min.js next to the reports, or the public CDN
+PLOTLYJS_MODES = ("inline", "directory", "cdn")
+PLOTLYJS_FILE = "plotly.min.js"
+
+TEXTURE_TOP_N = 10
+
+# Lines listed per severity, the rest are counted
+MAX_REPORT_LINES = 500
+
+RENDER_INFO_LABELS = {
+    "frame_number": "Frame Number",
+    "resolution": "Resolution",
+    "file_size": "File Size (.ass)",
+    "date_time": "Date / Time",
+    "render_time": "Total Render Time",
+    "memory_used": "Memory Used",
+    "aov_count": "AOV Count",
+    "output_file": "Output File",
+    "camera": "Camera",
+    "cpu_gpu": "Render Mode",
+}
+
+WORKER_INFO_LABELS = {
+    "host_name": "Host Name",
+    "cpu": "CPU",
+    "core_count": "Core Count",
+    "worker_ram": "Worker RAM",
+    "host_application": "Host Application",
+    "arnold_version": "Arnold Version",
+}
+
+GPU_INFO_LABELS = {
+    "driver": "Driver",
+    "devices": "Devices",
+    "startup": "Startup Overhead",
+    "startup_share": "Startup Share of Frame",
+    "peak_memory": "Peak GPU Memory",
+}
+
+REPORT_STYLE = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 2rem auto; max-width: 1200px; color: #31333f; }
+h1 { margin-bottom: 0; }
+h2 { border-bottom: 2px solid #ff4b4b; padding-bottom: 0.3rem; margin-top: 2.5rem; }
+table { border-collapse: collapse; margin: 0.5rem 0 1rem; font-size: 0.9rem; }
+th, td { border-bottom: 1px solid #e6e6e6; padding: 0.3rem 0.8rem; text-align: left; vertical-align: top; }
+th { background: #f0f2f6; }
+pre { background: #f0f2f6; padding: 0.8rem; overflow-x: auto; white-space: pre-wrap; font-size: 0.8rem; }
+.caption { color: #808495; font-size: 0.85rem; }
+.notice { padding: 0.6rem 1rem; border-radius: 0.4rem; margin: 0.5rem 0; }
+.info { background: #e8f2fc; }
+.success { background: #e6f5ea; }
+.warning { background: #fffae6; }
+.error { background: #fdecea; }
+"""
+
+
+# FUNCTIONS
+# =========================
+@lru_cache(maxsize=1)
+def _plotlyjs() -> str:
+    """The plotly.js bundle, read once per process."""
+    return plotly.offline.get_plotlyjs()
+
+
+def plotlyjs_tag(mode: str = "inline", output_dir: str = None) -> str:
+    """Get the script tag loading plotly.js for a report.
+    Args:
+        mode (str): One of PLOTLYJS_MODES
+        output_dir (str): Report directory, receives plotly.min.js in "directory" mode
+    Returns:
+        str: HTML script tag
+    """
+    if mode == "cdn":
+        return f'<script src="https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"></script>'
+    if mode == "directory":
+        bundle = os.path.join(output_dir or ".", PLOTLYJS_FILE)
+        if not os.path.isfile(bundle):
+            with open(bundle, "w", encoding="utf-8") as f:
+                f.write(_plotlyjs())
+        return f'<script src="{PLOTLYJS_FILE}"></script>'
+    return f"<script>{_plotlyjs()}</script>"
+
+
+def _text(value) -> str:
+    """Escape a value for HTML."""
+    return html.escape(str(value))
+
+
+def _notice(text: str, kind: str = "info") -> str:
+    """A coloured message box like st.info() / st.warning()."""
+    return f'<div class="notice {kind}">{_text(text)}</div>'
+
+
+def _fields_table(fields: Dict[str, any], labels: Dict[str, str] = None, formatter=None) -> str:
+    """Two-column table of a section's fields."""
+    rows = []
+    for key, label in (labels or {key: key.replace("_", " ").title() for key in fields}).items():
+        value = fields.get(key)
+        if value is None:
+            value = "N/A"
+        elif formatter is not None and isinstance(value, (int, float)):
+            value = formatter(value)
+        rows.append(f"<tr><th>{_text(label)}</th><td>{_text(value)}</td></tr>")
+    return "<table>" + "".join(rows) + "</table>"
+
+
+def _frame_table(rows, columns: List[str] = None) -> str:
+    """Table of a list of row dicts or a DataFrame."""
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=columns)
+    return df.to_html(index=False, border=0, na_rep="", float_format=lambda value: f"{value:,.3f}")
+
+
+def _figure(fig, filename: str) -> str:
+    """A Plotly figure as a div, plotly.js is loaded once by the page."""
+    return fig.to_html(
+        full_html=False, include_plotlyjs=False, config=chart_config(filename), default_width="100%"
+    )
+
+
+def _lines(lines: List[str], label: str) -> str:
+    """Collapsible block of log lines."""
+    shown = "\n".join(lines[:MAX_REPORT_LINES])
+    more = f"\n... {len(lines) - MAX_REPORT_LINES} more" if len(lines) > MAX_REPORT_LINES else ""
+    return f"<details><summary>View {len(lines)} {label}</summary><pre>{_text(shown + more)}</pre></details>"
+
+
+def build_report(parser: ArnoldLogParser, sections: Dict[str, any], title: str,
+                 profile_timing: Dict[str, any] = None, plotlyjs: str = "inline",
+                 output_dir: str = None, timelines: Dict[str, List[Dict[str, any]]] = None) -> str:
+    """Render every section of the viewer into one static HTML page.
+    Args:
+        parser (ArnoldLogParser): Parser holding the log lines, unused when timelines is given
+        sections (dict): Parsed sections
+        title (str): Log name shown at the top
+        profile_timing (dict): Output of load_profile_json(), if any
+        plotlyjs (str): One of PLOTLYJS_MODES
+        output_dir (str): Report directory, for the "directory" mode
+        timelines (dict): LineViews.results() of the log, saves reading its lines again
+    Returns:
+        str: Complete HTML document
+    """
+    if timelines is None:
+        timelines = {
+            "memory_samples": parser.get_memory_samples(),
+            "memory_jumps": parser.get_memory_jumps(top_n=10),
+            "phase_timeline": parser.get_phase_timeline(),
+            "progress_timeline": parser.get_progress_timeline(),
+        }
+
+    body = [
+        "<h1>Arnold Render Log Report</h1>",
+        f'<p class="caption">{_text(title)} - generated {datetime.now():%Y-%m-%d %H:%M}</p>',
+    ]
+
+    # Errors and Warnings
+    body.append("<h2>Errors / Warnings</h2>")
+    for label, lines in (("Error/s", sections["errors"]), ("Warning/s", sections["warnings"])):
+        if lines:
+            body.append(_lines(lines, label))
+        else:
+            body.append(_notice(f"No {label[:-2].lower()}s found.", "success"))
+
+    # Render and worker info
+    render_info = sections["render_info"]
+    body.append("<h2>Render Info</h2>")
+    body.append(_fields_table(render_info, RENDER_INFO_LABELS))
+    body.append("<h2>Worker Info</h2>")
+    body.append(_fields_table(sections["worker_info"], WORKER_INFO_LABELS))
+
+    # GPU devices and startup costs, GPU renders only
+    gpu_stats = sections["gpu_stats"]
+    if sections["gpu_devices"] or has_data(gpu_stats, default_value=""):
+        gpu = gpu_report(sections)
+        body.append("<h2>GPU (experimental)</h2>")
+        body.append('<p class="caption">The GPU lines are matched against a sample log, not yet checked against '
+                    'real Arnold GPU output: values may be missing or wrong.</p>')
+        body.append(_fields_table({
+            "driver": gpu_stats["driver"] or None,
+            "devices": len(gpu["devices"]) or gpu_stats["device_count"],
+            "startup": format_time(gpu["startup_seconds"]),
+            "startup_share": f"{gpu['startup_share']:.0%}" if gpu["startup_share"] is not None else None,
+            "peak_memory": format_memory(gpu_stats["peak_gpu_memory_mb"]),
+        }, GPU_INFO_LABELS))
+        if gpu_stats["out_of_core_mb"]:
+            body.append(_notice(
+                f"Textures did not fit in GPU memory, {format_memory(gpu_stats['out_of_core_mb'])} "
+                "were moved out-of-core to host memory.", "warning"
+            ))
+        if gpu["devices"]:
+            body.append(_frame_table(gpu["devices"], [
+                "device", "name", "compute", "memory_mb", "available_mb", "peak_mb", "peak_share",
+            ]))
+        body.append(_frame_table(
+            [dict(row, phase=GPU_STARTUP_LABELS[row["phase"]]) for row in gpu["startup"]],
+            ["phase", "seconds", "share"],
+        ))
+
+    # Arnold config and plugins
+    body.append("<h2>Arnold Config / Plugins</h2>")
+    plugin_nodes, plugin_libraries = ArnoldLogParser.summarize_plugins(
+        sections["plugin_table"], sections["plugin_info"]
+    )
+    if plugin_libraries:
+        body.append(_frame_table(plugin_libraries))
+        body.append(f'<p class="caption">{len(plugin_nodes)} plugin node/s loaded.</p>')
+    else:
+        body.append(_notice("No plugin loading information found in log."))
+    body.append(_fields_table(sections["colour_space"], {"colour_space": "Colour Space", "ocio_config": "OCIO Config"}))
+
+    # Scene statistics
+    body.append("<h2>Scene Statistics</h2>")
+    body.append("<h3>Node Init / Scene Contents</h3>")
+    if has_data(sections["scene_info"], default_value=""):
+        body.append(_fields_table(sections["scene_info"]))
+    else:
+        body.append(_notice("No scene initialization information found in log."))
+
+    body.append("<h3>Samples / Ray Depths</h3>")
+    if has_data(sections["sample_info"], default_value=""):
+        body.append(_fields_table(sections["sample_info"]))
+    else:
+        body.append(_notice("No sampling information found in log."))
+
+    body.append("<h3>Render Progress</h3>")
+    progress_info = sections["progress_info"]
+    if progress_info:
+        body.append(_figure(bar_chart_figure([progress_info], "Rays Per Pixel", "% of total ray count"),
+                            "arnold_log_%_of_total_ray_count"))
+    else:
+        body.append(_notice("No render progress information found in log."))
+
+    phase_timeline = timelines["phase_timeline"]
+    progress_steps = timelines["progress_timeline"]
+    if progress_steps:
+        prediction = predict_completion(progress_steps, now=phase_timeline[-1]["end"] if phase_timeline else None)
+        remaining = "Done" if prediction["complete"] else (
+            format_time(prediction["remaining"]) if prediction["remaining"] is not None else "N/A"
+        )
+        body.append(_fields_table(
+            {"progress": f"{prediction['percent']}%", "remaining": remaining},
+            {"progress": "Progress", "remaining": "Remaining (ETA)"},
+        ))
+        if prediction["stalled_for"] is not None:
+            body.append(_notice(
+                f"No progress for {format_time(prediction['stalled_for'])} since {prediction['percent']}%, "
+                "the frame may be stuck.", "error"
+            ))
+        body.append(_frame_table(progress_intervals(progress_steps, render_info["resolution"])))
+
+    body.append("<h3>Phase Timeline</h3>")
+    if phase_timeline:
+        if phase_timeline[-1]["phase"] != "shutdown":
+            body.append(_notice(
+                f"Log ends during {phase_timeline[-1]['phase']}, it may be truncated or the render is still running.",
+                "warning",
+            ))
+        body.append(_figure(phase_timeline_figure(phase_timeline), "arnold_log_phase_timeline"))
+    else:
+        body.append(_notice("No timestamped lines found in log."))
+
+    body.append("<h3>Scene Creation</h3>")
+    body.append(_fields_table(sections["scene_creation"], formatter=format_time))
+    body.append(_figure(bar_chart_figure(sections["scene_creation"], "Time", "Time as percentage"), "arnold_log_time"))
+
+    body.append("<h3>Render Time</h3>")
+    render_time = sections["render_time"]
+    body.append(_fields_table(render_time, formatter=format_time))
+    body.append(_figure(bar_chart_figure(render_time, "Render Time", "Render time as percentage"),
+                        "arnold_log_render_time"))
+
+    body.append("<h3>Bottleneck Analysis</h3>")
+    analysis = analyze_bottlenecks(sections)
+    body.append(f"<p>{_text(analysis['summary'])}</p>")
+    body.append(_frame_table(analysis["metrics"], ["label", "value", "status", "explanation"]))
+
+    body.append("<h3>Memory</h3>")
+    memory_stats = sections["memory_stats"]
+    body.append(_fields_table(memory_stats, formatter=format_memory))
+    body.append(_figure(
+        bar_chart_figure(memory_stats, "Memory Used", "Memory used in MB", convert_values=False),
+        "arnold_log_memory_used",
+    ))
+
+    body.append("<h3>Memory Timeline</h3>")
+    memory_samples = timelines["memory_samples"]
+    if memory_samples:
+        memory_jumps = timelines["memory_jumps"]
+        body.append(_figure(memory_timeline_figure(memory_samples, memory_jumps), "arnold_log_memory_timeline"))
+        if memory_jumps:
+            body.append(_frame_table(memory_jumps, [
+                "delta_mb", "phase", "tag", "elapsed", "line", "memory_before_mb", "memory_after_mb", "text",
+            ]))
+    else:
+        body.append(_notice("No per-line memory samples found in log."))
+
+    throughput = sampling_throughput(sections)
+    body.append("<h3>Rays</h3>")
+    if throughput["rays"]:
+        body.append(_fields_table(
+            throughput,
+            {"total_rays": "Total Rays", "rays_per_second": "Rays / Second"},
+            formatter=lambda value: f"{value:,.0f}",
+        ))
+        body.append(_figure(bar_chart_figure({row["label"]: row["count"] for row in throughput["rays"]},
+                                             "Rays", "Total rays per ray type"), "arnold_log_rays"))
+        body.append(_frame_table(throughput["rays"], RAY_TABLE_COLUMNS))
+    elif has_data(sections["ray_stats"]):
+        body.append(_figure(bar_chart_figure(sections["ray_stats"], "Rays", "Total rays per category"),
+                            "arnold_log_rays"))
+    else:
+        body.append(_notice("No ray statistics found in log."))
+
+    body.append("<h3>Shaders</h3>")
+    if throughput["shader_calls"]:
+        body.append(_fields_table(
+            throughput,
+            {"total_shader_calls": "Total Shader Calls", "shader_calls_per_second": "Shader Calls / Second"},
+            formatter=lambda value: f"{value:,.0f}",
+        ))
+        body.append(_figure(bar_chart_figure({row["label"]: row["count"] for row in throughput["shader_calls"]},
+                                             "Shaders", "Shader calls per context"), "arnold_log_shaders"))
+        body.append(_frame_table(throughput["shader_calls"], SHADER_TABLE_COLUMNS))
+    elif has_data(sections["shader_stats"]):
+        body.append(_figure(bar_chart_figure(sections["shader_stats"], "Shaders", "Shader calls per category."),
+                            "arnold_log_shaders"))
+    else:
+        body.append(_notice("No shader statistics found in log."))
+
+    body.append("<h3>Geometry</h3>")
+    if has_data(sections["geometry_stats"]):
+        body.append(_fields_table(sections["geometry_stats"]))
+    else:
+        body.append(_notice("No geometry statistics found in log."))
+
+    body.append("<h3>Textures</h3>")
+    texture_stats = sections["texture_stats"]
+    if has_data(texture_stats):
+        body.append(_fields_table(texture_stats))
+    else:
+        body.append(_notice("No texture statistics found in log."))
+    texture_io = sections["texture_io"]
+    if texture_io:
+        texture_report = texture_io_report(texture_io, texture_stats, top_n=TEXTURE_TOP_N)
+        if texture_report["untiled"] or texture_report["unmipped"]:
+            body.append(_notice("Untiled or unmipped textures are read whole, convert them to .tx with maketx.",
+                                "warning"))
+        body.append(f"<h4>Top {TEXTURE_TOP_N} by MB Read</h4>")
+        body.append(_frame_table(texture_report["by_mb_read"]))
+        if texture_report["by_redundancy"]:
+            body.append(f"<h4>Top {TEXTURE_TOP_N} by Redundant Reads</h4>")
+            body.append(_frame_table(texture_report["by_redundancy"]))
+
+    if profile_timing is not None:
+        body.append("<h3>Profile Timing</h3>")
+        body.append("<h4>Nodes</h4>")
+        body.append(_frame_table(profile_timing["nodes"]))
+        if profile_timing["shaders"]:
+            body.append("<h4>Shaders</h4>")
+            body.append(_frame_table(profile_timing["shaders"]))
+
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{_text(title)} - Arnold Render Log Report</title>"
+        f"<style>{REPORT_STYLE}</style>{plotlyjs_tag(plotlyjs, output_dir)}</head>"
+        "<body>" + "\n".join(body) + "</body></html>\n"
+    )
+
+
+def report_from_log(path: str, stats_json: str = None, profile_json: str = None,
+                    plotlyjs: str = "inline", output_dir: str = None) -> str:
+    """Parse a log (and optional Arnold JSON files) and render its HTML report."""
+    # The timelines are built in the same pass, the lines are never held
+    views = LineViews(top_n=10)
+    for progress in iter_parse_chunks(path, on_lines=views.add_lines):
+        pass
+    sections = progress.results
+
+    if stats_json:
+        merge_json_sections(sections, load_stats_json(stats_json), ArnoldLogParser("").parse())
+    profile_timing = load_profile_json(profile_json) if profile_json else None
+    return build_report(None, sections, os.path.basename(path), profile_timing, plotlyjs, output_dir,
+                        timelines=views.results())
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point: write one static HTML report per log.
+    """
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m log_report",
+        description="Render Arnold logs into static HTML reports that open without a server.",
+    )
+    arg_parser.add_argument("logs", nargs="+", help="log files, optionally .gz/.bz2/.xz compressed")
+    arg_parser.add_argument(
+        "-o", "--output",
+        help="report file for a single log, or a directory (default: <log>.html next to each log)",
+    )
+    arg_parser.add_argument(
+        "--plotlyjs", choices=PLOTLYJS_MODES, default="inline",
+        help="embed plotly.js in every report (default), share one plotly.min.js in the "
+             "output directory, or load it from the CDN",
+    )
+    arg_parser.add_argument("--stats-json", metavar="FILE", help="Arnold render stats JSON for a single log")
+    arg_parser.add_argument("--profile-json", metavar="FILE", help="Arnold profile JSON for a single log")
+    args = arg_parser.parse_args(argv)
+
+    single = len(args.logs) == 1 and args.output and not os.path.isdir(args.output)
+    if (args.stats_json or args.profile_json) and len(args.logs) > 1:
+        arg_parser.error("--stats-json and --profile-json need a single log")
+
+    exit_code = 0
+    for path in args.logs:
+        if single:
+            output = args.output
+        else:
+            directory = args.output or os.path.dirname(os.path.abspath(path))
+            output = os.path.join(directory, os.path.basename(path) + ".html")
+        try:
+            report = report_from_log(
+                path, args.stats_json, args.profile_json, args.plotlyjs, os.path.dirname(os.path.abspath(output))
+            )
+        except (OSError, ValueError, *DECOMPRESSION_ERRORS) as e:
+            print(f"{path}: {e}")
+            exit_code = 1
+            continue
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(report)
+        print(output)
+    return exit_code
+
+
+# RUN THE SCRIPT
+# =========================
+if __name__ == "__main__":
+    raise SystemExit(main())
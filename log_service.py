@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_service.py
+Description: Local HTTP service returning parsed Arnold log sections as JSON.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from log_parser import DECOMPRESSION_ERRORS, ArnoldLogParser, iter_parse_chunks
+
+
+# GLOBALS / CONSTANTS
+# =========================
+DEFAULT_PORT = 8765
+
+# Parses queued or running at once, further requests get 503
+DEFAULT_MAX_QUEUE = 64
+
+# Parsed results kept in the LRU cache
+DEFAULT_CACHE_SIZE = 256
+
+# Largest log accepted in a request body
+DEFAULT_MAX_BODY = 512 * 1024 * 1024
+
+# Bytes of a request body read at a time while it is written to disk
+BODY_BLOCK_SIZE = 1024 * 1024
+
+# Request latencies kept for the percentiles in /metrics
+LATENCY_WINDOW = 1000
+
+
+# FUNCTIONS
+# =========================
+def _within_roots(path: str, roots: List[str]) -> bool:
+    """Check that a resolved path lies inside one of the resolved root directories."""
+    return any(os.path.commonpath([path, root]) == root for root in roots)
+
+
+def parse_source(source: str, sections: List[str] = None) -> Dict[str, any]:
+    """Parse a log path (runs in a worker process)."""
+    for progress in iter_parse_chunks(source, sections):
+        pass
+    return progress.results
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of values, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ParseService:
+    """Process pool, bounded queue, result cache and metrics behind the HTTP handler."""
+
+    def __init__(self, workers: int = None, max_queue: int = DEFAULT_MAX_QUEUE,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = self._new_executor()
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+
+        # Reentrant, a parse that finishes at once runs its callback under the lock
+        self.lock = threading.RLock()
+        self.cache = OrderedDict()
+        # Cache key -> future of a parse in progress, shared by identical requests
+        self.in_flight = {}
+        self.queued = 0
+        # Request bodies being read, each holds a queue slot until it is parsed
+        self.reserved = 0
+
+        self.counters = {
+            "requests": 0, "cache_hits": 0, "cache_misses": 0, "rejected": 0, "errors": 0, "pool_restarts": 0,
+        }
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.parse_latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """Start a worker pool, spawned since the request threads are already running."""
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _restart_pool(self, broken: ProcessPoolExecutor):
+        """Replace a pool broken by a dead worker, unless another request already did."""
+        with self.lock:
+            if self.executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new_executor()
+            self.counters["pool_restarts"] += 1
+
+    def reserve(self) -> bool:
+        """Take a queue slot before reading a request body, False when the queue is full."""
+        with self.lock:
+            if self.queued + self.reserved >= self.max_queue:
+                self.counters["rejected"] += 1
+                return False
+            self.reserved += 1
+            return True
+
+    def release(self):
+        """Give back a slot taken by reserve() when the body is not parsed."""
+        with self.lock:
+            self.reserved -= 1
+
+    def parse(self, key: tuple, source, sections: List[str], reserved: bool = False):
+        """Get parsed sections from the cache or the process pool.
+        Args:
+            key (tuple): Cache key identifying the log content and sections
+            source: Log path passed to parse_source()
+            sections (list): Section names, None for all
+            reserved (bool): Use the slot taken by reserve(), which is always given back
+        Returns:
+            tuple: (sections dict, True if served from the cache), or
+                (None, False) when the queue is full
+        Raises:
+            BrokenProcessPool: A worker died during the parse, the pool is
+                replaced so the request can be retried
+        """
+        with self.lock:
+            if reserved:
+                # The slot is given back here, a new parse takes it at once below
+                self.reserved -= 1
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.counters["cache_hits"] += 1
+                return self.cache[key], True
+
+            future = self.in_flight.get(key)
+            if future is None:
+                if self.queued + self.reserved >= self.max_queue:
+                    self.counters["rejected"] += 1
+                    return None, False
+                self.counters["cache_misses"] += 1
+                self.queued += 1
+                submitted = time.perf_counter()
+                try:
+                    executor = self.executor
+                    future = executor.submit(parse_source, source, sections)
+                except BrokenProcessPool:
+                    self._restart_pool(executor)
+                    executor = self.executor
+                    future = executor.submit(parse_source, source, sections)
+                self.in_flight[key] = future
+                future.add_done_callback(lambda done: self._finish(key, done, submitted, executor))
+
+        return future.result(), False
+
+    def _finish(self, key: tuple, future, submitted: float, executor: ProcessPoolExecutor):
+        """Cache a finished parse and release its queue slot."""
+        with self.lock:
+            self.queued -= 1
+            self.in_flight.pop(key, None)
+            self.parse_latencies.append(time.perf_counter() - submitted)
+            if future.cancelled():
+                return
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._restart_pool(executor)
+            elif future.exception() is None:
+                self.cache[key] = future.result()
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+    def record(self, seconds: float, error: bool = False):
+        """Record the latency of a handled request."""
+        with self.lock:
+            self.counters["requests"] += 1
+            self.counters["errors"] += error
+            self.latencies.append(seconds)
+
+    def metrics(self) -> Dict[str, any]:
+        """Get request counters, queue depth and latency percentiles."""
+        with self.lock:
+            latencies = list(self.latencies)
+            parse_latencies = list(self.parse_latencies)
+            metrics = dict(self.counters)
+            metrics.update({
+                "queue_depth": self.queued + self.reserved,
+                "max_queue": self.max_queue,
+                "workers": self.workers,
+                "cache_entries": len(self.cache),
+                "cache_size": self.cache_size,
+            })
+
+        for name, values in (("latency", latencies), ("parse_latency", parse_latencies)):
+            metrics[name] = {
+                f"p{int(q * 100)}": _percentile(values, q) for q in (0.5, 0.95, 0.99)
+            }
+            metrics[name]["count"] = len(values)
+        return metrics
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self.executor.shutdown(cancel_futures=True)
+
+
+def requested_sections(query: Dict[str, List[str]]):
+    """Get the sections of a ?sections= query, or None for all.
+    Returns:
+        tuple: (section list or None, error message or None)
+    """
+    if not query.get("sections"):
+        return None, None
+    sections = [section.strip() for section in query["sections"][0].split(",") if section.strip()]
+    unknown = [section for section in sections if section not in ArnoldLogParser.SECTIONS]
+    if unknown:
+        return None, "unknown section(s): " + ", ".join(unknown)
+    return sections, None
+
+
+class ParseRequestHandler(BaseHTTPRequestHandler):
+    """HTTP endpoints: /parse (GET ?path= or POST body), /metrics and /health."""
+
+    server_version = "ArnoldLogService/0.1"
+
+    @property
+    def service(self) -> ParseService:
+        return self.server.service
+
+    def send_json(self, status: int, payload, headers: Dict[str, str] = None):
+        """Send a JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Only log requests when the server runs verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif url.path == "/metrics":
+            self.send_json(200, self.service.metrics())
+        elif url.path == "/parse":
+            self.handle_parse(url, body=None)
+        else:
+            self.send_json(404, {"error": f"unknown endpoint {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/parse":
+            self.send_json(404, {"error": f"unknown endpoint {url.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {"error": "invalid Content-Length"})
+            return
+        if length > self.server.max_body:
+            self.send_json(413, {"error": f"log body larger than {self.server.max_body} bytes"})
+            return
+        if not length:
+            self.handle_parse(url)
+            return
+
+        start = time.perf_counter()
+        sections, error = requested_sections(parse_qs(url.query))
+        if error:
+            self.send_json(400, {"error": error})
+            return
+        # A full queue refuses the body before it is read
+        if not self.service.reserve():
+            self.send_json(503, {"error": "parse queue is full, retry later"}, {"Retry-After": "1"})
+            self.service.record(time.perf_counter() - start)
+            return
+
+        try:
+            upload = self.read_body(length)
+        except BaseException:
+            self.service.release()
+            raise
+        if upload is None:
+            self.service.release()
+            self.send_json(400, {"error": f"log body shorter than its Content-Length of {length} bytes"})
+            return
+        try:
+            self.handle_parse(url, upload, start)
+        finally:
+            os.remove(upload[0])
+
+    def read_body(self, length: int):
+        """Write the request body to a temporary file, hashing it on the way.
+        Returns:
+            tuple: (file path, SHA-256 of the body), or None if the body is short
+        """
+        digest = hashlib.sha256()
+        handle, path = tempfile.mkstemp(prefix="arnold_log_", suffix=".log")
+        try:
+            with os.fdopen(handle, "wb") as spool:
+                remaining = length
+                while remaining:
+                    block = self.rfile.read(min(remaining, BODY_BLOCK_SIZE))
+                    if not block:
+                        break
+                    digest.update(block)
+                    spool.write(block)
+                    remaining -= len(block)
+        except BaseException:
+            os.remove(path)
+            raise
+        if remaining:
+            os.remove(path)
+            return None
+        return path, digest.hexdigest()
+
+    def handle_parse(self, url, upload: tuple = None, start: float = None):
+        """Parse a log given as a ?path= query or as a request body read by read_body()."""
+        if start is None:
+            start = time.perf_counter()
+        status, payload, headers = self.parse_response(parse_qs(url.query), upload)
+        self.send_json(status, payload, headers)
+        # Refused requests are counted as rejected, not as errors
+        self.service.record(time.perf_counter() - start, error=status >= 500 and status != 503)
+
+    def parse_response(self, query: Dict[str, List[str]], upload: tuple = None):
+        """Build the status, JSON payload and headers of a /parse request.
+
+        An upload holds the queue slot taken by ParseService.reserve(), which
+        the parse gives back.
+        """
+        sections, error = requested_sections(query)
+        if error:
+            return 400, {"error": error}, None
+        section_key = tuple(sections) if sections else None
+
+        path = query.get("path", [None])[0]
+        if upload:
+            source, digest = upload
+            key = ("body", digest, section_key)
+        elif path:
+            # Only logs under the configured roots can be read from disk
+            if not self.server.log_roots:
+                return 403, {"error": "parsing by path is disabled, start the service with --log-root"}, None
+            source = os.path.realpath(path)
+            if not _within_roots(source, self.server.log_roots):
+                return 403, {"error": f"log outside the configured log roots: {path}"}, None
+            if not os.path.isfile(source):
+                return 404, {"error": f"log not found: {path}"}, None
+            stat = os.stat(source)
+            key = ("path", source, stat.st_size, stat.st_mtime_ns, section_key)
+        else:
+            return 400, {"error": "POST a log body or GET /parse?path=<log>"}, None
+
+        try:
+            results, cached = self.service.parse(key, source, sections, reserved=upload is not None)
+        except BrokenProcessPool:
+            return 503, {"path": path, "error": "a parse worker died, retry later"}, {"Retry-After": "1"}
+        except DECOMPRESSION_ERRORS as e:
+            return 422, {"path": path, "error": str(e)}, None
+        except Exception as e:
+            return 500, {"path": path, "error": str(e)}, None
+
+        if results is None:
+            return 503, {"error": "parse queue is full, retry later"}, {"Retry-After": "1"}
+        return 200, {"path": path, "sections": results}, {"X-Cache": "hit" if cached else "miss"}
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, workers: int = None,
+          max_queue: int = DEFAULT_MAX_QUEUE, cache_size: int = DEFAULT_CACHE_SIZE,
+          max_body: int = DEFAULT_MAX_BODY, log_roots: List[str] = None,
+          verbose: bool = False) -> ThreadingHTTPServer:
+    """Create the HTTP server, call serve_forever() on it to start serving.
+    GET /parse?path= only reads logs under log_roots, and is disabled without them.
+    """
+    server = ThreadingHTTPServer((host, port), ParseRequestHandler)
+    server.daemon_threads = True
+    server.service = ParseService(workers=workers, max_queue=max_queue, cache_size=cache_size)
+    server.max_body = max_body
+    server.log_roots = [os.path.realpath(root) for root in log_roots or []]
+    server.verbose = verbose
+    return server
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point for the parse service.
+    """
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m log_service",
+        description="Serve parsed Arnold log sections as JSON over HTTP on this machine.",
+    )
+    arg_parser.add_argument("--host", default="127.0.0.1", help="address to bind (default 127.0.0.1)")
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT})")
+    arg_parser.add_argument("--workers", type=int, default=None, help="parse worker processes (default one per CPU)")
+    arg_parser.add_argument(
+        "--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+        help=f"parses queued or running before requests are refused with 503 (default {DEFAULT_MAX_QUEUE})",
+    )
+    arg_parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+        help=f"parsed results kept in memory (default {DEFAULT_CACHE_SIZE})",
+    )
+    arg_parser.add_argument(
+        "--max-body-mb", type=int, default=DEFAULT_MAX_BODY // (1024 * 1024),
+        help="largest log accepted in a request body, in MB",
+    )
+    arg_parser.add_argument(
+        "--log-root", action="append", default=[], metavar="DIR",
+        help="directory whose logs GET /parse?path= may read, repeatable (disabled without one)",
+    )
+    arg_parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = arg_parser.parse_args(argv)
+
+    server = serve(
+        args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+        cache_size=args.cache_size, max_body=args.max_body_mb * 1024 * 1024,
+        log_roots=args.log_root, verbose=args.verbose,
+    )
+    print(f"Serving Arnold log parses on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+    return 0
+
+
+# RUN THE SCRIPT
+# =========================
+if __name__ == "__main__":
+    raise SystemExit(main())
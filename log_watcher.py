@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: log_watcher.py
+Description: Watch farm log directories and append finished logs to a Parquet dataset.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+
+from log_export import LOG_EXTENSIONS, RENDER_COLUMNS, parse_log_file, write_parquet
+from log_parser import COMPRESSED_EXTENSIONS
+
+
+# GLOBALS / CONSTANTS
+# =========================
+# Manifest file in the dataset root, pyarrow skips files starting with "_"
+MANIFEST_NAME = "_manifest.sqlite"
+
+# Seconds a log must stay unchanged before it is parsed
+DEFAULT_SETTLE_SECONDS = 30.0
+
+# Seconds a log without "Arnold shutdown" at its end must stay unchanged,
+# long frames can go quiet for minutes between progress lines
+DEFAULT_INCOMPLETE_SECONDS = 3600.0
+
+# Bytes read from the end of a log to look for the shutdown line
+TAIL_BYTES = 4096
+SHUTDOWN_MARKER = b"Arnold shutdown"
+
+# Rows buffered before they are written, and the longest they wait
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_SECONDS = 60.0
+
+# Seconds between scheduler passes
+POLL_INTERVAL = 1.0
+
+# Manifest rows written per transaction during the start-up scan
+SCAN_BATCH_SIZE = 1000
+
+# Times a log can be in flight when a worker dies before it is marked failed,
+# so one log that kills its worker cannot restart the pool forever
+MAX_POOL_BREAKS = 3
+
+
+# FUNCTIONS
+# =========================
+def is_log_file(path: str) -> bool:
+    """Check whether a path has a log file extension."""
+    return path.lower().endswith(LOG_EXTENSIONS)
+
+
+def iter_log_files(roots: Iterable[str]) -> Iterable[str]:
+    """Walk the roots lazily, yielding log file paths."""
+    for root in roots:
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if is_log_file(name):
+                    yield os.path.join(directory, name)
+
+
+def log_finished(path: str) -> bool:
+    """Check whether a log ends with the Arnold shutdown line.
+
+    Compressed logs are only written once a render is over, so they count
+    as finished.
+    """
+    if path.lower().endswith(COMPRESSED_EXTENSIONS):
+        return True
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - TAIL_BYTES))
+            return SHUTDOWN_MARKER in f.read()
+    except OSError:
+        return False
+
+
+class Manifest:
+    """Persisted state of every log seen, keyed by path with its size and mtime.
+
+    Logs wait as "pending" until they are parsed, so the queue lives on disk:
+    a restart resumes where it stopped and memory does not grow with the
+    number of files waiting. A log that changes after it was processed is
+    queued again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Opened by the caller, used by the thread running the watcher
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, seen_at REAL, "
+                "status TEXT, processed_at REAL, error TEXT)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS files_status ON files (status, seen_at)")
+
+    def close(self):
+        self.connection.close()
+
+    def touch(self, paths: Iterable[str], now: float = None) -> int:
+        """Queue logs whose size or mtime differs from the manifest.
+        Args:
+            paths (list): Log paths that were created or changed
+            now (float): Time of the change, default the file mtime
+        Returns:
+            int: Logs queued
+        """
+        rows = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            seen_at = now if now is not None else stat.st_mtime
+            rows.append((path, stat.st_size, stat.st_mtime_ns, seen_at))
+        if not rows:
+            return 0
+
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT INTO files (path, size, mtime_ns, seen_at, status) VALUES (?, ?, ?, ?, 'pending') "
+                "ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime_ns=excluded.mtime_ns, "
+                "seen_at=excluded.seen_at, status='pending', error=NULL "
+                "WHERE files.size != excluded.size OR files.mtime_ns != excluded.mtime_ns",
+                rows,
+            )
+            return self.connection.total_changes - before
+
+    def ready(self, settled_before: float, exclude: Iterable[str], limit: int) -> List[tuple]:
+        """Get pending logs unchanged since settled_before, oldest first."""
+        exclude = set(exclude)
+        rows = self.connection.execute(
+            "SELECT path, size, mtime_ns FROM files WHERE status='pending' AND seen_at <= ? "
+            "ORDER BY seen_at LIMIT ?",
+            (settled_before, limit + len(exclude)),
+        )
+        return [row for row in rows if row[0] not in exclude][:limit]
+
+    def defer(self, path: str, seen_at: float):
+        """Push back a pending log, it is still being written."""
+        with self.connection:
+            self.connection.execute("UPDATE files SET seen_at=? WHERE path=?", (seen_at, path))
+
+    def mark(self, results: List[tuple]):
+        """Record finished logs as (path, size, mtime_ns, error or None)."""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE files SET status=?, processed_at=?, error=? WHERE path=? AND size=? AND mtime_ns=?",
+                [("failed" if error else "done", now, error, path, size, mtime_ns)
+                 for path, size, mtime_ns, error in results],
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of logs per status."""
+        return dict(self.connection.execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Collect the log paths touched by file system events."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changed = set()
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ("created", "modified", "moved", "closed"):
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if is_log_file(path):
+            with self.lock:
+                self.changed.add(path)
+
+    def drain(self) -> List[str]:
+        """Get and forget the paths changed since the last call."""
+        with self.lock:
+            changed, self.changed = self.changed, set()
+        return list(changed)
+
+
+class LogWatcher:
+    """Debounce, parse and append logs from watched directories.
+    Args:
+        roots (list): Directories to watch recursively
+        output (str): Parquet dataset directory
+        partition_by (list): Partition columns
+        show (str): Show name stored on every row
+        workers (int): Parse worker processes
+        settle_seconds (float): Quiet time before a finished log is parsed
+        incomplete_seconds (float): Quiet time before a log without shutdown line is parsed
+        batch_size (int): Rows buffered before a write
+        flush_seconds (float): Longest time rows stay buffered
+        manifest (str): Manifest path (default <output>/_manifest.sqlite)
+        polling (bool): Poll the directories, for network file systems without events
+    """
+
+    def __init__(self, roots: List[str], output: str, partition_by: List[str] = ("date",), show: str = None,
+                 workers: int = None, settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 incomplete_seconds: float = DEFAULT_INCOMPLETE_SECONDS, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS, manifest: str = None, polling: bool = False):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.output = output
+        self.partition_by = list(partition_by)
+        self.show = show
+        self.workers = workers or os.cpu_count() or 1
+        # Parses in flight, further logs wait in the manifest
+        self.max_in_flight = self.workers * 2
+        self.settle_seconds = settle_seconds
+        self.incomplete_seconds = incomplete_seconds
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+
+        os.makedirs(output, exist_ok=True)
+        self.manifest = Manifest(manifest or os.path.join(output, MANIFEST_NAME))
+        self.handler = _ChangeHandler()
+        self.observer = PollingObserver() if polling else Observer()
+        self.stop_event = threading.Event()
+
+        self.executor = None
+        self.in_flight = {}
+        # Path -> times it was in flight when the pool broke
+        self.pool_breaks = {}
+        self.rows = []
+        self.row_files = []
+        self.last_flush = time.monotonic()
+        self.counters = {"parsed": 0, "failed": 0, "written": 0, "requeued": 0, "pool_restarts": 0}
+
+    def scan(self) -> int:
+        """Queue logs added or changed while the watcher was not running."""
+        queued = 0
+        batch = []
+        for path in iter_log_files(self.roots):
+            batch.append(path)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                queued += self.manifest.touch(batch)
+                batch = []
+        return queued + self.manifest.touch(batch)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """Start a worker pool, spawned since the observer threads are already running."""
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def restart_pool(self):
+        """Replace a pool broken by a dead worker and requeue its logs.
+
+        The logs in flight are still pending in the manifest, so dropping
+        them here is enough for the next pass to submit them again. A log in
+        flight at MAX_POOL_BREAKS breaks is marked failed instead.
+        """
+        failures = []
+        for path, size, mtime_ns in self.in_flight.values():
+            self.pool_breaks[path] = self.pool_breaks.get(path, 0) + 1
+            if self.pool_breaks[path] >= MAX_POOL_BREAKS:
+                failures.append((path, size, mtime_ns, "parse worker died"))
+                del self.pool_breaks[path]
+        if failures:
+            self.manifest.mark(failures)
+            self.counters["failed"] += len(failures)
+        self.counters["requeued"] += len(self.in_flight) - len(failures)
+        self.in_flight = {}
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._new_executor()
+        self.counters["pool_restarts"] += 1
+
+    def submit_ready(self):
+        """Start parsing settled logs while there are free slots."""
+        free = self.max_in_flight - len(self.in_flight)
+        if free <= 0:
+            return
+
+        now = time.time()
+        # Parsed logs stay pending until their rows are written
+        busy = [entry[0] for entry in self.in_flight.values()] + [entry[0] for entry in self.row_files]
+        for path, size, mtime_ns in self.manifest.ready(now - self.settle_seconds, busy, free):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.manifest.mark([(path, size, mtime_ns, "file disappeared")])
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                # Still being written, the manifest takes the new size and mtime
+                self.manifest.touch([path], now)
+                continue
+            if not log_finished(path) and now - stat.st_mtime < self.incomplete_seconds:
+                self.manifest.defer(path, now)
+                continue
+
+            try:
+                future = self.executor.submit(parse_log_file, path, self.show)
+            except BrokenProcessPool:
+                self.restart_pool()
+                return
+            self.in_flight[future] = (path, size, mtime_ns)
+
+    def collect(self, timeout: float):
+        """Buffer the rows of finished parses, marking failures in the manifest."""
+        if not self.in_flight:
+            self.stop_event.wait(timeout)
+            return
+
+        done, _ = wait(list(self.in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        failures = []
+        broken = False
+        for future in done:
+            path, size, mtime_ns = self.in_flight[future]
+            try:
+                row = future.result()
+            except BrokenProcessPool:
+                # Not the log's fault, it is parsed again by a new pool
+                broken = True
+                continue
+            except Exception as e:
+                del self.in_flight[future]
+                failures.append((path, size, mtime_ns, str(e) or type(e).__name__))
+                self.counters["failed"] += 1
+                continue
+            del self.in_flight[future]
+            self.pool_breaks.pop(path, None)
+            if row is None:
+                # Corrupt or truncated compressed log, reported by parse_log_file()
+                failures.append((path, size, mtime_ns, "unreadable log"))
+                self.counters["failed"] += 1
+                continue
+
+            try:
+                stat = os.stat(path)
+                changed = (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns)
+            except OSError:
+                changed = False
+            if changed:
+                # Written to while it was parsed, the row may mix two versions:
+                # drop it and queue the new version instead
+                self.manifest.touch([path], time.time())
+                self.counters["requeued"] += 1
+                continue
+            self.rows.append(row)
+            self.row_files.append((path, size, mtime_ns, None))
+            self.counters["parsed"] += 1
+        if failures:
+            self.manifest.mark(failures)
+        if broken:
+            self.restart_pool()
+
+    def flush(self, force: bool = False):
+        """Append the buffered rows to the dataset, then mark their logs done."""
+        if not self.rows:
+            self.last_flush = time.monotonic()
+            return
+        if not force and len(self.rows) < self.batch_size and time.monotonic() - self.last_flush < self.flush_seconds:
+            return
+
+        # Written before marked done: a crash in between parses the logs
+        # again rather than losing them, duplicates share their digest
+        self.counters["written"] += write_parquet(self.rows, self.output, self.partition_by)
+        self.manifest.mark(self.row_files)
+        self.rows = []
+        self.row_files = []
+        self.last_flush = time.monotonic()
+
+    def run(self, initial_scan: bool = True, verbose: bool = False):
+        """Watch and ingest until stop() is called or the process is interrupted."""
+        for root in self.roots:
+            self.observer.schedule(self.handler, root, recursive=True)
+        self.observer.start()
+        try:
+            if initial_scan:
+                queued = self.scan()
+                if verbose:
+                    print(f"Queued {queued} log(s) found in {', '.join(self.roots)}")
+
+            self.executor = self._new_executor()
+            try:
+                while not self.stop_event.is_set():
+                    changed = self.handler.drain()
+                    if changed:
+                        self.manifest.touch(changed, time.time())
+                    self.submit_ready()
+                    self.collect(POLL_INTERVAL)
+                    self.flush()
+                    if verbose and self.counters["parsed"] + self.counters["failed"]:
+                        print(f"\r{self.counters}", end="", flush=True)
+
+                # Finish the parses already started before stopping
+                while self.in_flight:
+                    self.collect(POLL_INTERVAL)
+                self.flush(force=True)
+            finally:
+                self.executor.shutdown(cancel_futures=True)
+        finally:
+            self.observer.stop()
+            self.observer.join()
+            self.manifest.close()
+
+    def stop(self):
+        """Ask run() to finish the parses in flight and return."""
+        self.stop_event.set()
+
+
+# MAIN FUNCTION
+# =========================
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point for the watch-folder daemon.
+    """
+    import argparse
+    import signal
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m log_watcher",
+        description="Watch farm log directories and append every finished log to a Parquet dataset.",
+    )
+    arg_parser.add_argument("roots", nargs="+", help="directories to watch recursively")
+    arg_parser.add_argument("-o", "--output", required=True, help="Parquet dataset directory")
+    arg_parser.add_argument(
+        "--partition-by", default="date",
+        help="comma separated partition columns, e.g. 'show,date' (default date, '' for none)",
+    )
+    arg_parser.add_argument("--show", help="show name stored on every row")
+    arg_parser.add_argument("--workers", type=int, default=None, help="parse worker processes (default one per CPU)")
+    arg_parser.add_argument(
+        "--settle", type=float, default=DEFAULT_SETTLE_SECONDS,
+        help=f"seconds a finished log must stay unchanged before it is parsed (default {DEFAULT_SETTLE_SECONDS:g})",
+    )
+    arg_parser.add_argument(
+        "--incomplete-settle", type=float, default=DEFAULT_INCOMPLETE_SECONDS,
+        help="seconds a log without the 'Arnold shutdown' line must stay unchanged "
+             f"(default {DEFAULT_INCOMPLETE_SECONDS:g})",
+    )
+    arg_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per written batch")
+    arg_parser.add_argument(
+        "--flush-seconds", type=float, default=DEFAULT_FLUSH_SECONDS, help="longest time rows wait to be written"
+    )
+    arg_parser.add_argument("--manifest", help=f"manifest database (default <output>/{MANIFEST_NAME})")
+    arg_parser.add_argument("--polling", action="store_true", help="poll for changes, for network file systems")
+    arg_parser.add_argument("--no-scan", action="store_true", help="skip the start-up scan of existing logs")
+    arg_parser.add_argument("--verbose", action="store_true", help="print progress")
+    args = arg_parser.parse_args(argv)
+
+    partition_by = [column.strip() for column in args.partition_by.split(",") if column.strip()]
+    unknown = [column for column in partition_by if column not in RENDER_COLUMNS]
+    if unknown:
+        arg_parser.error("unknown partition column(s): " + ", ".join(unknown))
+    if "show" in partition_by and not args.show:
+        arg_parser.error("--show is required to partition by show")
+    missing = [root for root in args.roots if not os.path.isdir(root)]
+    if missing:
+        arg_parser.error("not a directory: " + ", ".join(missing))
+
+    watcher = LogWatcher(
+        args.roots, args.output, partition_by, show=args.show, workers=args.workers,
+        settle_seconds=args.settle, incomplete_seconds=args.incomplete_settle, batch_size=args.batch_size,
+        flush_seconds=args.flush_seconds, manifest=args.manifest, polling=args.polling,
+    )
+    # SIGTERM from a service manager stops as cleanly as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    print(f"Watching {', '.join(watcher.roots)} into {args.output}")
+    try:
+        watcher.run(initial_scan=not args.no_scan, verbose=args.verbose)
+    except KeyboardInterrupt:
+        pass
+    print(f"\nStopped: {watcher.counters}")
+    return 0
+
+
+# RUN THE SCRIPT
+# =========================
+if __name__ == "__main__":
+    raise SystemExit(main())
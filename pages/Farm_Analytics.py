@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: Farm_Analytics.py
+Description: Farm-wide distributions over a directory of logs or a batch result.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+
+import plotly.graph_objects as go
+import streamlit as st
+from Arnold_Log_Viewer import sidebar
+from log_analytics import (
+    BREAKDOWNS,
+    DISTRIBUTION_METRICS,
+    cpu_factors,
+    filter_renders,
+    load_renders,
+    normalize_renders,
+    percentile_tables,
+    source_signature,
+)
+
+# GLOBALS / CONSTANTS
+# =========================
+# Limit the box plot to the busiest groups to keep it readable
+MAX_BOX_GROUPS = 20
+
+
+# FUNCTIONS
+# =========================
+@st.cache_data(show_spinner=False)
+def cached_renders(source, signature):
+    """Load renders, learn the CPU factors and precompute the percentiles once per source signature."""
+    renders = load_renders(source)
+    factors = cpu_factors(renders)
+    renders = normalize_renders(renders, factors)
+    return renders, factors, percentile_tables(renders)
+
+
+@st.cache_data(show_spinner=False)
+def cached_filtered_percentiles(source, signature, filters):
+    """Percentiles of a filtered selection, computed once per selection."""
+    renders, _, _ = cached_renders(source, signature)
+    return percentile_tables(filter_renders(renders, dict(filters)))
+
+
+def display_box_plot(df, metric, by):
+    """
+    Display a box plot of a metric for the largest groups.
+    """
+    top_groups = df[by].value_counts().head(MAX_BOX_GROUPS).index
+    fig = go.Figure()
+    for group in top_groups:
+        fig.add_trace(go.Box(
+            y=df.loc[df[by] == group, metric],
+            name=str(group),
+            boxpoints="outliers",
+        ))
+
+    fig.update_layout(
+        yaxis_title=DISTRIBUTION_METRICS[metric],
+        xaxis_title=BREAKDOWNS[by],
+        showlegend=False,
+    )
+    st.plotly_chart(fig, use_container_width=True, config={'displaylogo': False})
+
+
+# PAGE CONFIGURATION
+# =========================
+# Note: set_page_config is called in main app, cannot call it here
+
+
+# MAIN FUNCTION
+# =========================
+def main():
+    """
+    Main function for the page.
+    """
+    st.title("Farm Analytics")
+
+    source = st.text_input(
+        "Log directory, Parquet dataset or log_parser JSON/NDJSON output",
+        value=st.session_state.get("farm_source", ""),
+    )
+    if not source:
+        st.info("Enter a path on this machine to analyse many renders at once.")
+        return
+    if not os.path.exists(source):
+        st.error(f"Path not found: {source}")
+        return
+    st.session_state["farm_source"] = source
+
+    with st.spinner("Loading renders..."):
+        try:
+            signature = source_signature(source)
+            renders, factors, percentiles = cached_renders(source, signature)
+        except Exception as e:
+            st.error(f"Failed to load renders: {e}")
+            return
+
+    if renders.empty:
+        st.warning("No renders found.")
+        return
+
+    ########################################
+    # Filters
+    ########################################
+    st.header("Filters", divider=True)
+    filters = {}
+    cols = st.columns(len(BREAKDOWNS))
+    for col, (column, label) in zip(cols, BREAKDOWNS.items()):
+        options = sorted(renders[column].dropna().unique().tolist())
+        filters[column] = col.multiselect(label, options)
+
+    filtered = filter_renders(renders, filters)
+    st.caption(f"{len(filtered)} of {len(renders)} renders selected.")
+    if filtered.empty:
+        st.info("No renders match the selected filters.")
+        return
+    selection = tuple((column, tuple(values)) for column, values in filters.items() if values)
+    if selection:
+        percentiles = cached_filtered_percentiles(source, signature, selection)
+
+    ########################################
+    # Distributions
+    ########################################
+    st.header("Distributions", divider=True)
+    cols = st.columns(2)
+    metric = cols[0].selectbox(
+        "Metric", list(DISTRIBUTION_METRICS), format_func=DISTRIBUTION_METRICS.get
+    )
+    by = cols[1].selectbox("Break down by", list(BREAKDOWNS), format_func=BREAKDOWNS.get)
+
+    overall = percentiles[(metric, None)]
+    st.caption(f"Over the {overall['count'].iloc[0]} render(s) with a frame time, truncated logs are left out.")
+    cols = st.columns(len(overall.columns) - 1)
+    for col, percentile in zip(cols, overall.columns[1:]):
+        col.metric(percentile, f"{overall[percentile].iloc[0]:.2f}")
+
+    st.subheader(f"{DISTRIBUTION_METRICS[metric]} by {BREAKDOWNS[by]}")
+    st.dataframe(percentiles[(metric, by)], use_container_width=True)
+    display_box_plot(filtered, metric, by)
+
+    ########################################
+    # Hardware Normalization
+    ########################################
+    st.header("Hardware Normalization", divider=True)
+    st.caption(
+        "Core-hours each CPU model needs for the same scene, relative to the most used model, "
+        "learned from every loaded render. A frame that is slow in core-hours but normal in "
+        "normalized core-hours landed on a slower node, not a heavier scene."
+    )
+    st.dataframe(
+        factors,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "core_hours": st.column_config.NumberColumn("median core-hours", format="%.2f"),
+            "factor": st.column_config.NumberColumn("factor", format="%.2fx"),
+        },
+    )
+    if factors["factor"].isna().any():
+        st.info("CPU models without a factor share no show/camera with another model.")
+
+    st.subheader("All Metrics")
+    st.dataframe(
+        {
+            DISTRIBUTION_METRICS[name]: percentiles[(name, None)].iloc[0]
+            for name in DISTRIBUTION_METRICS if (name, None) in percentiles
+        },
+        use_container_width=True,
+    )
+
+
+# Add sidebar
+sidebar()
+
+
+# RUN THE APP
+# =========================
+if __name__ == "__main__":
+    main()
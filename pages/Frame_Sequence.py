@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: Frame_Sequence.py
+Description: Per-frame trends and outlier frames across a rendered sequence.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+
+import plotly.graph_objects as go
+import streamlit as st
+from Arnold_Log_Viewer import sidebar
+from log_analytics import (
+    OUTLIER_THRESHOLD,
+    SEQUENCE_METRICS,
+    SEQUENCE_WINDOW,
+    filter_renders,
+    frame_sequence,
+    load_renders,
+    sequence_outliers,
+    source_signature,
+)
+from plotly.subplots import make_subplots
+
+# GLOBALS / CONSTANTS
+# =========================
+# Columns that usually tell shots apart in a batch
+SHOT_COLUMNS = {
+    "show": "Show",
+    "camera": "Camera",
+}
+
+
+# FUNCTIONS
+# =========================
+@st.cache_data(show_spinner=False)
+def cached_renders(source, signature):
+    """Load renders once per source signature."""
+    return load_renders(source)
+
+
+def display_sequence_chart(frames):
+    """
+    Display one line chart per metric over the frame numbers, outliers in red.
+    """
+    fig = make_subplots(
+        rows=len(SEQUENCE_METRICS), cols=1, shared_xaxes=True, vertical_spacing=0.03,
+        subplot_titles=list(SEQUENCE_METRICS.values()),
+    )
+    for row, metric in enumerate(SEQUENCE_METRICS, start=1):
+        fig.add_trace(go.Scattergl(
+            x=frames["frame_number"], y=frames[metric], mode="lines", name=SEQUENCE_METRICS[metric],
+            line={"color": "#1f77b4"},
+        ), row=row, col=1)
+
+        flagged = frames[frames[f"{metric}_z"].abs() > st.session_state["sequence_threshold"]]
+        fig.add_trace(go.Scattergl(
+            x=flagged["frame_number"], y=flagged[metric], mode="markers", name="Outlier",
+            marker={"color": "red", "size": 8}, text=flagged["path"],
+            hovertemplate="Frame %{x}<br>%{y}<br>%{text}<extra></extra>",
+        ), row=row, col=1)
+
+    fig.update_layout(height=220 * len(SEQUENCE_METRICS), showlegend=False)
+    fig.update_xaxes(title_text="Frame", row=len(SEQUENCE_METRICS), col=1)
+    st.plotly_chart(fig, use_container_width=True, config={'displaylogo': False})
+
+
+# PAGE CONFIGURATION
+# =========================
+# Note: set_page_config is called in main app, cannot call it here
+
+
+# MAIN FUNCTION
+# =========================
+def main():
+    """
+    Main function for the page.
+    """
+    st.title("Frame Sequence")
+
+    source = st.text_input(
+        "Log directory, Parquet dataset or log_parser JSON/NDJSON output",
+        value=st.session_state.get("farm_source", ""),
+    )
+    if not source:
+        st.info("Enter the batch results of a shot to chart every frame of it.")
+        return
+    if not os.path.exists(source):
+        st.error(f"Path not found: {source}")
+        return
+    st.session_state["farm_source"] = source
+
+    with st.spinner("Loading renders..."):
+        try:
+            renders = cached_renders(source, source_signature(source))
+        except Exception as e:
+            st.error(f"Failed to load renders: {e}")
+            return
+
+    if renders.empty:
+        st.warning("No renders found.")
+        return
+
+    ########################################
+    # Shot
+    ########################################
+    st.header("Shot", divider=True)
+    filters = {}
+    cols = st.columns(len(SHOT_COLUMNS) + 2)
+    for col, (column, label) in zip(cols, SHOT_COLUMNS.items()):
+        options = sorted(renders[column].dropna().unique().tolist())
+        filters[column] = col.multiselect(label, options)
+    window = cols[-2].number_input("Window (frames)", min_value=3, value=SEQUENCE_WINDOW, step=2)
+    cols[-1].number_input(
+        "Outlier score", min_value=1.0, value=OUTLIER_THRESHOLD, step=0.5, key="sequence_threshold"
+    )
+
+    frames = frame_sequence(filter_renders(renders, filters))
+    if frames.empty:
+        st.info("No renders with a frame number match the selected shot.")
+        return
+    frames = sequence_outliers(frames, window=int(window), threshold=st.session_state["sequence_threshold"])
+
+    outliers = frames[frames["outlier"]]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Frames", len(frames))
+    col2.metric("Range", f"{frames['frame_number'].iloc[0]} - {frames['frame_number'].iloc[-1]}")
+    col3.metric("Outlier Frames", len(outliers))
+
+    ########################################
+    # Trends
+    ########################################
+    st.header("Trends", divider=True)
+    display_sequence_chart(frames)
+
+    ########################################
+    # Outliers
+    ########################################
+    st.header("Outlier Frames", divider=True)
+    if outliers.empty:
+        st.success("No outlier frames.")
+        return
+    st.caption(
+        "Frames far from the median of their neighbouring frames, scored in MADs. "
+        "A heavy simulation cache or a missing texture usually shows up here."
+    )
+    columns = ["frame_number", "outlier_metrics"] + list(SEQUENCE_METRICS) + [f"{metric}_z" for metric in SEQUENCE_METRICS]
+    st.dataframe(
+        outliers[columns + ["path"]].rename(columns={**SEQUENCE_METRICS, "frame_number": "Frame"}),
+        use_container_width=True, hide_index=True,
+    )
+
+
+# Add sidebar
+sidebar()
+
+
+# RUN THE APP
+# =========================
+if __name__ == "__main__":
+    main()
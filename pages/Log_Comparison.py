@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: Log_Comparison.py
+Description: Compare a baseline and a candidate Arnold log side by side.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import hashlib
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import streamlit as st
+from Arnold_Log_Viewer import sidebar
+from log_compare import COMPARED_SECTIONS, compare_logs, parse_log_sections, sort_regressions
+from log_parser import COMPRESSED_EXTENSIONS, DECOMPRESSION_ERRORS, open_log
+
+# GLOBALS / CONSTANTS
+# =========================
+# Parsed logs kept in the session cache, oldest are dropped first
+MAX_CACHED_LOGS = 8
+
+UPLOAD_TYPES = ["txt", "log"] + [extension.lstrip(".") for extension in COMPRESSED_EXTENSIONS]
+
+
+# FUNCTIONS
+# =========================
+def read_upload(uploaded_file):
+    """Decode an uploaded log, decompressing .gz/.bz2/.xz, or show an error and return None."""
+    try:
+        with open_log(io.BytesIO(uploaded_file.getvalue()), errors="strict") as f:
+            return f.read()
+    except UnicodeDecodeError:
+        st.error(f"Failed to decode {uploaded_file.name}. Please ensure the file is a valid text file with UTF-8 encoding.")
+    except DECOMPRESSION_ERRORS as e:
+        st.error(f"Failed to decompress {uploaded_file.name}: {e}")
+    return None
+
+
+def parse_cached(log_contents):
+    """Parse logs concurrently, reusing results cached in the session.
+    Workers are spawned, forking the multithreaded Streamlit server could
+    copy locks held by its other threads. A single log is parsed in this
+    process, which saves starting a worker.
+    Parameters:
+    log_contents (list): Log texts to parse
+    Returns:
+    list: Parsed sections per log, in the same order
+    """
+    cache = st.session_state.setdefault("comparison_cache", {})
+    digests = [hashlib.sha256(content.encode("utf-8")).hexdigest() for content in log_contents]
+
+    missing = {
+        digest: content
+        for digest, content in zip(digests, log_contents)
+        if digest not in cache
+    }
+    if missing:
+        with st.spinner(f"Parsing {len(missing)} log file/s..."):
+            if len(missing) > 1:
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=len(missing), mp_context=context) as executor:
+                    for digest, sections in zip(missing, executor.map(parse_log_sections, missing.values())):
+                        cache[digest] = sections
+            else:
+                for digest, content in missing.items():
+                    cache[digest] = parse_log_sections(content)
+
+        while len(cache) > MAX_CACHED_LOGS:
+            cache.pop(next(iter(cache)))
+
+    return [cache[digest] for digest in digests]
+
+
+def display_set_difference(title, only_baseline, only_candidate):
+    """
+    Display the items only found in one of the two logs.
+    """
+    st.subheader(title)
+    if not only_baseline and not only_candidate:
+        st.success(f"No differences in {title.lower()}.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        with st.expander(f"{len(only_baseline)} only in baseline"):
+            for item in only_baseline:
+                st.code(item, language="log", wrap_lines=True)
+    with col2:
+        with st.expander(f"{len(only_candidate)} only in candidate"):
+            for item in only_candidate:
+                st.code(item, language="log", wrap_lines=True)
+
+
+# PAGE CONFIGURATION
+# =========================
+# Note: set_page_config is called in main app, cannot call it here
+
+
+# MAIN FUNCTION
+# =========================
+def main():
+    """
+    Main function for the page.
+    """
+    st.title("Log Comparison")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        baseline_file = st.file_uploader("Baseline render log", type=UPLOAD_TYPES)
+    with col2:
+        candidate_file = st.file_uploader("Candidate render log", type=UPLOAD_TYPES)
+
+    if baseline_file is None or candidate_file is None:
+        st.info("Upload a baseline and a candidate log to compare them.")
+        return
+
+    baseline_content = read_upload(baseline_file)
+    candidate_content = read_upload(candidate_file)
+    if baseline_content is None or candidate_content is None:
+        return
+
+    baseline, candidate = parse_cached([baseline_content, candidate_content])
+    comparison = compare_logs(baseline, candidate)
+
+    ########################################
+    # Stat Deltas
+    ########################################
+    st.header("Stat Deltas", divider=True)
+    col1, col2, col3 = st.columns(3)
+    sections = col1.multiselect("Sections", COMPARED_SECTIONS, default=COMPARED_SECTIONS)
+    sort_by = col2.radio("Sort by", ["relative", "delta"], horizontal=True,
+                         format_func=lambda key: "Absolute (per unit)" if key == "delta" else "Relative")
+    changed_only = col3.toggle("Only changed fields", value=True)
+
+    rows = [row for row in comparison["stats"] if row["section"] in sections]
+    if changed_only:
+        rows = [row for row in rows if row["delta"] != 0]
+
+    if rows:
+        df = pd.DataFrame(sort_regressions(rows, sort_by))
+        for change, title in (("regression", "Regressions"), ("improvement", "Improvements"),
+                              ("unchanged", "Unchanged")):
+            group = df[df["change"] == change].drop(columns="change")
+            if group.empty:
+                continue
+            st.subheader(f"{title} ({len(group)})")
+            st.dataframe(
+                group,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "relative": st.column_config.NumberColumn("relative", format="percent"),
+                },
+            )
+    else:
+        st.success("No stat differences found.")
+
+    ########################################
+    # Warnings / Plugins
+    ########################################
+    st.header("Warnings / Plugins", divider=True)
+    display_set_difference("Warning Templates", *comparison["warnings"])
+    display_set_difference("Loaded Plugins", *comparison["plugins"])
+
+
+# Add sidebar
+sidebar()
+
+
+# RUN THE APP
+# =========================
+if __name__ == "__main__":
+    main()
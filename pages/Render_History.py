@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: Render_History.py
+Description: Query every render recorded in the local history database.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+import sqlite3
+import time
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from Arnold_Log_Viewer import sidebar
+from log_history import DEFAULT_HISTORY_PATH, DEFAULT_QUERY_LIMIT, RenderHistory
+
+# GLOBALS / CONSTANTS
+# =========================
+# Indexed column -> filter label, output files are too many to list and are
+# filtered by prefix instead
+HISTORY_FILTERS = {
+    "camera": "Camera",
+    "host_name": "Host",
+    "arnold_version": "Arnold Version",
+}
+
+# Columns shown in the results table
+HISTORY_COLUMNS = [
+    "started_at", "path", "frame_number", "output_file", "camera", "host_name", "cpu",
+    "arnold_version", "frame_time", "core_hours", "peak_CPU_memory_used", "error_count",
+    "warning_count", "digest",
+]
+
+# Day ranges offered for the date filter, None for all time
+HISTORY_DAYS = [7, 30, 90, 365, None]
+
+
+# FUNCTIONS
+# =========================
+
+
+# PAGE CONFIGURATION
+# =========================
+# Note: set_page_config is called in main app, cannot call it here
+
+
+# MAIN FUNCTION
+# =========================
+def main():
+    """
+    Main function for the page.
+    """
+    st.title("Render History")
+
+    db_path = st.text_input("History database", value=DEFAULT_HISTORY_PATH)
+    if not os.path.isfile(db_path):
+        st.info("No renders recorded yet. Logs opened in the viewer, or parsed with --history, are recorded here.")
+        return
+
+    try:
+        history = RenderHistory(db_path)
+    except sqlite3.Error as e:
+        st.error(f"Failed to open history: {e}")
+        return
+
+    with history:
+        ########################################
+        # Filters
+        ########################################
+        st.header("Filters", divider=True)
+        filters = {}
+        output_prefix = st.text_input("Output file starts with", placeholder="/shows/abc/renders/")
+        cols = st.columns(len(HISTORY_FILTERS) + 1)
+        for col, (column, label) in zip(cols, HISTORY_FILTERS.items()):
+            filters[column] = col.multiselect(label, history.distinct(column))
+        days = cols[-1].selectbox(
+            "Period", HISTORY_DAYS, index=1,
+            format_func=lambda value: "All time" if value is None else f"Last {value} days",
+        )
+
+        start = time.perf_counter()
+        rows = history.query(
+            filters, days=days, columns=HISTORY_COLUMNS, prefixes={"output_file": output_prefix.strip()}
+        )
+        query_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"{len(rows)} of {history.count()} recorded renders, queried in {query_ms:.1f} ms.")
+        if len(rows) >= DEFAULT_QUERY_LIMIT:
+            st.caption(f"Only the newest {DEFAULT_QUERY_LIMIT} matching renders are shown, narrow the filters to see older ones.")
+
+    if not rows:
+        st.info("No recorded renders match the selected filters.")
+        return
+
+    renders = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+    renders["started_at"] = pd.to_datetime(renders["started_at"])
+
+    ########################################
+    # Renders
+    ########################################
+    st.header("Renders", divider=True)
+    cols = st.columns(3)
+    cols[0].metric("Renders", len(renders))
+    cols[1].metric("Median Frame Time (s)", f"{renders['frame_time'].median():.2f}")
+    cols[2].metric("Total Core-Hours", f"{renders['core_hours'].sum():.1f}")
+
+    fig = px.scatter(
+        renders, x="started_at", y="frame_time", color="host_name", hover_data=["path", "frame_number"],
+        labels={"started_at": "Started", "frame_time": "Frame Time (s)", "host_name": "Host"},
+    )
+    st.plotly_chart(fig, use_container_width=True, config={'displaylogo': False})
+
+    st.dataframe(renders, hide_index=True, use_container_width=True)
+
+
+# Add sidebar
+sidebar()
+
+
+# RUN THE APP
+# =========================
+if __name__ == "__main__":
+    main()
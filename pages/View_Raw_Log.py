@@ -13,9 +13,15 @@ Version: 0.1.0
 # =========================
 import streamlit as st
 from Arnold_Log_Viewer import sidebar
+from log_index import SEVERITIES, LogIndex, select_lines
 
 # GLOBALS / CONSTANTS
 # =========================
+# Filtered lines shown at once
+MAX_FILTERED_LINES = 20000
+
+# Lines per page of the unfiltered log
+PAGE_LINES = 5000
 
 
 # FUNCTIONS
@@ -35,15 +41,48 @@ def main():
     """
     st.title("Raw Log File")
 
-    # Use the existing log file variable from the main page
-    log_file = st.session_state.shared_log
+    # Use the parser cached by the main page, only the displayed lines are
+    # read, a log too large to keep is streamed from the upload for them
+    parser = st.session_state.get("parser")
+
+    if parser:
+        log_index = st.session_state.get("log_index")
+        if log_index is None:
+            log_index = st.session_state["log_index"] = LogIndex(parser.lines)
+
+        severity_counts = log_index.counts("severity")
+        tag_counts = log_index.counts("tag")
+        col1, col2, col3 = st.columns(3)
+        severities = col1.multiselect(
+            "Severity", SEVERITIES, format_func=lambda value: f"{value} ({severity_counts[value]})"
+        )
+        tags = col2.multiselect(
+            "Subsystem", list(tag_counts), format_func=lambda value: f"{value} ({tag_counts[value]})"
+        )
+        start, end = None, None
+        first, last = log_index.time_range
+        if last > first:
+            start, end = col3.slider("Elapsed time (s)", min_value=first, max_value=last, value=(first, last))
+            if (start, end) == (first, last):
+                start, end = None, None
 
-    if log_file:
         try:
-            # Display the content with syntax highlighting
-            st.code(log_file, language="bash", line_numbers=True)
-        except FileNotFoundError:
-            st.error(f"Log file not found at: {log_file}")
+            if severities or tags or start is not None:
+                numbers = log_index.line_numbers(log_index.query(severities, tags, start, end))
+                st.caption(f"{len(numbers)} of {log_index.line_count} lines match")
+                if len(numbers) > MAX_FILTERED_LINES:
+                    st.info(f"Showing the first {MAX_FILTERED_LINES} matching lines, narrow the filters to see the rest.")
+                numbers = numbers[:MAX_FILTERED_LINES]
+            else:
+                # The whole log is shown a page at a time
+                page_count = max(1, -(-log_index.line_count // PAGE_LINES))
+                page = 1
+                if page_count > 1:
+                    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+                numbers = list(range((page - 1) * PAGE_LINES, min(page * PAGE_LINES, log_index.line_count)))
+            # Prefix the original line numbers, the shown lines are a subset
+            lines = select_lines(parser.lines, numbers)
+            st.code("\n".join(f"{n + 1:>7}  {line}" for n, line in zip(numbers, lines)), language="bash")
         except Exception as e:
             st.error(f"An error occurred: {e}")
     else:
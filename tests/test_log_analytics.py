@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: test_log_analytics.py
+Description: Farm-wide aggregations over render rows.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+
+from log_analytics import (  # noqa: E402
+    cpu_factors,
+    frame_sequence,
+    normalize_renders,
+    percentile_table,
+    sequence_outliers,
+)
+from log_export import parse_log_file  # noqa: E402
+
+EXAMPLE_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example_log.log")
+
+
+# TESTS
+# =========================
+def test_percentiles_skip_renders_without_frame_time():
+    """Null and zero frame times are truncated logs, not fast renders."""
+    renders = pd.DataFrame({
+        "frame_time": [10.0, 20.0, 0.0, None],
+        "pixel_data_read_gb": [1.0, 3.0, 0.0, 0.0],
+    })
+    table = percentile_table(renders, "frame_time")
+    assert table["count"].iloc[0] == 2
+    assert table["p50"].iloc[0] == pytest.approx(15.0)
+
+    table = percentile_table(renders, "pixel_data_read_gb")
+    assert table["count"].iloc[0] == 2
+    assert table["p50"].iloc[0] == pytest.approx(2.0)
+
+
+def test_sequence_flags_a_texture_read_spike(tmp_path):
+    """A frame reading far more texture data than its neighbours is an outlier."""
+    with open(EXAMPLE_LOG, "r", encoding="utf-8") as f:
+        text = f.read()
+    rows = []
+    for frame in range(1, 21):
+        read_mb = 4096.0 if frame == 12 else 1000.0 + frame
+        log = text.replace("Read from disk : 1.7 MB", f"Read from disk : {read_mb} MB").replace(
+            "| log started", f"| rendering frame(s): {frame}\n00:00:00   773MB         | log started", 1
+        )
+        path = tmp_path / f"render.{frame:04d}.log"
+        path.write_text(log, encoding="utf-8")
+        rows.append(parse_log_file(str(path)))
+
+    frames = sequence_outliers(frame_sequence(pd.DataFrame(rows)))
+    assert frames["pixel_data_read_gb"].iloc[0] == pytest.approx(1001.0 / 1024)
+    assert frames.loc[frames["outlier"], "frame_number"].tolist() == [12]
+    assert frames["outlier_metrics"].iloc[11] == "pixel_data_read_gb"
+
+
+def test_cpu_factors_separate_scene_cost_from_cpu_speed():
+    """A CPU that also renders a heavy shot alone is only blamed for its own slowdown."""
+    rows = []
+    # Shot B costs 10x shot A, shot C 100x, and cpu_slow takes twice as long
+    for camera, cost in (("A", 1.0), ("B", 10.0)):
+        rows += [("show", camera, "cpu_fast", cost)] * 2 + [("show", camera, "cpu_slow", 2 * cost)] * 2
+    rows += [("show", "C", "cpu_slow", 200.0)] * 4
+    rows += [("other", "D", "cpu_alone", 5.0)] * 2
+    # Neither a render without cost nor one without a frame time counts
+    rows += [("show", "A", "cpu_fast", None), ("show", "B", "cpu_fast", 50.0)]
+    renders = pd.DataFrame(rows, columns=["show", "camera", "cpu", "core_hours"])
+    renders["frame_time"] = [60.0] * (len(rows) - 1) + [0.0]
+
+    factors = cpu_factors(renders).set_index("cpu")
+    assert factors.index[0] == "cpu_slow"
+    assert factors.loc["cpu_slow", "factor"] == pytest.approx(1.0)
+    assert factors.loc["cpu_fast", "factor"] == pytest.approx(0.5, rel=1e-4)
+    assert pd.isna(factors.loc["cpu_alone", "factor"])
+    assert factors.loc["cpu_fast", "renders"] == 4
+    assert factors.loc["cpu_slow", "shared_scenes"] == 2
+
+    normalized = normalize_renders(renders, factors.reset_index())
+    fast = normalized[(normalized["cpu"] == "cpu_fast") & (normalized["frame_time"] > 0)].dropna()
+    assert fast["normalized_core_hours"].tolist() == pytest.approx([2.0, 2.0, 20.0, 20.0], rel=1e-4)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: test_log_export.py
+Description: Parquet export round trips.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import gzip
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pyarrow")
+
+from log_analytics import load_renders  # noqa: E402
+from log_export import log_digest, parse_log_file, parse_log_files, read_parquet, write_parquet  # noqa: E402
+
+EXAMPLE_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example_log.log")
+
+
+# TESTS
+# =========================
+def test_row_without_date_reads_back(tmp_path):
+    """A log without a start date lands in the default partition and stays readable."""
+    truncated = tmp_path / "truncated.log"
+    truncated.write_text("00:00:00   773MB         | log started\n", encoding="utf-8")
+    rows = [parse_log_file(EXAMPLE_LOG), parse_log_file(str(truncated))]
+    assert rows[1]["date"] is None
+
+    out_dir = str(tmp_path / "dataset")
+    assert write_parquet(rows, out_dir, ["date"]) == 2
+    assert os.path.isdir(os.path.join(out_dir, "date=__HIVE_DEFAULT_PARTITION__"))
+
+    table = read_parquet(out_dir)
+    dates = sorted(table.column("date").to_pylist(), key=lambda value: value is None)
+    assert dates == [rows[0]["date"], None]
+
+    renders = load_renders(out_dir)
+    assert len(renders) == 2
+    assert set(renders["path"]) == {EXAMPLE_LOG, str(truncated)}
+
+
+def test_partition_by_show_and_date(tmp_path):
+    """Category partition keys come back as categories."""
+    out_dir = str(tmp_path / "dataset")
+    write_parquet([parse_log_file(EXAMPLE_LOG, show="showA")], out_dir, ["show", "date"])
+    write_parquet([parse_log_file(EXAMPLE_LOG, show="showB")], out_dir, ["show", "date"])
+
+    renders = load_renders(out_dir)
+    assert sorted(renders["show"].astype(str)) == ["showA", "showB"]
+    assert str(renders["show"].dtype) == "category"
+
+
+def test_digest_matches_across_copies(tmp_path):
+    """Plain, compressed and uploaded copies without a final newline share one digest."""
+    with open(EXAMPLE_LOG, "rb") as f:
+        data = f.read().rstrip(b"\n")
+    plain = tmp_path / "render.log"
+    plain.write_bytes(data)
+    compressed = tmp_path / "render.log.gz"
+    compressed.write_bytes(gzip.compress(data))
+
+    digest = log_digest(io.BytesIO(data))
+    assert parse_log_file(str(plain))["digest"] == digest
+    assert parse_log_file(str(compressed))["digest"] == digest
+    assert log_digest(str(compressed)) == digest
+
+
+def test_texture_sizes_in_mb_and_missing_stats(tmp_path):
+    """Texture sizes printed in MB are exported, stats missing from a log are null."""
+    row = parse_log_file(EXAMPLE_LOG)
+    assert row["pixel_data_read_gb"] == pytest.approx(1.7 / 1024)
+    assert row["peak_cache_memory_gb"] == pytest.approx(2.3 / 1024)
+    assert row["rendering"] == pytest.approx(0.38)
+
+    truncated = tmp_path / "truncated.log"
+    truncated.write_text("00:00:00   773MB         | log started\n", encoding="utf-8")
+    row = parse_log_file(str(truncated))
+    for column in ("frame_time", "rendering", "peak_CPU_memory_used", "camera_rays", "total_rays",
+                   "pixel_data_read_gb", "unique_images", "triangle_count"):
+        assert row[column] is None, column
+
+
+def test_truncated_compressed_log_is_skipped(tmp_path, capsys):
+    """A truncated .gz gives no row instead of aborting the batch."""
+    with open(EXAMPLE_LOG, "rb") as f:
+        data = f.read()
+    broken = tmp_path / "broken.log.gz"
+    broken.write_bytes(gzip.compress(data)[:400])
+
+    rows = list(parse_log_files([EXAMPLE_LOG, str(broken), EXAMPLE_LOG], workers=1))
+    assert rows[1] is None
+    assert rows[0]["digest"] == rows[2]["digest"] == log_digest(EXAMPLE_LOG)
+    assert str(broken) in capsys.readouterr().err
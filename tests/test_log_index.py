@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: test_log_index.py
+Description: Facet queries of the line index.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_index import LogIndex, select_lines  # noqa: E402
+
+LINES = [
+    "00:00:00   773MB         | log started Thu Mar 20 10:12:41 2025",
+    "00:00:01   810MB WARNING | [rlm] could not connect to license server",
+    "00:00:01   810MB         | [rlm] checked out license",
+    "continuation line without a timestamp",
+    "00:00:05   900MB         | [accel] building BVH",
+    "00:00:09   950MB ERROR | [accel] out of memory",
+    "00:01:00   960MB ERROR | [aov] unknown driver",
+    "00:01:30   960MB         | Arnold shutdown",
+]
+
+
+# TESTS
+# =========================
+def test_queries_combine_facets():
+    """Severities and tags are OR-ed within a facet and AND-ed across facets and time."""
+    index = LogIndex(LINES)
+    assert index.line_count == len(LINES)
+    assert index.time_range == (0.0, 90.0)
+    assert index.elapsed[3] == 1.0
+
+    assert index.line_numbers(index.query(["error"])) == [5, 6]
+    assert index.line_numbers(index.query(["warning", "error"])) == [1, 5, 6]
+    assert index.line_numbers(index.query(["info"])) == [0, 2, 3, 4, 7]
+    assert index.line_numbers(index.query(tags=["rlm", "aov"])) == [1, 2, 6]
+    assert index.line_numbers(index.query(["error"], ["accel"])) == [5]
+    assert index.line_numbers(index.query(start=1.0, end=9.0)) == [1, 2, 3, 4, 5]
+    assert index.line_numbers(index.query(["info"], start=5.0)) == [4, 7]
+    assert index.query(tags=["missing"]) == 0
+
+    assert index.counts("severity") == {"error": 2, "warning": 1, "info": 5}
+    assert index.counts("tag", index.query(["error"])) == {"accel": 1, "aov": 1, "rlm": 0}
+    assert select_lines(iter(LINES), [1, 6]) == [LINES[1], LINES[6]]
+
+
+def test_lines_added_in_chunks_index_like_all_at_once():
+    """An index built chunk by chunk answers queries like one built from every line."""
+    whole = LogIndex(LINES)
+    chunked = LogIndex()
+    for start in range(0, len(LINES), 3):
+        chunked.add_lines(LINES[start:start + 3])
+        assert chunked.line_count == min(start + 3, len(LINES))
+
+    assert chunked.elapsed == whole.elapsed
+    assert chunked.severities == whole.severities
+    assert chunked.tags == whole.tags
+    assert chunked.query(["error", "warning"], ["accel", "rlm"], 1.0) == whole.query(
+        ["error", "warning"], ["accel", "rlm"], 1.0
+    )
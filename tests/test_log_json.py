@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: test_log_json.py
+Description: Arnold render stats JSON mapped onto parser sections.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_json import load_stats_json, merge_json_sections  # noqa: E402
+from log_parser import ArnoldLogParser  # noqa: E402
+
+# Render stats as Arnold writes them, units in the flat key names
+STATS_DOCUMENT = {
+    "render 0000": {
+        "date": "Thu Mar 20 10:12:41 2025",
+        "frame time microseconds": 2456147,
+        "peak CPU memory used bytes": 4565443000,
+        "scene creation time microseconds": 1250000,
+        "render time": {
+            "node init microseconds": 310000,
+            "rendering": {
+                "subdivision microseconds": 125000,
+                "pixel rendering microseconds": 1820000,
+            },
+        },
+        "memory consumed": {
+            "at startup bytes": 104857600,
+            "texture cache bytes": 52428800,
+        },
+        "ray counts": {
+            "camera": {"rays": 307200, "rays/pixel": 1},
+            "shadow": {"rays": 1228800, "rays/pixel": 4},
+        },
+    }
+}
+
+
+# TESTS
+# =========================
+def test_flat_stats_keys_convert_their_unit():
+    """Unit-suffixed keys land on the parser fields in seconds and MB."""
+    source = io.BytesIO(json.dumps(STATS_DOCUMENT).encode("utf-8"))
+    sections = merge_json_sections(
+        ArnoldLogParser("").parse(), load_stats_json(source), ArnoldLogParser("").parse()
+    )
+
+    assert sections["render_time"]["frame_time"] == pytest.approx(2.456147)
+    assert sections["render_time"]["node_init"] == pytest.approx(0.31)
+    assert sections["render_time"]["subdivision"] == pytest.approx(0.125)
+    assert sections["render_time"]["pixel_rendering"] == pytest.approx(1.82)
+    assert sections["scene_creation"]["scene_creation"] == pytest.approx(1.25)
+    assert sections["memory_stats"]["peak_CPU_memory_used"] == pytest.approx(4565443000 / 1024 ** 2)
+    assert sections["memory_stats"]["at_startup"] == pytest.approx(100.0)
+    assert sections["memory_stats"]["texture_cache"] == pytest.approx(50.0)
+    assert sections["ray_stats"]["camera"] == 307200
+    assert sections["ray_stats"]["shadow"] == 1228800
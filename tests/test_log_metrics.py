@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: test_log_metrics.py
+Description: Completion prediction from render progress steps.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_metrics import predict_completion  # noqa: E402
+
+
+def _steps(percents, seconds_per_percent=1.2, jitter=()):
+    """Progress steps at a steady rate, with optional extra seconds per step."""
+    jitter = list(jitter) + [0.0] * len(percents)
+    return [
+        {"line": index, "elapsed": percent * seconds_per_percent + jitter[index], "percent": percent}
+        for index, percent in enumerate(percents)
+    ]
+
+
+# TESTS
+# =========================
+def test_steady_progress_predicts_linear_total():
+    """A steady render finishes on its line, with no band."""
+    prediction = predict_completion(_steps(range(0, 45, 5)))
+    assert prediction["percent"] == 40
+    assert not prediction["complete"]
+    assert prediction["total"] == pytest.approx(120.0)
+    assert prediction["remaining"] == pytest.approx(72.0)
+    assert prediction["total_low"] == pytest.approx(120.0)
+    assert prediction["total_high"] == pytest.approx(120.0)
+    assert prediction["stalled_for"] is None
+
+
+def test_noisy_progress_gets_a_band():
+    """Uneven steps widen the band around the predicted total."""
+    prediction = predict_completion(_steps(range(0, 45, 5), jitter=[0, 2, -1, 3, 0, -2, 1, 0, 2]))
+    assert prediction["total_low"] < prediction["total"] < prediction["total_high"]
+    assert prediction["remaining_low"] < prediction["remaining"] < prediction["remaining_high"]
+
+
+def test_overdue_step_flags_a_stall_and_pushes_the_total():
+    """A step long overdue is a stall, and the remaining work starts from now."""
+    prediction = predict_completion(_steps(range(0, 45, 5)), now=48.0 + 400.0)
+    assert prediction["stalled_for"] == pytest.approx(400.0)
+    assert prediction["total"] == pytest.approx(520.0)
+    assert prediction["remaining"] == pytest.approx(72.0)
+
+
+def test_finished_or_missing_progress():
+    """A finished render has nothing remaining, a log without progress predicts nothing."""
+    prediction = predict_completion(_steps(range(0, 105, 5)))
+    assert prediction["complete"]
+    assert prediction["total"] == pytest.approx(120.0)
+    assert prediction["remaining"] == 0.0
+
+    prediction = predict_completion([])
+    assert prediction["percent"] is None
+    assert prediction["total"] is None
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: test_log_parser.py
+Description: Parser sections on the bundled example logs.
+Author: Carlo Carfora
+Date: 20/03/2025
+Version: 0.1.0
+"""
+
+# IMPORTS
+# =========================
+import copy
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_parser import (  # noqa: E402
+    SUMMARY_SECTIONS,
+    ArnoldLogParser,
+    iter_parse_chunks,
+    iter_parse_parallel,
+    main,
+    summarize_log,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_LOG = os.path.join(ROOT, "example_log.log")
+EXAMPLE_GPU_LOG = os.path.join(ROOT, "example_gpu_log.log")
+
+
+# TESTS
+# =========================
+def test_gpu_sections_empty_without_gpu_lines():
+    """A CPU log gets the empty GPU sections, the GPU sample fills them."""
+    parser = ArnoldLogParser.from_source(EXAMPLE_LOG)
+    assert not any(parser.get_gpu_stats().values())
+    assert parser.get_gpu_devices() == []
+    assert parser.get_gpu_memory() == []
+
+    gpu_parser = ArnoldLogParser.from_source(EXAMPLE_GPU_LOG)
+    assert gpu_parser.get_gpu_devices()
+    assert gpu_parser.get_gpu_stats()["device_count"] > 0
+
+
+def test_profiled_parse_matches_and_counts_searches():
+    """Profiling leaves the sections unchanged and counts every section and pattern."""
+    sections = ArnoldLogParser.from_source(EXAMPLE_LOG).parse()
+    parser = ArnoldLogParser.from_source(EXAMPLE_LOG, profile=True)
+    assert parser.parse() == sections
+
+    report = parser.get_profile_report()
+    section_calls = {row["section"]: row["calls"] for row in report["sections"]}
+    assert set(section_calls) >= {"get_render_time", "get_memory_stats", "get_texture_stats"}
+    patterns = {row["pattern"]: row for row in report["patterns"]}
+    assert set(patterns) == set(ArnoldLogParser.PATTERNS)
+    assert patterns["rendering"]["matches"] == 2
+    assert patterns["rendering"]["searches"] > patterns["rendering"]["matches"]
+    assert patterns["rendering"]["sections"] == ["get_render_time"]
+    assert "frame_time" in report["never_matched"]
+    assert ArnoldLogParser.from_source(EXAMPLE_LOG).get_profile_report() == {}
+
+
+def test_cli_json_shape(tmp_path, capsys):
+    """The CLI prints one record per log, an unreadable log gets an error and exit code 1."""
+    assert main([EXAMPLE_LOG, "--sections", "render_time,errors"]) == 0
+    records = json.loads(capsys.readouterr().out)
+    assert len(records) == 1
+    assert set(records[0]) == {"path", "sections"}
+    assert records[0]["path"] == EXAMPLE_LOG
+    assert records[0]["sections"] == ArnoldLogParser.from_source(EXAMPLE_LOG).parse(["render_time", "errors"])
+
+    with open(EXAMPLE_LOG, "rb") as f:
+        truncated = tmp_path / "truncated.log.gz"
+        truncated.write_bytes(gzip.compress(f.read())[:2000])
+    assert main([EXAMPLE_LOG, str(truncated), "--format", "ndjson", "--sections", "render_time", "--profile"]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    first, second = (json.loads(line) for line in lines)
+    assert set(first) == {"path", "sections", "profile"}
+    assert set(first["profile"]) == {"sections", "patterns", "never_matched"}
+    assert set(second) == {"path", "error"}
+
+
+@pytest.mark.parametrize("path", [EXAMPLE_LOG, EXAMPLE_GPU_LOG])
+def test_chunked_parse_matches_parse(path):
+    """Small chunks merge to the sections of a whole-log parse."""
+    sections = ArnoldLogParser.from_source(path).parse()
+    for chunk_size in (500, 4096):
+        for progress in iter_parse_chunks(path, chunk_size=chunk_size):
+            pass
+        assert progress.finished
+        assert progress.results == sections
+
+
+@pytest.mark.parametrize("path", [EXAMPLE_LOG, EXAMPLE_GPU_LOG])
+def test_complete_sections_are_final(path):
+    """A section reported complete keeps the value of the whole-log parse."""
+    sections = ArnoldLogParser.from_source(path).parse()
+    completed = {}
+    for progress in iter_parse_chunks(path, chunk_size=500):
+        for section in progress.complete:
+            completed.setdefault(section, copy.deepcopy(progress.results[section]))
+    assert set(completed) == set(sections)
+    for section, value in completed.items():
+        assert value == sections[section], section
+
+
+def test_parallel_parse_matches_parse(tmp_path):
+    """Pieces parsed by worker processes merge to the sections of a whole-log parse."""
+    sections = ArnoldLogParser.from_source(EXAMPLE_LOG).parse()
+    with open(EXAMPLE_LOG, "rb") as f:
+        compressed = tmp_path / "example_log.log.gz"
+        compressed.write_bytes(gzip.compress(f.read()))
+    for path in (EXAMPLE_LOG, str(compressed)):
+        for progress in iter_parse_parallel(path, workers=2, chunk_size=2000):
+            pass
+        assert progress.finished
+        assert progress.results == sections
+
+
+@pytest.mark.parametrize("path", [EXAMPLE_LOG, EXAMPLE_GPU_LOG])
+def test_summary_parse_matches_parse(path):
+    """Fields resolved from the head and tail match a whole-log parse, the rest stay default."""
+    sections = ArnoldLogParser.from_source(path).parse(SUMMARY_SECTIONS)
+    defaults = ArnoldLogParser("").parse(SUMMARY_SECTIONS)
+
+    summary, info = summarize_log(path, head_bytes=1000, tail_bytes=2000)
+    assert info["bytes_read"] < info["size"]
+    for section, fields in sections.items():
+        unresolved = info["unresolved"].get(section, [])
+        for field, value in fields.items():
+            expected = defaults[section][field] if field in unresolved else value
+            assert summary[section][field] == expected, (section, field)
+
+    summary, info = summarize_log(path, head_bytes=1000, tail_bytes=2000, fallback=list(SUMMARY_SECTIONS))
+    assert summary == sections